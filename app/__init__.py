@@ -1,5 +1,6 @@
 import datetime
 import logging
+import threading
 import time
 
 from flask import Flask, render_template, request
@@ -11,6 +12,7 @@ except Exception:  # talisman optional in local
     Talisman = None
 from .config import Config
 from .routes import bp  # Import the blueprint (it's named 'bp' in app/routes.py)
+from .services.tts import warm_up_tts_client
 
 
 def create_app():
@@ -81,6 +83,12 @@ def create_app():
         }
     )
 
+    # Connect the shared TTS client off the request path so the first job is fast
+    if app.config.get("TTS_WARMUP_ON_BOOT"):
+        threading.Thread(
+            target=warm_up_tts_client, args=(app.logger,), daemon=True
+        ).start()
+
     # --- MVP routes to eliminate 404s ---
     @app.get("/health")
     def health():
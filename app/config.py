@@ -8,6 +8,12 @@ class Config:
     SESSION_COOKIE_SECURE = True
     SESSION_COOKIE_SAMESITE = "None"
     COOKIE_NAME = os.getenv("COOKIE_NAME", "storyspool_session")
+    # Verified session claims are reused until the next revocation check
+    SESSION_CACHE_ENABLED = os.getenv("SESSION_CACHE_ENABLED", "true").lower() == "true"
+    SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "10000"))
+    SESSION_REVOCATION_CHECK_SECONDS = int(
+        os.getenv("SESSION_REVOCATION_CHECK_SECONDS", "300")
+    )
     # Static caching: prod long cache, local no cache
     SEND_FILE_MAX_AGE_DEFAULT = 31536000 if APP_ENV == "prod" else 0
     STATIC_VERSION = os.getenv("STATIC_VERSION", "1")
@@ -23,3 +29,50 @@ class Config:
 
     # Public base URL (optional; used for logging/self-check)
     PUBLIC_BASE_URL = os.getenv("PUBLIC_BASE_URL", "")
+
+    # Article records (see app/services/store.py)
+    FIRESTORE_COLLECTION = os.getenv("FIRESTORE_COLLECTION", "articles")
+
+    # Rendered feed cache (see app/services/feed_cache.py); off unless
+    # FEED_CACHE_REDIS_URL names a Redis shared by every process
+    FEED_CACHE_ENABLED = os.getenv("FEED_CACHE_ENABLED", "true").lower() == "true"
+    FEED_CACHE_REDIS_URL = os.getenv("FEED_CACHE_REDIS_URL", "")
+    FEED_CACHE_MAX_ENTRIES = int(os.getenv("FEED_CACHE_MAX_ENTRIES", "1024"))
+    FEED_CACHE_TTL = int(os.getenv("FEED_CACHE_TTL", "3600"))
+
+    # Signed, login-free feed URLs (see app/services/feed_tokens.py). The first
+    # secret signs; the rest still verify, so secrets can be rotated.
+    FEED_TOKEN_SECRETS = [
+        s for s in os.getenv("FEED_TOKEN_SECRETS", "").split(",") if s.strip()
+    ]
+    # Shared caches (CDNs) may serve signed feeds for this long
+    FEED_PUBLIC_MAX_AGE = int(os.getenv("FEED_PUBLIC_MAX_AGE", "300"))
+
+    # JSON listing endpoints (/api/jobs, /api/articles)
+    API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "20"))
+    API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "100"))
+
+    # Background worker pool (see app/services/queue.py)
+    WORKER_MAX_WORKERS = int(os.getenv("WORKER_MAX_WORKERS", "4"))
+    WORKER_MAX_PENDING = int(os.getenv("WORKER_MAX_PENDING", "32"))
+    WORKER_RETRY_AFTER_SECONDS = int(os.getenv("WORKER_RETRY_AFTER_SECONDS", "30"))
+
+    # A worker's claim on a job expires after this, letting a redelivery take over
+    JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "900"))
+    # Job states lasting less than this are never written (see JobStateAccumulator)
+    JOB_STATE_DEBOUNCE_SECONDS = float(os.getenv("JOB_STATE_DEBOUNCE_SECONDS", "2"))
+
+    # Text-to-Speech (see app/services/tts.py)
+    TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", "4"))
+    # "frames" joins MP3 frames directly; "pydub" decodes and re-encodes via ffmpeg
+    TTS_CONCAT_MODE = os.getenv("TTS_CONCAT_MODE", "frames")
+    # Content-addressed cache of synthesized chunks (see app/services/tts_cache.py)
+    TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "")
+    # Per worker process; /tmp counts against memory on Cloud Run
+    TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    TTS_CACHE_GCS_BUCKET = os.getenv("TTS_CACHE_GCS_BUCKET", "")
+    # Connect the shared TTS client in the background at boot
+    TTS_WARMUP_ON_BOOT = os.getenv("TTS_WARMUP_ON_BOOT", "false").lower() == "true"
+    # Resumable upload chunk size for streamed audio (multiple of 256 KiB)
+    GCS_UPLOAD_CHUNK_SIZE = int(os.getenv("GCS_UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
@@ -1,3 +1,8 @@
 """
 This module contains functions for extracting and processing article content.
 """
+
+from app.extract.models import ExtractedDocument
+from app.extract.pipeline import extract_many, extract_pipeline
+
+__all__ = ["ExtractedDocument", "extract_many", "extract_pipeline"]
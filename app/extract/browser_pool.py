@@ -0,0 +1,301 @@
+import asyncio
+import atexit
+import contextlib
+import os
+import threading
+
+try:
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    from playwright.async_api import async_playwright
+
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:  # Playwright is optional; only the JS-rendered fallback needs it
+    async_playwright = None
+    PLAYWRIGHT_AVAILABLE = False
+
+    class PlaywrightTimeoutError(Exception):
+        pass
+
+
+MAX_PAGES = int(os.getenv("PLAYWRIGHT_MAX_PAGES", "4"))
+CONTEXT_MAX_USES = int(os.getenv("PLAYWRIGHT_CONTEXT_MAX_USES", "50"))
+BLOCKED_RESOURCE_TYPES = frozenset(
+    t.strip()
+    for t in os.getenv("PLAYWRIGHT_BLOCK_RESOURCES", "image,font,media").split(",")
+    if t.strip()
+)
+# Paragraphs inside the main content area mean the article has rendered.
+READY_SELECTOR = os.getenv(
+    "PLAYWRIGHT_READY_SELECTOR", "article p, main p, [role='main'] p"
+)
+READY_TIMEOUT = float(os.getenv("PLAYWRIGHT_READY_TIMEOUT", "5"))
+SHUTDOWN_TIMEOUT = 10
+
+# Attempt to dismiss common cookie banners.
+# This is a heuristic and might need to be expanded
+DISMISS_COOKIE_BANNER_JS = """
+    const selectors = [
+        '#onetrust-accept-btn-handler',
+        '.cc-allow',
+        'button[id*="cookie"][id*="accept"]',
+        'button[class*="cookie"][class*="accept"]',
+        'button:has-text("Accept All")',
+        'button:has-text("Agree")'
+    ];
+    for (const selector of selectors) {
+        const button = document.querySelector(selector);
+        if (button) {
+            button.click();
+            console.log('Clicked cookie banner button:', selector);
+            break;
+        }
+    }
+"""
+
+
+async def _close_quietly(obj):
+    try:
+        await obj.close()
+    except Exception:
+        pass
+
+
+async def wait_until_ready(page, timeout: float, selector: str | None = READY_SELECTOR):
+    """
+    Waits until the page is quiet on the network or its main content has
+    rendered, whichever happens first. Gives up silently after ``timeout``
+    seconds so the caller can take whatever has rendered so far.
+    """
+    timeout_ms = timeout * 1000
+    waiters = [
+        asyncio.ensure_future(
+            page.wait_for_load_state("networkidle", timeout=timeout_ms)
+        )
+    ]
+    if selector:
+        waiters.append(
+            asyncio.ensure_future(
+                page.wait_for_selector(selector, state="attached", timeout=timeout_ms)
+            )
+        )
+    done, pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+    for waiter in pending:
+        waiter.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    for waiter in done:
+        waiter.exception()  # mark retrieved; a timeout here is not an error
+
+
+class BrowserPool:
+    """
+    One long-lived Chromium with a pool of reusable browser contexts.
+
+    At most ``max_pages`` pages are open at once; each borrows an idle context
+    (cookies cleared between uses) and contexts are recycled after
+    ``context_max_uses`` pages to bound memory. Requests for resource types in
+    ``blocked_resource_types`` are aborted before they leave the browser.
+    The browser is relaunched if it crashes or disconnects.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = MAX_PAGES,
+        context_max_uses: int = CONTEXT_MAX_USES,
+        blocked_resource_types=BLOCKED_RESOURCE_TYPES,
+    ):
+        self.max_pages = max_pages
+        self.context_max_uses = context_max_uses
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        self._playwright = None
+        self._browser = None
+        self._launch_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_pages)
+        self._idle: list[tuple[object, int]] = []  # (context, pages served)
+        self._open_pages = 0
+        self._counters = {
+            "launches": 0,
+            "contexts_created": 0,
+            "contexts_reused": 0,
+            "contexts_recycled": 0,
+            "pages": 0,
+            "blocked_requests": 0,
+        }
+
+    def _connected(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _ensure_browser(self):
+        if self._connected():
+            return self._browser
+        async with self._launch_lock:
+            if not self._connected():
+                if async_playwright is None:
+                    raise RuntimeError("playwright is not installed")
+                self._idle.clear()  # contexts die with their browser
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch()
+                self._counters["launches"] += 1
+        return self._browser
+
+    async def _route(self, route):
+        if route.request.resource_type in self.blocked_resource_types:
+            self._counters["blocked_requests"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _acquire_context(self):
+        browser = await self._ensure_browser()
+        if self._idle:
+            self._counters["contexts_reused"] += 1
+            return self._idle.pop()
+        context = await browser.new_context()
+        if self.blocked_resource_types:
+            await context.route("**/*", self._route)
+        self._counters["contexts_created"] += 1
+        return context, 0
+
+    async def _release_context(self, context, uses: int):
+        if uses >= self.context_max_uses or not self._connected():
+            self._counters["contexts_recycled"] += 1
+            await _close_quietly(context)
+            return
+        try:
+            await context.clear_cookies()
+        except Exception:
+            await _close_quietly(context)
+            return
+        self._idle.append((context, uses))
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        """Yields a fresh page in a pooled context, waiting for a free slot."""
+        async with self._slots:
+            context, uses = await self._acquire_context()
+            try:
+                page = await context.new_page()
+            except Exception:
+                await _close_quietly(context)
+                raise
+            self._open_pages += 1
+            self._counters["pages"] += 1
+            try:
+                yield page
+            finally:
+                self._open_pages -= 1
+                await _close_quietly(page)
+                await self._release_context(context, uses + 1)
+
+    async def render(self, url: str, timeout: float) -> tuple[str, int | None, dict]:
+        """
+        Loads ``url``, waits for it to be ready and returns the rendered HTML
+        with the main document's status code and headers.
+        """
+        async with self.page() as page:
+            response = await page.goto(
+                url, timeout=timeout * 1000, wait_until="domcontentloaded"
+            )
+            await page.evaluate(DISMISS_COOKIE_BANNER_JS)
+            await wait_until_ready(page, min(timeout, READY_TIMEOUT))
+            html = await page.content()
+            if response is None:
+                return html, None, {}
+            return html, response.status, dict(response.headers)
+
+    async def close(self):
+        while self._idle:
+            await _close_quietly(self._idle.pop()[0])
+        if self._browser is not None:
+            await _close_quietly(self._browser)
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def stats(self) -> dict:
+        return {
+            **self._counters,
+            "connected": self._connected(),
+            "open_pages": self._open_pages,
+            "idle_contexts": len(self._idle),
+            "max_pages": self.max_pages,
+        }
+
+
+class _BrowserPoolThread:
+    """
+    Runs the process-wide BrowserPool on its own event loop thread.
+
+    Playwright objects are bound to the loop that created them, and callers
+    typically run the async pipeline under a short-lived ``asyncio.run`` loop,
+    so the pool lives on a dedicated loop that outlives them. Rebuilt after a
+    fork, since neither the thread nor the browser survives it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop = None
+        self._pool = None
+
+    def get(self) -> tuple[asyncio.AbstractEventLoop, BrowserPool]:
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="storyspool-browser", daemon=True
+                ).start()
+                self._loop, self._pool, self._pid = loop, BrowserPool(), os.getpid()
+            return self._loop, self._pool
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                return {"active": False}
+            return {"active": True, **self._pool.stats()}
+
+    def shutdown(self):
+        with self._lock:
+            loop, pool = self._loop, self._pool
+            owned = self._pid == os.getpid()
+            self._loop = self._pool = self._pid = None
+        if pool is None or not owned:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(pool.close(), loop).result(
+                SHUTDOWN_TIMEOUT
+            )
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_pool_thread = _BrowserPoolThread()
+atexit.register(_pool_thread.shutdown)
+
+
+async def render_page(url: str, timeout: float) -> tuple[str, int | None, dict]:
+    """
+    Renders ``url`` in the shared browser pool from any event loop.
+
+    Returns:
+        tuple[str, int | None, dict]: Rendered HTML, the document's HTTP status
+        (None if unknown) and its response headers.
+    """
+    loop, pool = _pool_thread.get()
+    future = asyncio.run_coroutine_threadsafe(pool.render(url, timeout), loop)
+    return await asyncio.wrap_future(future)
+
+
+def browser_pool_stats() -> dict:
+    """Returns launch, context reuse and blocked-request counters."""
+    return _pool_thread.stats()
+
+
+def shutdown_browser_pool():
+    """Closes the shared browser; the next render launches a new one."""
+    _pool_thread.shutdown()
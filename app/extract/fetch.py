@@ -1,12 +1,12 @@
 import httpx
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-from playwright.async_api import async_playwright
 
+from app.extract.browser_pool import PlaywrightTimeoutError, render_page
 from app.extract.errors import (
     ContentTypeError,
     HTTPError,
     NetworkError,
 )
+from app.extract.http_client import afetch
 
 
 async def fetch_content(url: str, timeout: int = 15) -> tuple[bytes | None, dict]:
@@ -49,79 +49,50 @@ async def fetch_content(url: str, timeout: int = 15) -> tuple[bytes | None, dict
 async def _fetch_with_httpx(
     url: str, timeout: int, headers: dict
 ) -> tuple[bytes | None, dict]:
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, timeout=timeout, headers=headers)
+    # Uses the shared pooled client so connections are reused across fetches
+    try:
+        response = await afetch(url, headers=headers, timeout=timeout)
         response.raise_for_status()  # Raises HTTPStatusError for 4xx/5xx responses
+    except (httpx.RequestError, httpx.HTTPStatusError) as e:
+        _raise_httpx_error(e, url)
 
-        content_type = response.headers.get("Content-Type", "").lower()
-        if "application/pdf" in content_type:
-            return response.content, {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "content_type": content_type,
-            }
-        if "text/html" not in content_type:
-            raise ContentTypeError(
-                f"Unsupported content type: {content_type}. Expected text/html.",
-                error_code="UNSUPPORTED_CONTENT_TYPE",
-            )
-
+    content_type = response.headers.get("Content-Type", "").lower()
+    if "application/pdf" in content_type:
         return response.content, {
             "status_code": response.status_code,
             "headers": dict(response.headers),
             "content_type": content_type,
         }
+    if "text/html" not in content_type:
+        raise ContentTypeError(
+            f"Unsupported content type: {content_type}. Expected text/html.",
+            error_code="UNSUPPORTED_CONTENT_TYPE",
+        )
 
+    return response.content, {
+        "status_code": response.status_code,
+        "headers": dict(response.headers),
+        "content_type": content_type,
+    }
 
-async def _fetch_with_playwright(url: str, timeout: int) -> tuple[bytes | None, dict]:
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        try:
-            await page.goto(url, timeout=timeout * 1000)  # Playwright timeout is in ms
-
-            # Attempt to dismiss common cookie banners
-            # This is a heuristic and might need to be expanded
-            await page.evaluate(
-                """
-                const selectors = [
-                    '#onetrust-accept-btn-handler',
-                    '.cc-allow',
-                    'button[id*="cookie"][id*="accept"]',
-                    'button[class*="cookie"][class*="accept"]',
-                    'button:has-text("Accept All")',
-                    'button:has-text("Agree")'
-                ];
-                for (const selector of selectors) {
-                    const button = document.querySelector(selector);
-                    if (button) {
-                        button.click();
-                        console.log('Clicked cookie banner button:', selector);
-                        break;
-                    }
-                }
-            """
-            )
-            await page.wait_for_timeout(
-                1000
-            )  # Give some time for the banner to disappear
 
-            content = await page.content()
-            return content.encode("utf-8"), {
-                "status_code": 200,  # Playwright doesn't give direct HTTP status for final page content
-                "headers": {},  # Headers are not easily accessible for the final rendered page
-                "content_type": "text/html; charset=utf-8",
-            }
-        except PlaywrightTimeoutError:
-            raise NetworkError(
-                f"Playwright timed out for {url}", error_code="PLAYWRIGHT_TIMEOUT"
-            )
-        except Exception as e:
-            raise NetworkError(
-                f"Playwright error for {url}: {e}", error_code="PLAYWRIGHT_ERROR"
-            )
-        finally:
-            await browser.close()
+async def _fetch_with_playwright(url: str, timeout: int) -> tuple[bytes | None, dict]:
+    # Renders in the process-wide browser pool instead of launching Chromium per URL
+    try:
+        content, status_code, headers = await render_page(url, timeout)
+    except PlaywrightTimeoutError:
+        raise NetworkError(
+            f"Playwright timed out for {url}", error_code="PLAYWRIGHT_TIMEOUT"
+        )
+    except Exception as e:
+        raise NetworkError(
+            f"Playwright error for {url}: {e}", error_code="PLAYWRIGHT_ERROR"
+        )
+    return content.encode("utf-8"), {
+        "status_code": status_code or 200,
+        "headers": headers,
+        "content_type": "text/html; charset=utf-8",
+    }
 
 
 # Re-raise httpx exceptions as custom errors for consistent handling
@@ -0,0 +1,294 @@
+import asyncio
+import ipaddress
+import os
+import socket
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+
+import anyio
+import httpcore
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 negotiation in httpx)
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # HTTP/2 is optional; fall back to HTTP/1.1 keep-alive
+    HTTP2_AVAILABLE = False
+
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "6"))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+DNS_CACHE_TTL = float(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+# Per-host limits are kept for this many recently used hosts; idle ones
+# beyond it are forgotten, so crawling many sites can't grow memory forever.
+MAX_TRACKED_HOSTS = int(os.getenv("HTTP_MAX_TRACKED_HOSTS", "1024"))
+DEFAULT_TIMEOUT = 20
+
+
+class _DNSCache:
+    """Thread-safe TTL cache of resolved addresses, keyed by (host, port)."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, int], tuple[float, list[str]]] = {}
+
+    def get(self, host: str, port: int) -> list[str] | None:
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return entry[1]
+
+    def put(self, host: str, port: int, infos) -> list[str]:
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def forget(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+_dns_cache = _DNSCache(DNS_CACHE_TTL)
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class _CachingSyncBackend(httpcore.SyncBackend):
+    """Resolves hostnames through the DNS cache before connecting."""
+
+    def connect_tcp(
+        self, host, port, timeout=None, local_address=None, socket_options=None
+    ):
+        if _is_ip(host):
+            return super().connect_tcp(
+                host, port, timeout, local_address, socket_options
+            )
+        addresses = _dns_cache.get(host, port)
+        if addresses is None:
+            try:
+                infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            except OSError as e:
+                raise httpcore.ConnectError(str(e)) from e
+            addresses = _dns_cache.put(host, port, infos)
+        error = None
+        for address in addresses:
+            try:
+                return super().connect_tcp(
+                    address, port, timeout, local_address, socket_options
+                )
+            except httpcore.ConnectError as e:
+                error = e
+        _dns_cache.forget(host, port)
+        raise error
+
+
+class _CachingAsyncBackend(httpcore.AnyIOBackend):
+    """Async counterpart of _CachingSyncBackend."""
+
+    async def connect_tcp(
+        self, host, port, timeout=None, local_address=None, socket_options=None
+    ):
+        if _is_ip(host):
+            return await super().connect_tcp(
+                host, port, timeout, local_address, socket_options
+            )
+        addresses = _dns_cache.get(host, port)
+        if addresses is None:
+            try:
+                infos = await anyio.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            except OSError as e:
+                raise httpcore.ConnectError(str(e)) from e
+            addresses = _dns_cache.put(host, port, infos)
+        error = None
+        for address in addresses:
+            try:
+                return await super().connect_tcp(
+                    address, port, timeout, local_address, socket_options
+                )
+            except httpcore.ConnectError as e:
+                error = e
+        _dns_cache.forget(host, port)
+        raise error
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def _install_backend(transport, backend):
+    """
+    Swaps ``backend`` into the httpcore pool behind an httpx transport.
+
+    httpx has no public option for httpcore's ``network_backend``, so this
+    relies on the pool's attribute. httpx and httpcore are pinned in
+    requirements.txt, and tests/test_http_client.py checks that requests
+    really go through the backend, so an upgrade that moves it fails there.
+    """
+    pool = getattr(transport, "_pool", None)
+    if not hasattr(pool, "_network_backend"):
+        raise RuntimeError(
+            f"httpx {httpx.__version__} / httpcore {httpcore.__version__}: "
+            "cannot install the caching network backend."
+        )
+    pool._network_backend = backend
+    return transport
+
+
+def _build_client() -> httpx.Client:
+    transport = httpx.HTTPTransport(http2=HTTP2_AVAILABLE, limits=_limits())
+    _install_backend(transport, _CachingSyncBackend())
+    return httpx.Client(transport=transport, follow_redirects=True)
+
+
+def _build_async_client() -> httpx.AsyncClient:
+    transport = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=_limits())
+    _install_backend(transport, _CachingAsyncBackend())
+    return httpx.AsyncClient(transport=transport, follow_redirects=True)
+
+
+class _HostSlots:
+    """
+    Per-host semaphores for the ``max_hosts`` most recently used hosts.
+
+    Hosts beyond that are forgotten in LRU order, but only while idle: a host
+    with requests in flight keeps its semaphore, so its limit always holds.
+    """
+
+    def __init__(self, make_semaphore, max_hosts: int = MAX_TRACKED_HOSTS):
+        self._make = make_semaphore
+        self.max_hosts = max_hosts
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, list] = OrderedDict()  # host -> [sem, users]
+
+    def checkout(self, host: str):
+        """Returns ``host``'s semaphore; pair with checkin() when done with it."""
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None:
+                entry = self._entries[host] = [self._make(), 0]
+            self._entries.move_to_end(host)
+            entry[1] += 1
+            while len(self._entries) > self.max_hosts:
+                idle = next((h for h, e in self._entries.items() if not e[1]), None)
+                if idle is None:
+                    break
+                del self._entries[idle]
+            return entry[0]
+
+    def checkin(self, host: str):
+        with self._lock:
+            self._entries[host][1] -= 1
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+_host_slots = _HostSlots(lambda: threading.BoundedSemaphore(MAX_CONNECTIONS_PER_HOST))
+
+# Async clients and semaphores are bound to the event loop that created them,
+# and live as long as it does (see _close_with_loop).
+_async_states: dict[asyncio.AbstractEventLoop, tuple] = {}
+_async_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Returns the process-wide pooled synchronous client."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Returns the pooled async client for the running event loop."""
+    return _loop_state()[0]
+
+
+async def _close_with_loop(loop, client: httpx.AsyncClient):
+    """
+    Waits for the loop to shut down, then closes its client. asyncio.run()
+    cancels every task left when its main coroutine returns, which lets this
+    close the client's connections while the loop can still run.
+    """
+    try:
+        await loop.create_future()
+    finally:
+        with _async_lock:
+            _async_states.pop(loop, None)
+        await client.aclose()
+
+
+def _loop_state():
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        state = _async_states.get(loop)
+        if state is not None:
+            return state
+        # Loops closed without cancelling their tasks never ran the closer.
+        for closed in [lp for lp in _async_states if lp.is_closed()]:
+            del _async_states[closed]
+        client = _build_async_client()
+        state = (
+            client,
+            _HostSlots(lambda: asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST)),
+            loop.create_task(_close_with_loop(loop, client)),
+        )
+        _async_states[loop] = state
+    return state
+
+
+def _host(url: str) -> str:
+    return (urllib.parse.urlsplit(url).hostname or "").lower()
+
+
+def fetch(url: str, headers: dict | None = None, timeout: float = DEFAULT_TIMEOUT):
+    """
+    GETs ``url`` on the shared client, following redirects, with at most
+    MAX_CONNECTIONS_PER_HOST requests in flight to any single host.
+
+    Returns:
+        httpx.Response: The response with its body already read.
+    """
+    host = _host(url)
+    slots = _host_slots.checkout(host)
+    try:
+        with slots:
+            return get_http_client().get(url, headers=headers, timeout=timeout)
+    finally:
+        _host_slots.checkin(host)
+
+
+async def afetch(
+    url: str, headers: dict | None = None, timeout: float = DEFAULT_TIMEOUT
+):
+    """Async counterpart of fetch() on the event loop's shared client."""
+    client, host_slots, _ = _loop_state()
+    host = _host(url)
+    slots = host_slots.checkout(host)
+    try:
+        async with slots:
+            return await client.get(url, headers=headers, timeout=timeout)
+    finally:
+        host_slots.checkin(host)
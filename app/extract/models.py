@@ -16,6 +16,7 @@ class ExtractedDocument:
         status (str): The status of the extraction ("success", "fetch_error", "parse_error").
         title (str | None): The title of the extracted content.
         text_excerpt (str | None): A truncated excerpt of the readable text.
+        text (str | None): The full readable text.
         byline (str | None): The author or byline of the content.
         error_code (str | None): A specific error code if an error occurred.
         raw_html_gcs_path (str | None): Optional GCS path to the stored raw HTML.
@@ -32,3 +33,4 @@ class ExtractedDocument:
     byline: str | None = None
     error_code: str | None = None
     raw_html_gcs_path: str | None = None
+    text: str | None = None
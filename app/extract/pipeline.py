@@ -0,0 +1,162 @@
+import asyncio
+import datetime
+import functools
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import PyPDF2
+import trafilatura
+
+from app.extract.errors import ExtractionError, ParseError
+from app.extract.fetch import fetch_content
+from app.extract.models import ExtractedDocument
+from app.extract.normalize import normalize_url
+from app.extract.parse import detect_and_parse
+from app.extract.pdf_parser import extract_text_from_pdf
+
+PARSE_WORKERS = int(
+    os.getenv("EXTRACT_PARSE_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+MAX_IN_FLIGHT = int(os.getenv("EXTRACT_MAX_IN_FLIGHT", "16"))
+EXCERPT_CHARS = 500
+DEFAULT_TIMEOUT = 15
+
+_parse_executor: ThreadPoolExecutor | None = None
+_parse_executor_lock = threading.Lock()
+
+
+def _get_parse_executor() -> ThreadPoolExecutor:
+    global _parse_executor
+    if _parse_executor is None:
+        with _parse_executor_lock:
+            if _parse_executor is None:
+                _parse_executor = ThreadPoolExecutor(
+                    max_workers=PARSE_WORKERS, thread_name_prefix="storyspool-parse"
+                )
+    return _parse_executor
+
+
+async def _run_parser(fn, *args):
+    """Runs a CPU-bound parser off the event loop so other fetches keep moving."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_parse_executor(), functools.partial(fn, *args)
+    )
+
+
+def _excerpt(text: str | None) -> str | None:
+    if not text:
+        return None
+    text = " ".join(text.split())
+    if len(text) <= EXCERPT_CHARS:
+        return text
+    return text[:EXCERPT_CHARS].rsplit(" ", 1)[0] + "…"
+
+
+def _document(
+    canonical: str, parser_name: str, parser_version: str, status: str, **fields
+):
+    return ExtractedDocument(
+        id=hashlib.sha256(canonical.encode("utf-8")).hexdigest(),
+        url_canonical=canonical,
+        fetched_at=datetime.datetime.now(datetime.timezone.utc),
+        parser_name=parser_name,
+        parser_version=parser_version,
+        status=status,
+        **fields,
+    )
+
+
+async def extract_pipeline(
+    url: str, timeout: int = DEFAULT_TIMEOUT
+) -> ExtractedDocument:
+    """
+    Fetches, normalizes and parses a single URL.
+
+    HTML is parsed with trafilatura and PDFs with the PDF parser, both in a
+    worker thread. Failures are reported on the returned document (status
+    "fetch_error" or "parse_error" with an error_code) rather than raised, so
+    a batch is never aborted by one bad URL.
+
+    Args:
+        url (str): The URL to extract.
+        timeout (int): Fetch timeout in seconds.
+
+    Returns:
+        ExtractedDocument: The extracted document or a description of the failure.
+    """
+    try:
+        canonical = normalize_url(url)
+    except ExtractionError as e:
+        return _document(
+            url,
+            "trafilatura",
+            trafilatura.__version__,
+            "fetch_error",
+            error_code=e.error_code or "INVALID_URL",
+        )
+
+    try:
+        content, metadata = await fetch_content(canonical, timeout=timeout)
+    except ExtractionError as e:
+        return _document(
+            canonical,
+            "trafilatura",
+            trafilatura.__version__,
+            "fetch_error",
+            error_code=e.error_code,
+        )
+
+    content_type = metadata.get("content_type", "")
+    if "application/pdf" in content_type:
+        parser_name, parser_version = "pypdf2", PyPDF2.__version__
+    else:
+        parser_name, parser_version = "trafilatura", trafilatura.__version__
+
+    try:
+        if parser_name == "pypdf2":
+            text = await _run_parser(extract_text_from_pdf, content)
+            if not text.strip():
+                raise ParseError(
+                    f"No text layer in PDF at {canonical}", error_code="EMPTY_PDF_TEXT"
+                )
+            data = {"text": text}
+        else:
+            data = await _run_parser(detect_and_parse, content, canonical, content_type)
+    except ExtractionError as e:
+        return _document(
+            canonical,
+            parser_name,
+            parser_version,
+            "parse_error",
+            error_code=e.error_code,
+        )
+
+    return _document(
+        canonical,
+        parser_name,
+        parser_version,
+        "success",
+        title=data.get("title"),
+        text=data.get("text"),
+        text_excerpt=_excerpt(data.get("text")),
+        byline=data.get("author"),
+    )
+
+
+async def extract_many(
+    urls, max_in_flight: int = MAX_IN_FLIGHT, timeout: int = DEFAULT_TIMEOUT
+) -> list[ExtractedDocument]:
+    """
+    Runs extract_pipeline over ``urls`` concurrently, with at most
+    ``max_in_flight`` extractions in progress. Results keep the input order.
+    """
+    slots = asyncio.Semaphore(max_in_flight)
+
+    async def run(url):
+        async with slots:
+            return await extract_pipeline(url, timeout=timeout)
+
+    return await asyncio.gather(*(run(url) for url in urls))
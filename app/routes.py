@@ -1,5 +1,7 @@
 import datetime
+import functools
 import hashlib
+from urllib.parse import urlparse
 
 from firebase_admin import auth
 from flask import (
@@ -16,18 +18,51 @@ from flask import (
     url_for,
 )
 
-from .services import rss
+from .extract.browser_pool import browser_pool_stats
+from .services import feeds, rss
 from .services.extract import extract_article
-from .services.jobs import JobStatus, create_job, get_job, list_user_jobs, update_job
-from .services.queue import enqueue_worker
+from .services.feed_cache import feed_cache_stats, get_feed_cache
+from .services.feed_tokens import (
+    rotate_feed_token,
+    user_feed_token,
+    verify_user_feed_token,
+)
+from .services.id_tokens import id_token_cert_stats
+from .services.jobs import (
+    JOB_LIST_FIELDS,
+    JobStatus,
+    create_job,
+    get_job,
+    job_needs_worker,
+    list_user_jobs,
+    update_job,
+)
+from .services.pagination import InvalidCursor, paginate
+from .services.queue import QueueFullError, enqueue_worker, queue_stats
 from .services.security import validate_external_url
-from .services.store import save_article_record
-from .services.users import current_user_id, require_login
+from .services.store import (
+    ARTICLE_LIST_FIELDS,
+    list_user_articles,
+    save_article_record,
+)
+from .services.tts import tts_client_stats
+from .services.tts_cache import chunk_cache_stats
+from .services.users import (
+    current_user_id,
+    purge_session,
+    require_login,
+    session_cache_stats,
+)
 from .worker import run_job
 
 bp = Blueprint("main", __name__)
 
 
+@bp.app_template_filter("urlparse")
+def urlparse_filter(url):
+    return urlparse(url or "")
+
+
 @bp.get("/healthz")
 def healthz():
     return "ok", 200
@@ -76,6 +111,7 @@ def session_login():
 @bp.post("/logout")
 def logout():
     """Clears the session cookie."""
+    purge_session(request.cookies.get(current_app.config["COOKIE_NAME"]))
     response = make_response(jsonify({"status": "success"}))
     response.set_cookie(
         current_app.config["COOKIE_NAME"],
@@ -88,20 +124,90 @@ def logout():
     return response
 
 
+# Listings are ordered by created_at, so cursors only need that field.
+LIST_CURSOR_FIELDS = ["created_at"]
+
+
+def _page_size() -> int:
+    """Reads ``limit`` from the query string, clamped to API_MAX_PAGE_SIZE."""
+    limit = request.args.get("limit", type=int)
+    if limit is None:
+        return current_app.config["API_PAGE_SIZE"]
+    return max(1, min(limit, current_app.config["API_MAX_PAGE_SIZE"]))
+
+
+def _requested_fields(allowed: list[str]) -> list[str]:
+    """
+    Reads the comma-separated ``fields`` projection from the query string.
+    ``id`` and ``created_at`` are always included since clients key rows by
+    id and the cursor is built from created_at.
+
+    Raises:
+        ValueError: If a field is not one of ``allowed``.
+    """
+    raw = request.args.get("fields")
+    if not raw:
+        return list(allowed)
+    requested = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    return [f for f in allowed if f in requested or f in ("id", "created_at")]
+
+
+def _list_response(list_fn, allowed_fields: list[str]):
+    """Serves one page of ``list_fn(limit=, start_after=, fields=)`` as JSON."""
+    try:
+        fields = _requested_fields(allowed_fields)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        page = paginate(
+            functools.partial(list_fn, fields=fields),
+            _page_size(),
+            request.args.get("cursor"),
+            LIST_CURSOR_FIELDS,
+        )
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(page), 200
+
+
 @bp.get("/articles")
 @require_login
 def article_list():
     uid = current_user_id()
-    jobs = list_user_jobs(uid)
-    feed_url = url_for("main.user_feed", uid=uid, _external=True)  # noqa: F841
+    # Only the first page is rendered; the rest loads from /api/jobs.
+    page = paginate(
+        functools.partial(list_user_jobs, uid, fields=JOB_LIST_FIELDS),
+        current_app.config["API_PAGE_SIZE"],
+        None,
+        LIST_CURSOR_FIELDS,
+    )
+    feed_url = _feed_url(uid)
     return render_template(
         "articles.html",
-        jobs=jobs,
+        jobs=page["items"],
+        next_cursor=page["next_cursor"],
         feed_url=feed_url,
         firebase_config=current_app.config["FIREBASE"],
     )
 
 
+def _queue_full_response(job_id: str, e: QueueFullError):
+    # Nothing will run the job now; show it as failed so it can be retried
+    # rather than leaving it queued forever.
+    update_job(
+        job_id,
+        status=JobStatus.FAILED_QUEUE,
+        last_error="The server is busy. Please retry in a moment.",
+    )
+    resp = jsonify({"error": "server busy, please retry later"})
+    resp.status_code = 429
+    resp.headers["Retry-After"] = str(e.retry_after)
+    return resp
+
+
 @bp.post("/jobs")
 @require_login
 def create_ingest_job():
@@ -112,7 +218,13 @@ def create_ingest_job():
     if not ok:
         return jsonify({"error": f"invalid url: {err}"}), 400
     doc = create_job(url, current_user_id())
-    enqueue_worker(doc["id"])
+    if not job_needs_worker(doc):
+        # Already done, or another worker is on it: nothing to enqueue.
+        return jsonify({"job_id": doc["id"], "status": doc["status"]}), 200
+    try:
+        enqueue_worker(doc["id"])
+    except QueueFullError as e:
+        return _queue_full_response(doc["id"], e)
     flash("Job queued.")
     return jsonify({"job_id": doc["id"], "status": doc["status"]}), 202
 
@@ -125,12 +237,33 @@ def job_status(job_id):
     return jsonify(j), 200
 
 
+@bp.get("/api/jobs")
+@require_login
+def api_list_jobs():
+    """Cursor-paged JSON listing of the current user's jobs, newest first."""
+    uid = current_user_id()
+    return _list_response(functools.partial(list_user_jobs, uid), JOB_LIST_FIELDS)
+
+
+@bp.get("/api/articles")
+@require_login
+def api_list_articles():
+    """Cursor-paged JSON listing of the current user's articles, newest first."""
+    uid = current_user_id()
+    return _list_response(
+        functools.partial(list_user_articles, uid), ARTICLE_LIST_FIELDS
+    )
+
+
 @bp.post("/jobs/<job_id>/retry")
 @require_login
 def retry_ingest_job(job_id):
     # Optional: check if user is allowed to retry this job
     update_job(job_id, status=JobStatus.QUEUED, last_error=None)
-    enqueue_worker(job_id)
+    try:
+        enqueue_worker(job_id)
+    except QueueFullError as e:
+        return _queue_full_response(job_id, e)
     return jsonify({"status": "re-queued"}), 200
 
 
@@ -156,41 +289,103 @@ def task_worker():
     return ({"ok": ok, "msg": msg}, 200 if ok else 500)
 
 
-@bp.get("/u/<uid>/feed.xml")
-@require_login
-def user_feed(uid):
-    """Generates the user's podcast feed on-demand with caching."""
-    if not uid or uid != current_user_id():
-        current_app.logger.warning(
-            "Attempted to access feed for another user or with empty UID."
-        )
-        abort(403, description="Forbidden")
+# Feeds behind require_login may only be cached by the user's own client;
+# signed feed URLs carry their own credential, so shared caches may keep them.
+PRIVATE_FEED_CACHE_CONTROL = "private, max-age=300"
 
+
+def _public_feed_cache_control() -> str:
+    return f"public, max-age={current_app.config['FEED_PUBLIC_MAX_AGE']}"
+
+
+def _conditional_feed_response(resp: Response, feed: dict, cache_control: str):
+    """Sets the feed's validators and turns ``resp`` into a 304 if they match."""
+    resp.headers["Cache-Control"] = cache_control
+    resp.set_etag(feed["etag"])
+    if feed.get("last_modified"):
+        resp.last_modified = feed["last_modified"]
+    return resp.make_conditional(request)
+
+
+def _feed_response(feed: dict, cache_control: str):
+    resp = Response(feed["xml"], mimetype="application/rss+xml; charset=utf-8")
+    return _conditional_feed_response(resp, feed, cache_control)
+
+
+def _feed_url(uid: str, cursor: str | None = None) -> str:
+    """
+    The external URL of ``uid``'s feed, or of its archive page ``cursor``:
+    the signed, login-free URL when FEED_TOKEN_SECRETS is set, else the
+    authenticated one.
+    """
+    token = user_feed_token(current_app.config, uid)
+    if token:
+        if cursor is None:
+            return url_for("main.signed_feed", uid=uid, token=token, _external=True)
+        return url_for(
+            "main.signed_feed_archive",
+            uid=uid,
+            token=token,
+            cursor=cursor,
+            _external=True,
+        )
+    if cursor is None:
+        return url_for("main.user_feed", uid=uid, _external=True)
+    return url_for("main.user_feed_archive", uid=uid, cursor=cursor, _external=True)
+
+
+def _feed_channel(uid: str) -> dict:
+    user = {
+        "user_id": uid
+    }  # Replace with actual user lookup if needed for more details
+    user_articles_url = url_for("main.article_list", _external=True)
+
+    return {
+        "title": f"StorySpool Feed for {user['user_id']}",
+        "link": user_articles_url,
+        "description": "Your personal feed of narrated articles from StorySpool.",
+        "author": "StorySpool",
+        "owner_name": "StorySpool",
+        "owner_email": "support@storyspool.com",
+        "image_url": url_for(
+            "static", filename="brand/storyspool_mark.svg", _external=True
+        ),
+        "archive_url": _feed_url(uid, feeds.CURSOR_PLACEHOLDER),
+    }
+
+
+def _serve_feed(uid: str, cache_control: str):
+    """
+    Serves the user's podcast feed from the render cache, else from the
+    materialized feed, building that on first poll.
+    """
     try:
-        items = rss.get_latest_items_for_user(uid, limit=100)
-
-        user = {
-            "user_id": uid
-        }  # Replace with actual user lookup if needed for more details
-        user_articles_url = url_for("main.article_list", _external=True)
-
-        channel = {
-            "title": f"StorySpool Feed for {user['user_id']}",
-            "link": user_articles_url,
-            "description": "Your personal feed of narrated articles from StorySpool.",
-            "author": "StorySpool",
-            "owner_name": "StorySpool",
-            "owner_email": "support@storyspool.com",
-            "image_url": url_for(
-                "static", filename="brand/storyspool_mark.svg", _external=True
-            ),
-        }
-
-        xml = rss.build_feed(uid, channel, items)
-
-        resp = Response(xml, mimetype="application/rss+xml; charset=utf-8")
-        resp.headers["Cache-Control"] = "public, max-age=300"  # Cache for 5 minutes
-        return resp
+        # Renders made with another channel (e.g. archive links signed with a
+        # rotated-out secret) are neither served nor answered with a 304.
+        channel = _feed_channel(uid)
+        cache = get_feed_cache(current_app.config)
+        cached, cache_version = cache.lookup(uid) if cache else (None, None)
+        if cached is not None and not feeds.is_stale(cached, channel):
+            return _feed_response(cached, cache_control)
+
+        if request.if_none_match or request.if_modified_since:
+            validators = feeds.get_feed_validators(uid)
+            if validators is not None and not feeds.is_stale(validators, channel):
+                resp = _conditional_feed_response(
+                    Response(mimetype="application/rss+xml; charset=utf-8"),
+                    validators,
+                    cache_control,
+                )
+                if resp.status_code == 304:
+                    return resp
+
+        feed = feeds.get_feed(uid)
+        if feed is None or feeds.is_stale(feed, channel):
+            items = rss.get_latest_items_for_user(uid, limit=feeds.FEED_ITEM_LIMIT)
+            feed = feeds.build_feed(uid, channel, items)
+        if cache is not None:
+            cache.store(uid, cache_version, feed)
+        return _feed_response(feed, cache_control)
     except Exception as e:
         current_app.logger.exception(f"Error generating RSS feed for user {uid}: {e}")
         # Return an empty, but valid, RSS feed to prevent client crashes
@@ -212,6 +407,80 @@ def user_feed(uid):
         return resp
 
 
+def _serve_archive(uid: str, cursor: str):
+    """Serves an RFC 5005 archive page; full pages never change."""
+    try:
+        page = feeds.get_archive_page(uid, cursor)
+    except InvalidCursor:
+        abort(404)
+    if page is None:
+        abort(404)
+
+    channel = _feed_channel(uid)
+    links = [["current", _feed_url(uid)]]
+    if page["prev"]:
+        links.append(["prev-archive", feeds.archive_url(channel, page["prev"])])
+    xml = rss.build_feed(
+        uid, {**channel, "archived": True, "links": links}, page["items"]
+    )
+
+    resp = Response(xml, mimetype="application/rss+xml; charset=utf-8")
+    resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return resp
+
+
+@bp.get("/u/<uid>/feed.xml")
+@require_login
+def user_feed(uid):
+    if not uid or uid != current_user_id():
+        current_app.logger.warning(
+            "Attempted to access feed for another user or with empty UID."
+        )
+        abort(403, description="Forbidden")
+    return _serve_feed(uid, PRIVATE_FEED_CACHE_CONTROL)
+
+
+@bp.get("/u/<uid>/feed/archive/<cursor>.xml")
+@require_login
+def user_feed_archive(uid, cursor):
+    if not uid or uid != current_user_id():
+        abort(403, description="Forbidden")
+    return _serve_archive(uid, cursor)
+
+
+def _require_feed_token(uid: str, token: str):
+    # 404 rather than 403, so probing reveals nothing about which uids exist.
+    if not verify_user_feed_token(current_app.config, uid, token):
+        abort(404)
+
+
+@bp.post("/feed/rotate")
+@require_login
+def rotate_feed_url():
+    """
+    Issues the user a new signed feed URL and revokes the old one, e.g. after
+    it leaked. Stored and cached renders rebuild on their own, since their
+    archive links no longer match the channel.
+    """
+    if not user_feed_token(current_app.config, current_user_id()):
+        return jsonify({"error": "signed feed URLs are not enabled"}), 400
+    rotate_feed_token(current_user_id())
+    return jsonify({"feed_url": _feed_url(current_user_id())}), 200
+
+
+@bp.get("/f/<uid>/<token>/feed.xml")
+def signed_feed(uid, token):
+    """The user's feed for podcast apps: the URL's HMAC token is the credential."""
+    _require_feed_token(uid, token)
+    return _serve_feed(uid, _public_feed_cache_control())
+
+
+@bp.get("/f/<uid>/<token>/archive/<cursor>.xml")
+def signed_feed_archive(uid, cursor, token):
+    _require_feed_token(uid, token)
+    return _serve_archive(uid, cursor)
+
+
 @bp.get("/_health/firestore")
 def firestore_health_check():
     from flask import current_app
@@ -237,3 +506,16 @@ def firestore_health_check():
         )
     except Exception as e:
         return {"status": "error", "message": f"Firestore connection failed: {e}"}, 500
+
+
+@bp.get("/_health/metrics")
+def metrics():
+    return {
+        "queue": queue_stats(),
+        "tts_cache": chunk_cache_stats(),
+        "tts_client": tts_client_stats(),
+        "browser_pool": browser_pool_stats(),
+        "feed_cache": feed_cache_stats(),
+        "session_cache": session_cache_stats(),
+        "id_token_certs": id_token_cert_stats(),
+    }, 200
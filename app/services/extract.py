@@ -1,9 +1,19 @@
+import json
 from dataclasses import asdict, dataclass
 from urllib.parse import urlparse
 
-import requests
 import trafilatura
-from bs4 import BeautifulSoup
+from trafilatura.utils import load_html
+
+from app.extract.http_client import fetch
+
+BROWSER_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/91.0.4472.124 Safari/537.36"
+    )
+}
 
 
 @dataclass
@@ -20,41 +30,69 @@ class ArticleMeta:
     language: str | None = None
 
 
-def _fallback_title(html):
-    soup = BeautifulSoup(html, "html.parser")
-    if soup.title and soup.title.string:
-        return soup.title.string.strip()
-    og = soup.find("meta", property="og:title")
-    return og["content"].strip() if og and og.get("content") else "Untitled"
+def _html_metadata(tree, url: str) -> dict:
+    """
+    Collects page-level metadata in a single walk over an already-parsed lxml
+    tree: <title>, rel=canonical, og:* properties and JSON-LD blocks.
+    """
+    title = None
+    canonical = None
+    og = {}
+    json_ld = []
+    if tree is not None:
+        for el in tree.iter("title", "meta", "link", "script"):
+            if el.tag == "title":
+                if title is None and el.text and el.text.strip():
+                    title = el.text.strip()
+            elif el.tag == "meta":
+                prop = el.get("property") or ""
+                content = (el.get("content") or "").strip()
+                if prop.startswith("og:") and content:
+                    og.setdefault(prop[3:], content)
+            elif el.tag == "link":
+                rel = (el.get("rel") or "").lower().split()
+                if canonical is None and "canonical" in rel and el.get("href"):
+                    canonical = el.get("href").strip()
+            elif (el.get("type") or "").lower() == "application/ld+json":
+                try:
+                    json_ld.append(json.loads(el.text or ""))
+                except ValueError:
+                    pass
+    return {
+        "title": title or og.get("title") or "Untitled",
+        "canonical_url": canonical or og.get("url") or url,
+        "og": og,
+        "json_ld": json_ld,
+    }
 
 
-def _canonical_url(html, url):
-    soup = BeautifulSoup(html, "html.parser")
-    link = soup.find("link", rel="canonical")
-    og = soup.find("meta", property="og:url")
-    return (link["href"].strip() if link and link.get("href") else None) or (
-        og["content"].strip() if og and og.get("content") else url
-    )
+def fetch_html(url: str) -> str:
+    """Downloads a page once over the shared pooled HTTP client."""
+    resp = fetch(url, headers=BROWSER_HEADERS)
+    resp.raise_for_status()
+    return resp.text
 
 
 def extract_article(url: str) -> dict:
-    downloaded = trafilatura.fetch_url(url)
+    html = fetch_html(url)
+    # Parse once: page metadata is read from the tree first, then the same tree
+    # is handed to trafilatura (which prunes it in place while extracting).
+    tree = load_html(html) if html else None
+    page_meta = _html_metadata(tree, url)
     result = trafilatura.extract(
-        downloaded,
+        tree if tree is not None else html,
         include_comments=False,
         include_tables=False,
         include_images=False,
-        output="json",
+        output_format="json",
     )
     data = {}  # Initialize data as empty dict
     if result:
-        import json as _json
-
         from flask import current_app  # Ensure current_app is imported for logging
 
         try:
-            data = _json.loads(result)
-        except _json.JSONDecodeError:
+            data = json.loads(result)
+        except json.JSONDecodeError:
             current_app.logger.warning(
                 f"Trafilatura returned invalid JSON for {url}. Falling back to HTML parsing."
             )
@@ -63,34 +101,25 @@ def extract_article(url: str) -> dict:
     title = data.get("title")
     author = data.get("author", "") or None
     text = data.get("text", "")
-    summary = data.get("summary") or None
-    image = data.get("image") or None
+    summary = data.get("summary") or page_meta["og"].get("description")
+    image = data.get("image") or page_meta["og"].get("image")
     published = data.get("date") or None
     canonical = data.get("source") or None
     lang = data.get("language") or None
 
-    # Fallback to direct HTML parsing if structured data is missing or JSON parsing failed
+    # Fallback to direct HTML parsing if structured data is missing or JSON parsing failed.
+    # Reuses the HTML downloaded above rather than fetching the page again.
     if not title or not text:
         # Ensure current_app is imported for logging
         from flask import current_app
 
         current_app.logger.debug(f"Falling back to direct HTML parsing for {url}")
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/91.0.4472.124 Safari/537.36"
-            )
-        }
-        resp = requests.get(url, headers=headers, timeout=20)
-        resp.raise_for_status()
-        html = resp.text
         if not title:
-            title = _fallback_title(html)
+            title = page_meta["title"]
         if not text:
             text = trafilatura.extract(html) or ""  # Extract plain text
         if not canonical:
-            canonical = _canonical_url(html, url)
+            canonical = page_meta["canonical_url"]
     site = urlparse(url).netloc
     meta = ArticleMeta(
         url=url,
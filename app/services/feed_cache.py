@@ -0,0 +1,273 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import current_app
+
+try:
+    import redis
+except ImportError:  # listed in requirements.txt; without it the cache is off
+    redis = None
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 3600
+KEY_PREFIX = "feed:"
+# FEED_CACHE_REDIS_URL value selecting InMemorySharedStore. Only correct with a
+# single process, since invalidations never reach other processes.
+MEMORY_URL = "memory://"
+
+_SHARED_ERRORS = (redis.RedisError,) if redis is not None else ()
+
+
+class InMemorySharedStore:
+    """
+    Process-local stand-in for the Redis commands the feed cache uses
+    (``get``, ``set`` with ``ex``, ``incr``, ``delete``), for benchmarks and
+    tests (FEED_CACHE_REDIS_URL=memory://).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: dict[str, tuple[bytes, float | None]] = {}
+
+    def _live(self, key: str):
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._live(key)
+            return entry[0] if entry else None
+
+    def set(self, key: str, value, ex: int | None = None):
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        with self._lock:
+            self._data[key] = (value, time.time() + ex if ex else None)
+        return True
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            entry = self._live(key)
+            value = int(entry[0]) + 1 if entry else 1
+            self._data[key] = (str(value).encode("ascii"), None)
+            return value
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(k, None) is not None for k in keys)
+
+
+def _dumps(feed: dict) -> str:
+    last_modified = feed.get("last_modified")
+    entry = {
+        "xml": feed["xml"],
+        "etag": feed["etag"],
+        "last_modified": last_modified.isoformat() if last_modified else None,
+    }
+    if feed.get("channel") is not None:
+        entry["channel"] = feed["channel"]
+    return json.dumps(entry)
+
+
+def _loads(raw) -> dict:
+    entry = json.loads(raw)
+    if entry.get("last_modified"):
+        entry["last_modified"] = datetime.fromisoformat(entry["last_modified"])
+    return entry
+
+
+class FeedRenderCache:
+    """
+    Two-tier cache of rendered feeds (``xml``, ``etag``, ``last_modified``).
+
+    Entries are keyed by uid and the uid's cache version, a counter kept in
+    the shared tier and bumped by ``invalidate``. A lookup reads only that
+    counter from the shared tier when the local tier already holds the
+    current version, so a hit needs neither Firestore nor rendering. The
+    local tier is an LRU of at most ``max_entries`` users; the shared tier is
+    Redis (or InMemorySharedStore) and lets instances reuse each other's
+    renders.
+    """
+
+    def __init__(
+        self,
+        shared=None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: int = DEFAULT_TTL_SECONDS,
+    ):
+        self.shared = shared if shared is not None else InMemorySharedStore()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._local: OrderedDict[str, tuple[int, dict]] = OrderedDict()
+        self._counters = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "invalidations": 0,
+            "evictions": 0,
+            "shared_errors": 0,
+        }
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    @staticmethod
+    def _version_key(uid: str) -> str:
+        return f"{KEY_PREFIX}{uid}:version"
+
+    @staticmethod
+    def _entry_key(uid: str, version: int) -> str:
+        return f"{KEY_PREFIX}{uid}:{version}"
+
+    def lookup(self, uid: str) -> tuple[dict | None, int | None]:
+        """
+        Returns ``(feed, version)``. ``feed`` is None on a miss; pass the
+        version on to ``store`` so a render that raced with an invalidation is
+        stored under the old version and never served. ``version`` is None if
+        the shared tier is unreachable, in which case nothing is cached.
+        """
+        try:
+            raw_version = self.shared.get(self._version_key(uid))
+        except _SHARED_ERRORS:
+            self._count("shared_errors")
+            return None, None
+        version = int(raw_version or 0)
+
+        with self._lock:
+            local = self._local.get(uid)
+            if local is not None and local[0] == version:
+                self._local.move_to_end(uid)
+                self._counters["local_hits"] += 1
+                return local[1], version
+
+        try:
+            raw = self.shared.get(self._entry_key(uid, version))
+        except _SHARED_ERRORS:
+            self._count("shared_errors")
+            raw = None
+        if raw is None:
+            self._count("misses")
+            return None, version
+        feed = _loads(raw)
+        self._count("shared_hits")
+        self._put_local(uid, version, feed)
+        return feed, version
+
+    def store(self, uid: str, version: int | None, feed: dict):
+        if version is None:
+            return
+        self._put_local(uid, version, feed)
+        self._count("writes")
+        try:
+            self.shared.set(self._entry_key(uid, version), _dumps(feed), ex=self.ttl)
+        except _SHARED_ERRORS:
+            self._count("shared_errors")
+
+    def invalidate(self, uid: str):
+        """Retires every cached render of ``uid`` in every process sharing ``shared``."""
+        with self._lock:
+            self._local.pop(uid, None)
+            self._counters["invalidations"] += 1
+        try:
+            self.shared.incr(self._version_key(uid))
+        except _SHARED_ERRORS:
+            self._count("shared_errors")
+
+    def _put_local(self, uid: str, version: int, feed: dict):
+        entry = {k: feed.get(k) for k in ("xml", "etag", "last_modified")}
+        if feed.get("channel") is not None:
+            entry["channel"] = feed["channel"]  # lets routes spot stale renders
+        with self._lock:
+            self._local[uid] = (version, entry)
+            self._local.move_to_end(uid)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = (
+                self._counters["local_hits"]
+                + self._counters["shared_hits"]
+                + self._counters["misses"]
+            )
+            hits = lookups - self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._local),
+                "max_entries": self.max_entries,
+                "hit_ratio": (hits / lookups) if lookups else 0.0,
+            }
+
+
+_cache: FeedRenderCache | None = None
+_cache_lock = threading.Lock()
+_unavailable_logged = False
+
+
+def _shared_store(redis_url: str):
+    """
+    Returns the shared tier for ``redis_url``, or None if there is none. A
+    render cache without a store shared by all processes would keep serving
+    feeds that another gunicorn worker or instance invalidated, so it is
+    only built on top of Redis (or memory:// when there is a single process).
+    """
+    global _unavailable_logged
+    if redis_url == MEMORY_URL:
+        return InMemorySharedStore()
+    if redis_url and redis is not None:
+        return redis.Redis.from_url(redis_url)
+    if redis_url and not _unavailable_logged:
+        _unavailable_logged = True
+        current_app.logger.error(
+            "Feed cache: FEED_CACHE_REDIS_URL is set but the redis package is "
+            "not installed; the render cache is disabled."
+        )
+    return None
+
+
+def get_feed_cache(config) -> FeedRenderCache | None:
+    """
+    Returns the process-wide feed render cache, or None if it is disabled or
+    no shared store is configured (see _shared_store).
+    """
+    global _cache
+    if not config.get("FEED_CACHE_ENABLED", True):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                shared = _shared_store(config.get("FEED_CACHE_REDIS_URL") or "")
+                if shared is None:
+                    return None
+                _cache = FeedRenderCache(
+                    shared,
+                    max_entries=int(
+                        config.get("FEED_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+                    ),
+                    ttl=int(config.get("FEED_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+                )
+    return _cache
+
+
+def invalidate_feed(config, uid: str):
+    """Drops the cached render of ``uid``'s feed, if caching is enabled."""
+    cache = get_feed_cache(config)
+    if cache is not None and uid:
+        cache.invalidate(uid)
+
+
+def feed_cache_stats() -> dict:
+    """Returns hit/miss counters for the feed render cache."""
+    if _cache is None:
+        return {"active": False}
+    return {"active": True, **_cache.stats()}
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from flask import current_app
+
+USERS_COL = "users"
+FEED_ITEMS_COL = "feed_items"
+
+
+def _feed_items(uid: str):
+    db = current_app.config.get("FIRESTORE_DB")
+    if db is None:
+        raise RuntimeError(
+            "Firestore client not initialized. FIRESTORE_DB is missing in app.config."
+        )
+    return db.collection(USERS_COL).document(uid).collection(FEED_ITEMS_COL)
+
+
+def save_feed_item(uid: str, item: dict) -> dict:
+    """
+    Writes the feed projection of one finished article to
+    ``users/{uid}/feed_items/{guid}``: exactly the fields an RSS item needs
+    (see rss.item_from_article_record), plus ``created_at`` as an ISO string
+    to order and page by. Re-processing the same URL overwrites its item.
+    """
+    doc = {**item, "created_at": item["pub_date"].isoformat()}
+    _feed_items(uid).document(item["guid"]).set(doc)
+    return doc
+
+
+def delete_feed_item(uid: str, guid: str):
+    _feed_items(uid).document(guid).delete()
+
+
+def _from_doc(doc: dict) -> dict:
+    pub_date = doc.get("pub_date")
+    if isinstance(pub_date, str):
+        doc["pub_date"] = datetime.fromisoformat(pub_date)
+    return doc
+
+
+def list_feed_items(
+    uid: str,
+    limit: int = 50,
+    start_after: dict | None = None,
+    direction: str = "DESCENDING",
+    fields: list[str] | None = None,
+):
+    """
+    Lists a user's feed items ordered by ``created_at`` with one query on the
+    user's own subcollection, so no user_id filter or composite index is
+    needed. ``start_after`` and ``fields`` work as in store.list_user_articles.
+    """
+    if not uid:
+        return []
+    query = _feed_items(uid)
+    if fields:
+        query = query.select(fields)
+    query = query.order_by("created_at", direction=direction)
+    if start_after:
+        query = query.start_after(start_after)
+    return [_from_doc(q.to_dict()) for q in query.limit(limit).stream()]
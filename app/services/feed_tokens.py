@@ -0,0 +1,148 @@
+import base64
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from google.cloud import firestore
+
+from app.services.feed_items import USERS_COL
+
+# 24 bytes of HMAC-SHA256, base64url-encoded to 32 characters.
+TOKEN_BYTES = 24
+# users/{uid} field holding the user's token generation; bumping it revokes
+# that user's signed URLs without touching anyone else's.
+GENERATION_FIELD = "feed_token_generation"
+# How long a process trusts its copy of a generation. A bump made by another
+# process is picked up within this long (old URLs keep working until then).
+GENERATION_TTL_SECONDS = 60.0
+# A token that fails against a cached generation re-reads it at most this
+# often per user, so a freshly rotated URL works at once but forged tokens
+# can't force a read on every request.
+GENERATION_RECHECK_SECONDS = 5.0
+GENERATION_CACHE_MAX_ENTRIES = 10000
+
+
+def _secrets(config) -> list[str]:
+    secrets = config.get("FEED_TOKEN_SECRETS") or []
+    if isinstance(secrets, str):
+        secrets = secrets.split(",")
+    return [s.strip() for s in secrets if s and s.strip()]
+
+
+def _sign(secret: str, uid: str, generation: int) -> str:
+    # Generation 0 signs the original message, so URLs issued before
+    # generations existed stay valid until the user first rotates.
+    message = f"feed:{uid}" if not generation else f"feed:{uid}:{generation}"
+    mac = hmac.new(secret.encode("utf-8"), message.encode("utf-8"), "sha256")
+    return base64.urlsafe_b64encode(mac.digest()[:TOKEN_BYTES]).decode("ascii")
+
+
+def feed_token(config, uid: str, generation: int = 0) -> str | None:
+    """
+    Returns the token for ``uid``'s signed feed URLs at ``generation``, signed
+    with the first of FEED_TOKEN_SECRETS, or None if no secret is configured.
+    """
+    secrets = _secrets(config)
+    return _sign(secrets[0], uid, generation) if secrets and uid else None
+
+
+def verify_feed_token(config, uid: str, token: str, generation: int = 0) -> bool:
+    """
+    Checks ``token`` against every configured secret, so URLs signed with a
+    secret being rotated out keep working until it is removed from the list.
+    """
+    if not uid or not token:
+        return False
+    return any(
+        hmac.compare_digest(_sign(secret, uid, generation), token)
+        for secret in _secrets(config)
+    )
+
+
+def _user_ref(uid: str):
+    db = current_app.config.get("FIRESTORE_DB")
+    if db is None:
+        raise RuntimeError(
+            "Firestore client not initialized. FIRESTORE_DB is missing in app.config."
+        )
+    return db.collection(USERS_COL).document(uid)
+
+
+def _load_generation(uid: str) -> int:
+    snap = _user_ref(uid).get(field_paths=[GENERATION_FIELD])
+    doc = (snap.to_dict() or {}) if snap.exists else {}
+    return int(doc.get(GENERATION_FIELD) or 0)
+
+
+class GenerationCache:
+    """
+    Process-wide cache of users' token generations, so serving a signed feed
+    does not cost a Firestore read per poll. Least recently used entries are
+    dropped beyond ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        ttl: float = GENERATION_TTL_SECONDS,
+        max_entries: int = GENERATION_CACHE_MAX_ENTRIES,
+        clock=time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+    def get(self, uid: str, max_age: float | None = None) -> int:
+        """Returns ``uid``'s generation, re-read if older than ``max_age``."""
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            entry = self._entries.get(uid)
+            if entry is not None and self._clock() - entry[0] < max_age:
+                self._entries.move_to_end(uid)
+                return entry[1]
+        return self.put(uid, _load_generation(uid))
+
+    def put(self, uid: str, generation: int) -> int:
+        with self._lock:
+            self._entries[uid] = (self._clock(), generation)
+            self._entries.move_to_end(uid)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return generation
+
+
+_generations = GenerationCache()
+
+
+def user_feed_token(config, uid: str) -> str | None:
+    """The token for ``uid``'s current signed feed URLs (None without secrets)."""
+    if not _secrets(config) or not uid:
+        return None
+    return feed_token(config, uid, _generations.get(uid))
+
+
+def verify_user_feed_token(config, uid: str, token: str) -> bool:
+    """
+    Checks ``token`` against ``uid``'s current generation. On a mismatch the
+    generation is re-read (rate limited), in case another process rotated it.
+    """
+    if not _secrets(config) or not uid or not token:
+        return False
+    if verify_feed_token(config, uid, token, _generations.get(uid)):
+        return True
+    generation = _generations.get(uid, max_age=GENERATION_RECHECK_SECONDS)
+    return verify_feed_token(config, uid, token, generation)
+
+
+def rotate_feed_token(uid: str) -> int:
+    """
+    Bumps ``uid``'s token generation, so every signed URL issued before stops
+    working (in other processes within GENERATION_TTL_SECONDS). Other users'
+    URLs are unaffected. Returns the new generation.
+    """
+    ref = _user_ref(uid)
+    ref.set({GENERATION_FIELD: firestore.Increment(1)}, merge=True)
+    return _generations.put(uid, _load_generation(uid))
@@ -0,0 +1,318 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from flask import current_app
+from google.api_core import exceptions as google_exceptions
+
+from app.services import pagination, rss
+from app.services.feed_items import list_feed_items
+
+FEED_COL = "feeds"
+# The hot "latest" document stays small; older items live in archive pages.
+# It carries at least this many of the newest items, and every item after the
+# newest full archive page (see _item_limit), so none falls between the two.
+FEED_ITEM_LIMIT = 50
+ARCHIVE_PAGE_SIZE = 100
+ARCHIVE_FIELDS = ["created_at"]
+FIRST_ARCHIVE = "first"
+# Stand-in for the cursor in channel["archive_url"], filled in at render time.
+CURSOR_PLACEHOLDER = "__cursor__"
+# Bump when the rendered XML format changes so older renders are rebuilt.
+FEED_FORMAT_VERSION = 6
+VALIDATOR_FIELDS = ["format", "etag", "last_modified", "channel"]
+MAX_WRITE_ATTEMPTS = 3
+
+
+def _db():
+    db = current_app.config.get("FIRESTORE_DB")
+    if db is None:
+        raise RuntimeError(
+            "Firestore client not initialized. FIRESTORE_DB is missing in app.config."
+        )
+    return db
+
+
+def _feed_ref(uid: str):
+    return _db().collection(FEED_COL).document(uid)
+
+
+def _is_current(doc: dict | None) -> bool:
+    return bool(doc) and doc.get("format") == FEED_FORMAT_VERSION and "xml" in doc
+
+
+def feed_validators(items: list[dict], channel: dict) -> tuple[str, datetime | None]:
+    """
+    Returns the (ETag, Last-Modified) pair for a feed of ``items`` rendered
+    with ``channel`` (including its archive ``links``). The ETag is derived
+    from the item count, the newest item's timestamp and a hash of the
+    channel, so it is stable across re-renders of the same feed but changes
+    with its title, links or archive link as well as with its items.
+    """
+    newest = max((i["pub_date"] for i in items), default=None)
+    stamp = int(newest.timestamp()) if newest else 0
+    digest = hashlib.sha256(
+        json.dumps(channel, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:12]
+    return f"{FEED_FORMAT_VERSION}-{len(items)}-{stamp}-{digest}", newest
+
+
+def is_stale(doc: dict, channel: dict) -> bool:
+    """
+    True if ``doc`` (a stored feed, its validators or a cached render) was
+    rendered with a channel other than ``channel``, e.g. archive links signed
+    with a feed secret that has since been rotated out.
+    """
+    return doc.get("channel") is not None and doc["channel"] != channel
+
+
+def archive_url(channel: dict, token: str) -> str:
+    return channel["archive_url"].replace(CURSOR_PLACEHOLDER, token)
+
+
+def _archive_token(record: dict) -> str:
+    return pagination.cursor_for(record, ARCHIVE_FIELDS)
+
+
+def _scan_archive(uid: str) -> dict:
+    """
+    Finds the archive page boundaries by walking the user's history oldest
+    first, reading only ``created_at``, one page-sized query per archive page.
+
+    Page boundaries are fixed from the oldest item, so a full page never
+    changes as new items arrive. Returns the start token of the newest full
+    page (``head``, None if there is none yet), of the page being filled
+    (``next``) and how many items that page holds (``tail``).
+    """
+    head, next_token, start_after = None, FIRST_ARCHIVE, None
+    while True:
+        page = list_feed_items(
+            uid,
+            limit=ARCHIVE_PAGE_SIZE,
+            start_after=start_after,
+            direction="ASCENDING",
+            fields=ARCHIVE_FIELDS,
+        )
+        if len(page) < ARCHIVE_PAGE_SIZE:
+            return {"head": head, "next": next_token, "tail": len(page)}
+        head, next_token = next_token, _archive_token(page[-1])
+        start_after = {"created_at": page[-1]["created_at"]}
+
+
+def _advance_archive(archive: dict, item: dict) -> dict:
+    """Accounts for one new (newest) item in the page being filled."""
+    archive = {**archive, "tail": archive["tail"] + 1}
+    if archive["tail"] >= ARCHIVE_PAGE_SIZE:
+        token = pagination.encode_cursor({"created_at": item["pub_date"].isoformat()})
+        archive = {"head": archive["next"], "next": token, "tail": 0}
+    return archive
+
+
+def _item_limit(archive: dict) -> int:
+    """
+    How many of the newest items the latest document carries: FEED_ITEM_LIMIT,
+    or more while the page being filled holds more than that, since its items
+    are not in any archive page yet.
+    """
+    return max(FEED_ITEM_LIMIT, archive["tail"])
+
+
+def _render(
+    uid: str, channel: dict, items: list[dict], version: int, archive: dict
+) -> dict:
+    links = []
+    if archive.get("head"):
+        links.append(["prev-archive", archive_url(channel, archive["head"])])
+    etag, last_modified = feed_validators(items, {**channel, "links": links})
+    return {
+        "uid": uid,
+        "format": FEED_FORMAT_VERSION,
+        "version": version,
+        "etag": etag,
+        "last_modified": last_modified,
+        "channel": channel,
+        "archive": archive,
+        "items": items,
+        "xml": rss.build_feed(
+            uid, {**channel, "links": links}, items, last_build_date=last_modified
+        ),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _write(ref, snap, doc: dict):
+    """
+    Writes ``doc`` only if the feed has not changed since ``snap`` was read,
+    so a slower writer can never replace a newer render with an older one.
+    """
+    if snap.exists:
+        ref.update(doc, option=_db().write_option(last_update_time=snap.update_time))
+    else:
+        ref.create(doc)
+
+
+def get_feed(uid: str) -> dict | None:
+    """
+    Returns the materialized feed for ``uid`` (keys ``xml``, ``version``,
+    ``items``, ``channel``) with a single document read, or None if it has
+    not been built yet or was rendered by an older format version.
+    """
+    snap = _feed_ref(uid).get()
+    doc = snap.to_dict() if snap.exists else None
+    return doc if _is_current(doc) else None
+
+
+def delete_feed(uid: str):
+    """Drops the materialized feed; the next poll rebuilds it."""
+    _feed_ref(uid).delete()
+
+
+def get_feed_validators(uid: str) -> dict | None:
+    """
+    Reads only the ETag and Last-Modified of the user's materialized feed
+    (a projection, so neither items nor XML are transferred). Returns None if
+    there is no current feed.
+    """
+    snap = _feed_ref(uid).get(field_paths=VALIDATOR_FIELDS)
+    doc = snap.to_dict() if snap.exists else None
+    if not doc or doc.get("format") != FEED_FORMAT_VERSION or not doc.get("etag"):
+        return None
+    return doc
+
+
+def _merge_items(items: list[dict], fresh: list[dict], limit: int) -> list[dict]:
+    """``items`` with the latest feed items ``fresh`` folded in, newest first."""
+    by_guid = {i["guid"]: i for i in items}
+    by_guid.update({i["guid"]: i for i in fresh})
+    merged = sorted(by_guid.values(), key=lambda i: i["pub_date"], reverse=True)
+    return merged[:limit]
+
+
+def _item_keys(items: list[dict]) -> list[tuple]:
+    return [(i["guid"], i["pub_date"]) for i in items]
+
+
+def build_feed(uid: str, channel: dict, items: list[dict]) -> dict:
+    """
+    Renders the feed from ``items`` and stores it as the user's materialized
+    feed, replacing whatever was there. Returns the stored document.
+
+    After storing, the latest feed items are read again: an item saved while
+    this render ran found no current feed for add_feed_item to update, so it
+    is folded in and the feed stored again, else it would stay missing.
+
+    ``items`` are the newest FEED_ITEM_LIMIT items; if the page being filled
+    holds more, the rest of it is read here so the feed carries all of them.
+
+    ``channel["archive_url"]`` is the archive page URL with CURSOR_PLACEHOLDER
+    where the page token goes.
+    """
+    archive = _scan_archive(uid)
+    if archive["tail"] > len(items):
+        items = _merge_items(
+            items, list_feed_items(uid, limit=archive["tail"]), archive["tail"]
+        )
+    ref = _feed_ref(uid)
+    for _ in range(MAX_WRITE_ATTEMPTS):
+        items = items[: _item_limit(archive)]
+        snap = ref.get()
+        previous = snap.to_dict() if snap.exists else None
+        doc = _render(
+            uid,
+            channel,
+            items,
+            ((previous or {}).get("version") or 0) + 1,
+            archive,
+        )
+        try:
+            _write(ref, snap, doc)
+        except (google_exceptions.FailedPrecondition, google_exceptions.Conflict):
+            continue
+        limit = _item_limit(archive)
+        merged = _merge_items(items, list_feed_items(uid, limit=limit), limit)
+        if _item_keys(merged) == _item_keys(items):
+            return doc
+        items, archive = merged, _scan_archive(uid)
+    # Lost every race; serve this render, which may not be stored.
+    current_app.logger.warning(
+        "Feed: gave up storing rebuilt feed after concurrent updates.",
+        extra={"uid": uid},
+    )
+    return doc
+
+
+def add_feed_item(uid: str, item: dict) -> bool:
+    """
+    Adds or replaces one item in the user's materialized feed and re-renders
+    it from the stored items and channel, without querying feed items.
+
+    Returns False if the user has no current feed yet; it is built in full on
+    the next poll instead.
+    """
+    ref = _feed_ref(uid)
+    for _ in range(MAX_WRITE_ATTEMPTS):
+        snap = ref.get()
+        doc = snap.to_dict() if snap.exists else None
+        if not _is_current(doc):
+            return False
+        items = [i for i in doc.get("items", []) if i.get("guid") != item["guid"]]
+        archive = doc["archive"]
+        if len(items) == len(doc.get("items", [])):  # new item, not a replacement
+            archive = _advance_archive(archive, item)
+        items.append(item)
+        items.sort(key=lambda i: i["pub_date"], reverse=True)
+        new_doc = _render(
+            uid,
+            doc["channel"],
+            items[: _item_limit(archive)],
+            doc.get("version", 0) + 1,
+            archive,
+        )
+        try:
+            _write(ref, snap, new_doc)
+            return True
+        except (google_exceptions.FailedPrecondition, google_exceptions.Conflict):
+            continue
+    # Could not win the write; drop the render so the next poll rebuilds it.
+    ref.delete()
+    return False
+
+
+def get_archive_page(uid: str, token: str) -> dict | None:
+    """
+    Loads the archive page that starts after ``token`` (FIRST_ARCHIVE for the
+    oldest page). Returns None while the page is not yet full, since only
+    full pages are immutable. Otherwise returns the page's ``items`` (newest
+    first) and the token of the previous, older page (``prev``, None for
+    the first page).
+
+    Raises:
+        pagination.InvalidCursor: If ``token`` is malformed.
+    """
+    start_after = None if token == FIRST_ARCHIVE else pagination.decode_cursor(token)
+    records = list_feed_items(
+        uid, limit=ARCHIVE_PAGE_SIZE, start_after=start_after, direction="ASCENDING"
+    )
+    if len(records) < ARCHIVE_PAGE_SIZE:
+        return None
+
+    prev = None
+    if start_after is not None:
+        # The older page is the ARCHIVE_PAGE_SIZE records before this one; its
+        # token is the record just before those.
+        older = list_feed_items(
+            uid,
+            limit=ARCHIVE_PAGE_SIZE + 1,
+            start_after={"created_at": records[0]["created_at"]},
+            direction="DESCENDING",
+            fields=ARCHIVE_FIELDS,
+        )
+        if len(older) < ARCHIVE_PAGE_SIZE:
+            return None  # not a page boundary
+        prev = (
+            _archive_token(older[ARCHIVE_PAGE_SIZE])
+            if len(older) > ARCHIVE_PAGE_SIZE
+            else FIRST_ARCHIVE
+        )
+
+    return {"items": list(reversed(records)), "prev": prev}
@@ -0,0 +1,202 @@
+import os
+import re
+import threading
+import time
+
+import requests
+from firebase_admin import auth
+from google.auth import jwt
+
+ID_TOKEN_CERT_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/"
+    "securetoken@system.gserviceaccount.com"
+)
+ID_TOKEN_ISSUER_PREFIX = "https://securetoken.google.com/"
+# Refresh this long before the certs' max-age runs out.
+REFRESH_MARGIN = float(os.getenv("ID_TOKEN_CERT_REFRESH_MARGIN", "300"))
+# Backoff between failed refreshes while the current certs stay in use.
+RETRY_MIN = float(os.getenv("ID_TOKEN_CERT_RETRY_MIN", "5"))
+RETRY_MAX = float(os.getenv("ID_TOKEN_CERT_RETRY_MAX", "300"))
+FETCH_TIMEOUT = float(os.getenv("ID_TOKEN_CERT_FETCH_TIMEOUT", "10"))
+# At most one on-request refresh per interval for tokens naming an unknown kid.
+UNKNOWN_KID_REFRESH_INTERVAL = 30.0
+CLOCK_SKEW_SECONDS = 10
+DEFAULT_MAX_AGE = 3600
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _fetch_certs(url: str) -> tuple[dict, float]:
+    """Returns ``({kid: pem}, max_age_seconds)`` from the cert endpoint."""
+    resp = requests.get(url, timeout=FETCH_TIMEOUT)
+    resp.raise_for_status()
+    match = _MAX_AGE_RE.search(resp.headers.get("Cache-Control", ""))
+    return resp.json(), float(match.group(1)) if match else DEFAULT_MAX_AGE
+
+
+class CertStore:
+    """
+    Google's ID-token signing certs, held in memory and shared by all threads.
+
+    A daemon thread refreshes them ``REFRESH_MARGIN`` seconds before their
+    max-age runs out, so requests never wait for the cert endpoint except on
+    the very first verification or when a token names a key the store has
+    not seen (a rotation). If a refresh fails the current certs stay in use
+    and the refresh is retried with backoff, so verification keeps working
+    through outages of the endpoint.
+    """
+
+    def __init__(self, url: str = ID_TOKEN_CERT_URL, fetch=_fetch_certs):
+        self.url = url
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._certs: dict = {}
+        self._expires_at = 0.0
+        self._fetched_at = None
+        self._kid_refresh_at = 0.0
+        self._retry_delay = RETRY_MIN
+        self._thread = None
+        self._counters = {"refreshes": 0, "refresh_errors": 0, "unknown_kid": 0}
+        self._last_error = None
+
+    def refresh(self) -> bool:
+        """Fetches the certs now. Returns False (keeping the old ones) on error."""
+        with self._refresh_lock:
+            try:
+                certs, max_age = self._fetch(self.url)
+            except Exception as e:
+                with self._lock:
+                    self._counters["refresh_errors"] += 1
+                    self._last_error = f"{e.__class__.__name__}: {e}"
+                return False
+            with self._lock:
+                self._certs = certs
+                self._fetched_at = time.time()
+                self._expires_at = self._fetched_at + max_age
+                self._retry_delay = RETRY_MIN
+                self._counters["refreshes"] += 1
+            return True
+
+    def _next_delay(self, ok: bool) -> float:
+        with self._lock:
+            if not ok:
+                delay = self._retry_delay
+                self._retry_delay = min(self._retry_delay * 2, RETRY_MAX)
+                return delay
+            return max(self._expires_at - REFRESH_MARGIN - time.time(), RETRY_MIN)
+
+    def _run(self):
+        ok = True
+        while True:
+            self._wake.wait(self._next_delay(ok))
+            self._wake.clear()
+            ok = self.refresh()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="storyspool-id-token-certs", daemon=True
+            )
+            self._thread.start()
+
+    def certs(self, kid: str | None = None) -> dict:
+        """
+        Returns the current certs, fetching them on the request thread only if
+        none were ever loaded or ``kid`` is unknown (the latter at most once
+        per ``UNKNOWN_KID_REFRESH_INTERVAL``, so forged kids can't force
+        fetches).
+        """
+        with self._lock:
+            certs = self._certs
+            unknown = bool(certs) and bool(kid) and kid not in certs
+            if unknown:
+                self._counters["unknown_kid"] += 1
+                now = time.monotonic()
+                if now - self._kid_refresh_at < UNKNOWN_KID_REFRESH_INTERVAL:
+                    return certs
+                self._kid_refresh_at = now
+        if not certs or unknown:
+            self.refresh()
+            with self._lock:
+                certs = self._certs
+        return certs
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.time()
+            return {
+                **self._counters,
+                "keys": len(self._certs),
+                "age_seconds": (now - self._fetched_at) if self._fetched_at else None,
+                "expires_in_seconds": (
+                    self._expires_at - now if self._fetched_at else None
+                ),
+                "last_error": self._last_error,
+            }
+
+
+class _CertStoreHolder:
+    """Process-wide CertStore; rebuilt after a fork, which the thread doesn't survive."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._store = None
+
+    def get(self) -> CertStore:
+        with self._lock:
+            if self._store is None or self._pid != os.getpid():
+                self._store, self._pid = CertStore(), os.getpid()
+                self._store.start()
+            return self._store
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self._store is None or self._pid != os.getpid():
+                return {"active": False}
+            return {"active": True, **self._store.stats()}
+
+
+_holder = _CertStoreHolder()
+
+
+def id_token_cert_stats() -> dict:
+    return _holder.stats()
+
+
+def verify_id_token(id_token: str, project_id: str | None) -> dict:
+    """
+    Verifies a Firebase ID token against the local cert store: signature,
+    expiry, audience, issuer and subject, as firebase_admin does, but with no
+    network call on the request path. Adds ``uid`` like auth.verify_id_token.
+
+    Falls back to auth.verify_id_token when no project id is configured or
+    the Auth emulator is in use (emulator tokens are unsigned).
+
+    Raises:
+        ValueError: If the token is invalid or expired.
+    """
+    if not project_id or os.getenv("FIREBASE_AUTH_EMULATOR_HOST"):
+        return auth.verify_id_token(id_token)
+
+    header = jwt.decode_header(id_token)
+    if header.get("alg") != "RS256" or not header.get("kid"):
+        raise ValueError("ID token must be RS256-signed with a kid header.")
+    certs = _holder.get().certs(header["kid"])
+    claims = jwt.decode(
+        id_token,
+        certs=certs,
+        audience=project_id,
+        clock_skew_in_seconds=CLOCK_SKEW_SECONDS,
+    )
+    if claims.get("iss") != ID_TOKEN_ISSUER_PREFIX + project_id:
+        raise ValueError(f"ID token has incorrect issuer {claims.get('iss')!r}.")
+    subject = claims.get("sub")
+    if not isinstance(subject, str) or not subject or len(subject) > 128:
+        raise ValueError("ID token has an invalid subject.")
+    claims["uid"] = subject
+    return claims
@@ -1,9 +1,25 @@
-from datetime import datetime, timezone
+import threading
+from datetime import datetime, timedelta, timezone
 from hashlib import sha256
 
 from flask import current_app  # New import
+from google.api_core import exceptions as google_exceptions
+
+from .feed_cache import invalidate_feed
+from .feed_items import delete_feed_item
+from .feeds import delete_feed
 
 JOB_COL = "jobs"
+# Fields the article list view renders; listings project to these.
+JOB_LIST_FIELDS = [
+    "id",
+    "url",
+    "title",
+    "status",
+    "audio_url",
+    "last_error",
+    "created_at",
+]
 
 
 class JobStatus:
@@ -17,6 +33,30 @@ class JobStatus:
     FAILED_PARSE = "failed_parse"
     FAILED_TTS = "failed_tts"
     FAILED_UPLOAD = "failed_upload"
+    # The worker pool was full; nothing ran, the user can retry.
+    FAILED_QUEUE = "failed_queue"
+
+
+TERMINAL_STATUSES = {
+    JobStatus.DONE,
+    JobStatus.FAILED_FETCH,
+    JobStatus.FAILED_PARSE,
+    JobStatus.FAILED_TTS,
+    JobStatus.FAILED_UPLOAD,
+    JobStatus.FAILED_QUEUE,
+}
+# How long a worker's claim on a job holds before another worker may take over.
+DEFAULT_LEASE_SECONDS = 900
+MAX_CLAIM_ATTEMPTS = 3
+# Intermediate states shorter than this are never written (see JobStateAccumulator).
+DEFAULT_STATE_DEBOUNCE_SECONDS = 2.0
+
+
+class ClaimOutcome:
+    CLAIMED = "claimed"
+    NOT_FOUND = "not_found"
+    DONE = "done"
+    IN_FLIGHT = "in_flight"
 
 
 def url_hash(url: str) -> str:
@@ -27,20 +67,27 @@ def now_iso():
     return datetime.now(timezone.utc).isoformat()
 
 
-def _jobs():
+def _db():
     db = current_app.config.get("FIRESTORE_DB")
     if db is None:
         raise RuntimeError(
             "Firestore client not initialized. FIRESTORE_DB is missing in app.config."
         )
-    return db.collection(JOB_COL)
+    return db
+
+
+def _jobs():
+    return _db().collection(JOB_COL)
 
 
 def create_job(url: str, uid: str) -> dict:
+    """
+    Creates the job for ``url``, or returns the existing one. The document
+    is written with ``create``, which fails if it exists, so concurrent
+    submissions of one URL cannot both create it; see job_needs_worker for
+    whether the returned job should be enqueued.
+    """
     h = url_hash(url)
-    snap = _jobs().document(h).get()
-    if snap.exists:
-        return snap.to_dict()
     doc = {
         "id": h,
         "url": url,
@@ -53,8 +100,13 @@ def create_job(url: str, uid: str) -> dict:
         "audio_url": None,
         "title": None,
     }
-    _jobs().document(h).set(doc)
-    return doc
+    ref = _jobs().document(h)
+    try:
+        ref.create(doc)
+        return doc
+    except google_exceptions.Conflict:
+        snap = ref.get()
+        return snap.to_dict() if snap.exists else doc
 
 
 def get_job(job_id: str) -> dict | None:
@@ -62,21 +114,195 @@ def get_job(job_id: str) -> dict | None:
     return s.to_dict() if s.exists else None
 
 
-def list_user_jobs(uid: str):
+def list_user_jobs(
+    uid: str,
+    limit: int = 50,
+    start_after: dict | None = None,
+    fields: list[str] | None = None,
+):
+    """
+    Lists a user's jobs, newest first. ``start_after`` holds the
+    ``created_at`` of the last job on the previous page; ``fields`` limits
+    the query to a projection of those fields.
+    """
     if not uid:
         return []
-    qs = (
-        _jobs()
-        .where("user_id", "==", uid)
-        .order_by("created_at", direction="DESCENDING")
-        .limit(50)
-        .stream()
+    query = _jobs().where("user_id", "==", uid)
+    if fields:
+        query = query.select(fields)
+    query = query.order_by("created_at", direction="DESCENDING")
+    if start_after:
+        query = query.start_after(start_after)
+    return [q.to_dict() for q in query.limit(limit).stream()]
+
+
+def _owner(job_id: str, user_id: str | None) -> str | None:
+    if user_id:
+        return user_id
+    job = get_job(job_id)
+    return job.get("user_id") if job else None
+
+
+def _lease_held(job: dict, worker_id: str | None, now: str) -> bool:
+    """True if a worker other than ``worker_id`` holds an unexpired lease."""
+    lease = job.get("lease") or {}
+    return (
+        lease.get("owner") not in (None, worker_id)
+        and (lease.get("expires_at") or "") > now
     )
-    return [q.to_dict() for q in qs]
+
+
+def job_needs_worker(job: dict) -> bool:
+    """
+    True unless the job is done or a worker holds a live lease on it, so a
+    resubmitted URL doesn't take a worker slot only to be turned away by
+    claim_job.
+    """
+    return job.get("status") != JobStatus.DONE and not _lease_held(job, None, now_iso())
+
+
+def claim_job(
+    job_id: str, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS
+) -> tuple[str, dict | None]:
+    """
+    Takes a lease on the job for ``worker_id`` unless it is done or another
+    worker holds an unexpired lease. The lease is written with a
+    last_update_time precondition, so of two workers reading the same
+    snapshot only one can win; the loser re-reads and sees the job in flight.
+
+    Returns:
+        tuple: ``(ClaimOutcome, job)``; ``job`` is None if it doesn't exist.
+    """
+    ref = _jobs().document(job_id)
+    job = None
+    for _ in range(MAX_CLAIM_ATTEMPTS):
+        snap = ref.get()
+        if not snap.exists:
+            return ClaimOutcome.NOT_FOUND, None
+        job = snap.to_dict()
+        if job.get("status") == JobStatus.DONE:
+            return ClaimOutcome.DONE, job
+        now = datetime.now(timezone.utc)
+        if _lease_held(job, worker_id, now.isoformat()):
+            return ClaimOutcome.IN_FLIGHT, job
+        lease = {
+            "owner": worker_id,
+            "expires_at": (now + timedelta(seconds=lease_seconds)).isoformat(),
+        }
+        try:
+            ref.update(
+                {"lease": lease, "updated_at": now.isoformat()},
+                option=_db().write_option(last_update_time=snap.update_time),
+            )
+        except (google_exceptions.FailedPrecondition, google_exceptions.Conflict):
+            continue  # another worker wrote first; look again
+        return ClaimOutcome.CLAIMED, {**job, "lease": lease}
+    return ClaimOutcome.IN_FLIGHT, job
 
 
 def update_job(job_id: str, **fields):
+    """
+    Merges ``fields`` into the job. A transition to DONE invalidates the
+    owner's cached feed render; pass ``user_id`` to spare the extra read.
+    """
     fields["updated_at"] = now_iso()
     if "metrics" in fields:
         fields["metrics"] = fields["metrics"]  # Ensure metrics are stored
     _jobs().document(job_id).set(fields, merge=True)
+    if fields.get("status") == JobStatus.DONE:
+        invalidate_feed(current_app.config, _owner(job_id, fields.get("user_id")))
+
+
+def delete_job(job_id: str, user_id: str | None = None):
+    """
+    Deletes the job and its feed item, drops the owner's materialized feed
+    (rebuilt on the next poll) and invalidates its cached render.
+    """
+    uid = _owner(job_id, user_id)
+    _jobs().document(job_id).delete()
+    if uid:
+        delete_feed_item(uid, job_id)
+        delete_feed(uid)
+        invalidate_feed(current_app.config, uid)
+
+
+class JobStateAccumulator:
+    """
+    Coalesces a running job's status transitions into as few writes as
+    possible.
+
+    ``transition`` merges its fields into one pending update. Terminal states
+    are written at once, together with everything pending. An intermediate
+    state is written only once it has lasted ``debounce_seconds`` without
+    being superseded, by a timer running in ``app``'s context, so fast
+    stages never reach Firestore while slow ones (TTS) still show up in the
+    UI. Writes go through ``write`` (update_job), one merge per flush.
+    """
+
+    def __init__(
+        self,
+        app,
+        job_id: str,
+        status: str = JobStatus.QUEUED,
+        debounce_seconds: float = DEFAULT_STATE_DEBOUNCE_SECONDS,
+        write=None,
+    ):
+        self.app = app
+        self.job_id = job_id
+        self.status = status
+        self.debounce_seconds = debounce_seconds
+        self.writes = 0
+        self._write = write or update_job
+        self._pending: dict = {}
+        self._timer: threading.Timer | None = None
+        # Held across writes so a timer flush can't land after a later one.
+        self._lock = threading.Lock()
+
+    def transition(self, status: str, **fields):
+        """Records ``status`` (a JobStatus) and ``fields``; see the class docs."""
+        with self._lock:
+            self._pending.update(fields, status=status)
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if status in TERMINAL_STATUSES or self.debounce_seconds <= 0:
+                self._flush_locked()
+                # Only once written, so a failed write maps to the stage it hit.
+                self.status = status
+                return
+            self.status = status
+            timer = threading.Timer(self.debounce_seconds, self._flush_later)
+            timer.daemon = True
+            self._timer = timer
+            timer.start()
+
+    def _flush_later(self):
+        with self._lock:
+            if self._timer is not threading.current_thread():
+                return  # superseded by a later transition
+            self._timer = None
+            with self.app.app_context():
+                try:
+                    self._flush_locked()
+                except Exception:
+                    # Only progress display is lost; the terminal write follows.
+                    self.app.logger.warning(
+                        "Jobs: intermediate status write failed",
+                        exc_info=True,
+                        extra={"job_id": self.job_id},
+                    )
+
+    def flush(self):
+        """Writes whatever is pending now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        fields, self._pending = self._pending, {}
+        self._write(self.job_id, **fields)
+        self.writes += 1
@@ -0,0 +1,59 @@
+import base64
+import json
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination token cannot be decoded."""
+
+
+def encode_cursor(values: dict) -> str:
+    """
+    Packs the order-by field values of the last document on a page into an
+    opaque, URL-safe token for ``Query.start_after``.
+    """
+    raw = json.dumps(values, sort_keys=True, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> dict:
+    """
+    Inverse of encode_cursor.
+
+    Raises:
+        InvalidCursor: If the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"invalid cursor: {token!r}") from e
+    if not isinstance(values, dict):
+        raise InvalidCursor(f"invalid cursor: {token!r}")
+    return values
+
+
+def cursor_for(doc: dict, fields) -> str:
+    """Returns the token that continues a query after ``doc``."""
+    return encode_cursor({f: doc.get(f) for f in fields})
+
+
+def paginate(fetch, limit: int, cursor: str | None, cursor_fields) -> dict:
+    """
+    Fetches one page through ``fetch(limit=..., start_after=...)``.
+
+    One extra document is requested to learn whether another page exists, so
+    ``next_cursor`` is None on the last page.
+
+    Returns:
+        dict: ``{"items": [...], "next_cursor": str | None}``
+
+    Raises:
+        InvalidCursor: If ``cursor`` is malformed.
+    """
+    start_after = decode_cursor(cursor) if cursor else None
+    docs = fetch(limit=limit + 1, start_after=start_after)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = cursor_for(docs[-1], cursor_fields)
+    return {"items": docs, "next_cursor": next_cursor}
@@ -1,9 +1,117 @@
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import current_app
 
 from app.worker import run_job
 
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PENDING = 32
+DEFAULT_RETRY_AFTER_SECONDS = 30
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the worker pool cannot accept another job."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("worker queue is full")
+        self.retry_after = retry_after
+
+
+class BoundedJobExecutor:
+    """
+    A fixed-size thread pool with a bounded backlog.
+
+    At most ``max_workers`` jobs run at once and at most ``max_pending`` more
+    wait for a free worker; anything beyond that is rejected immediately so the
+    caller can shed load instead of piling work onto the instance.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="storyspool-worker"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def try_submit(self, fn, *args) -> bool:
+        """Schedules ``fn(*args)``; returns False if the backlog is full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            return False
+        with self._lock:
+            self._pending += 1
+        try:
+            self._executor.submit(self._run, time.monotonic(), fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+            raise
+        return True
+
+    def _run(self, enqueued_at: float, fn, *args):
+        waited = time.monotonic() - enqueued_at
+        with self._lock:
+            self._pending -= 1
+            self._active += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "active": self._active,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_avg_seconds": (self._wait_total / started) if started else 0.0,
+                "wait_max_seconds": self._wait_max,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+_executor: BoundedJobExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(app) -> BoundedJobExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BoundedJobExecutor(
+                    max_workers=int(
+                        app.config.get("WORKER_MAX_WORKERS", DEFAULT_MAX_WORKERS)
+                    ),
+                    max_pending=int(
+                        app.config.get("WORKER_MAX_PENDING", DEFAULT_MAX_PENDING)
+                    ),
+                )
+    return _executor
+
 
 def _run_job_with_context(app, job_id):
     with app.app_context():
@@ -11,7 +119,26 @@ def _run_job_with_context(app, job_id):
 
 
 def enqueue_worker(job_id: str):
+    """
+    Hands a job to the process-wide worker pool.
+
+    Raises:
+        QueueFullError: If every worker is busy and the backlog is full.
+    """
     app = current_app._get_current_object()
-    thread = threading.Thread(target=_run_job_with_context, args=(app, job_id))
-    thread.daemon = True
-    thread.start()
+    if not _get_executor(app).try_submit(_run_job_with_context, app, job_id):
+        retry_after = int(
+            app.config.get("WORKER_RETRY_AFTER_SECONDS", DEFAULT_RETRY_AFTER_SECONDS)
+        )
+        app.logger.warning(
+            "Worker queue full; rejecting job.",
+            extra={"job_id": job_id, "retry_after": retry_after},
+        )
+        raise QueueFullError(retry_after)
+
+
+def queue_stats() -> dict:
+    """Returns queue depth, active workers and wait times for the pool."""
+    if _executor is None:
+        return {"pending": 0, "active": 0, "completed": 0, "rejected": 0}
+    return _executor.stats()
@@ -1,14 +1,24 @@
+import functools
+import os
 from datetime import datetime, timezone
 from email.utils import formatdate
 from xml.etree import ElementTree as ET
 
-from flask import current_app
-
-from app.services.jobs import list_user_jobs
-from app.services.store import list_user_articles  # New import
+from app.services.feed_items import list_feed_items
 
 ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
 ATOM_NS = "http://www.w3.org/2005/Atom"
+# RFC 5005 feed paging and archiving
+FH_NS = "http://purl.org/syndication/history/1.0"
+ITEM_CACHE_SIZE = int(os.getenv("RSS_ITEM_CACHE_SIZE", "4096"))
+
+ET.register_namespace("itunes", ITUNES_NS)
+ET.register_namespace("atom", ATOM_NS)
+ET.register_namespace("fh", FH_NS)
+
+_XML_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>\n"
+_FEED_CLOSE = "</channel></rss>"
+_ITEM_NS_DECL = f'<item xmlns:itunes="{ITUNES_NS}">'
 
 
 def _rfc822(dt: datetime) -> str:
@@ -42,11 +52,26 @@ def item_from_article(meta: dict) -> ET.Element:
     return item
 
 
-def build_feed(user_id: str, channel_info: dict, items_meta: list[dict]) -> str:
-    """Builds the complete RSS XML string for a user's podcast feed."""
-    ET.register_namespace("itunes", ITUNES_NS)
-    ET.register_namespace("atom", ATOM_NS)
-
+def item_from_article_record(record: dict) -> dict:
+    """Builds feed item metadata from a record written by save_article_record."""
+    created_at = record.get("created_at")
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return {
+        "guid": record["id"],
+        "title": record.get("title") or "Untitled Article",
+        "summary": record.get("summary") or "",
+        "pub_date": created_at or datetime.now(timezone.utc),
+        "source_url": record.get("url") or "",
+        "enclosure_url": record.get("audio_url") or "",
+        "enclosure_length": record.get("audio_size_bytes", 0),
+        "duration": record.get("audio_duration_seconds", 0),
+        "author": record.get("author") or "StorySpool",
+    }
+
+
+def _channel_element(channel_info: dict, last_build_date: datetime) -> ET.Element:
+    """Builds the <rss><channel> skeleton with every channel tag but no items."""
     rss = ET.Element("rss", version="2.0")
     channel = ET.SubElement(rss, "channel")
 
@@ -54,12 +79,20 @@ def build_feed(user_id: str, channel_info: dict, items_meta: list[dict]) -> str:
     ET.SubElement(channel, "link").text = channel_info["link"]
     ET.SubElement(channel, "description").text = channel_info.get("description", "")
     ET.SubElement(channel, "language").text = channel_info.get("language", "en-us")
-    ET.SubElement(channel, "lastBuildDate").text = _rfc822(datetime.now(timezone.utc))
+    ET.SubElement(channel, "lastBuildDate").text = _rfc822(last_build_date)
 
     atom_link = ET.SubElement(channel, "{" + ATOM_NS + "}link")
     atom_link.set("href", channel_info["link"])
     atom_link.set("rel", "self")
     atom_link.set("type", "application/rss+xml")
+    # RFC 5005: archive pages are marked as such and link to their neighbours
+    if channel_info.get("archived"):
+        ET.SubElement(channel, "{" + FH_NS + "}archive")
+    for rel, href in channel_info.get("links", []):
+        link = ET.SubElement(channel, "{" + ATOM_NS + "}link")
+        link.set("href", href)
+        link.set("rel", rel)
+        link.set("type", "application/rss+xml")
 
     ET.SubElement(channel, "{" + ITUNES_NS + "}author").text = channel_info.get(
         "author", "StorySpool"
@@ -76,64 +109,71 @@ def build_feed(user_id: str, channel_info: dict, items_meta: list[dict]) -> str:
     if "image_url" in channel_info:
         image = ET.SubElement(channel, "{" + ITUNES_NS + "}image")
         image.set("href", channel_info["image_url"])
-
+    return rss
+
+
+@functools.lru_cache(maxsize=ITEM_CACHE_SIZE)
+def _cached_item_fragment(frozen_meta: tuple) -> str:
+    xml = ET.tostring(item_from_article(dict(frozen_meta)), encoding="unicode")
+    # Standalone serialization declares the itunes namespace on <item>; in the
+    # feed it is declared once on <rss>.
+    return xml.replace(_ITEM_NS_DECL, "<item>", 1)
+
+
+def item_fragment(meta: dict) -> str:
+    """
+    Returns the serialized <item> for ``meta`` exactly as it appears inside a
+    feed. Fragments are cached by content, so re-rendering a feed only
+    serializes items that are new or changed.
+    """
+    try:
+        return _cached_item_fragment(tuple(sorted(meta.items())))
+    except TypeError:  # unhashable values; serialize without caching
+        return _cached_item_fragment.__wrapped__(tuple(sorted(meta.items())))
+
+
+def iter_feed(
+    user_id: str,
+    channel_info: dict,
+    items_meta,
+    last_build_date: datetime | None = None,
+):
+    """
+    Yields the RSS XML for a user's podcast feed in pieces: the declaration
+    and channel header, then one chunk per <item>, then the closing tags.
+
+    Joined, the chunks are byte-for-byte what serializing the whole tree with
+    ElementTree produces. ``lastBuildDate`` defaults to the newest item's
+    pubDate so that rendering the same items twice yields identical XML.
+    """
+    items_meta = list(items_meta)
+    if last_build_date is None:
+        last_build_date = max(
+            (meta["pub_date"] for meta in items_meta),
+            default=datetime.now(timezone.utc),
+        )
+    skeleton = ET.tostring(
+        _channel_element(channel_info, last_build_date), encoding="unicode"
+    )
+    yield _XML_DECLARATION + skeleton[: -len(_FEED_CLOSE)]
     for meta in items_meta:
-        channel.append(item_from_article(meta))
-
-    return ET.tostring(rss, encoding="utf-8", xml_declaration=True).decode("utf-8")
+        yield item_fragment(meta)
+    yield _FEED_CLOSE
 
 
-def get_latest_items_for_user(user_id: str, limit: int = 100) -> list[dict]:
-    """Fetches latest processed articles and directly submitted articles for a user."""
-    all_items = []
-
-    # Fetch articles from jobs (processed articles)
-    jobs = list_user_jobs(user_id, limit=limit, status="COMPLETED")
-    for job in jobs:
-        if not job.get("storage_path"):
-            continue
-        public_audio_url = f"https://storage.googleapis.com/{current_app.config['GCS_BUCKET_NAME']}/{job['storage_path']}"
-        all_items.append(
-            {
-                "guid": job["job_id"],
-                "title": job.get("article_title", "Untitled Article"),
-                "summary": job.get("article_summary", ""),
-                "pub_date": job.get("created_at", datetime.now(timezone.utc)),
-                "source_url": job.get("article_url", ""),
-                "enclosure_url": public_audio_url,
-                "enclosure_length": job.get("audio_size_bytes", 0),
-                "duration": job.get("audio_duration_seconds", 0),
-                "author": job.get("article_author", "StorySpool"),
-                "type": "job",  # Add type for debugging/distinction
-            }
-        )
+def build_feed(
+    user_id: str,
+    channel_info: dict,
+    items_meta: list[dict],
+    last_build_date: datetime | None = None,
+) -> str:
+    """Builds the complete RSS XML string for a user's podcast feed."""
+    return "".join(iter_feed(user_id, channel_info, items_meta, last_build_date))
 
-    # Fetch articles submitted directly (not yet processed into audio)
-    submitted_articles = list_user_articles(user_id)
-    for article in submitted_articles:
-        # For directly submitted articles, there's no audio yet.
-        # We'll use a placeholder or indicate it's not available.
-        # The guid should be unique, using the urlhash from Firestore.
-        all_items.append(
-            {
-                "guid": article["id"],  # Using the urlhash as guid
-                "title": article.get("title", "Untitled Submitted Article"),
-                "summary": article.get("summary", ""),
-                "pub_date": (
-                    datetime.fromisoformat(article["created_at"])
-                    if "created_at" in article
-                    else datetime.now(timezone.utc)
-                ),
-                "source_url": article.get("url", ""),
-                "enclosure_url": article.get(
-                    "audio_url", ""
-                ),  # Will be empty initially
-                "enclosure_length": 0,  # No audio yet
-                "duration": 0,  # No audio yet
-                "author": article.get("author", "StorySpool"),
-                "type": "submitted",  # Add type for debugging/distinction
-            }
-        )
 
-    # Sort all items by publication date (newest first)
-    return sorted(all_items, key=lambda x: x["pub_date"], reverse=True)[:limit]
+def get_latest_items_for_user(user_id: str, limit: int = 100) -> list[dict]:
+    """
+    Returns the user's ``limit`` newest feed items, newest first, with one
+    ordered query on the ``feed_items`` projection the worker writes.
+    """
+    return list_feed_items(user_id, limit=limit)
@@ -1,3 +1,4 @@
+import contextlib
 import pathlib
 import uuid
 from datetime import datetime, timezone
@@ -6,6 +7,20 @@ from flask import current_app
 
 from ..extensions import gcs  # Keep gcs import
 
+# Fields returned by article listings unless the caller asks for fewer.
+ARTICLE_LIST_FIELDS = [
+    "id",
+    "title",
+    "url",
+    "site",
+    "summary",
+    "author",
+    "image",
+    "published",
+    "created_at",
+    "audio_url",
+]
+
 
 def _articles_col():
     db = current_app.config.get("FIRESTORE_DB")
@@ -17,7 +32,13 @@ def _articles_col():
 
 
 def save_article_record(
-    meta: dict, local_audio_path: str, gcs_url: str, urlhash: str, uid: str
+    meta: dict,
+    local_audio_path: str,
+    gcs_url: str,
+    urlhash: str,
+    uid: str,
+    audio_size_bytes: int = 0,
+    audio_duration_seconds: int = 0,
 ):
     doc = {
         "id": urlhash,
@@ -32,30 +53,88 @@ def save_article_record(
         "published": meta.get("published"),
         "created_at": datetime.now(timezone.utc).isoformat(),
         "audio_url": gcs_url,
+        "audio_size_bytes": audio_size_bytes,
+        "audio_duration_seconds": audio_duration_seconds,
     }
     _articles_col().document(urlhash).set(doc, merge=True)
     return doc
 
 
-def list_user_articles(uid: str):
+def list_user_articles(
+    uid: str,
+    limit: int = 50,
+    start_after: dict | None = None,
+    fields: list[str] | None = None,
+):
+    """
+    Lists a user's article records, newest first.
+
+    ``start_after`` holds the ``created_at`` of the last record on the previous
+    page (see pagination.decode_cursor); ``fields`` limits the query to a
+    projection of those fields.
+    """
     if not uid:
         return []
-    qs = (
-        _articles_col()
-        .where("user_id", "==", uid)
-        .order_by("created_at", direction="DESCENDING")
-        .limit(50)
-        .stream()
-    )
-    return [q.to_dict() for q in qs]
+    query = _articles_col().where("user_id", "==", uid)
+    if fields:
+        query = query.select(fields)
+    query = query.order_by("created_at", direction="DESCENDING")
+    if start_after:
+        query = query.start_after(start_after)
+    return [q.to_dict() for q in query.limit(limit).stream()]
 
 
-def upload_audio_and_get_url(local_path: pathlib.Path, filename: str) -> str:
+DEFAULT_UPLOAD_CHUNK_SIZE = 1024 * 1024  # must be a multiple of 256 KiB
+
+
+def _audio_blob(filename: str):
     bucket = gcs.bucket(current_app.config["GCS_BUCKET"])
     key = (
         f"audio/{uuid.uuid4().hex}/" f"{datetime.now().strftime('%Y%m%d')}/{filename}"
     )  # Use filename directly
-    blob = bucket.blob(key)
+    return bucket.blob(key)
+
+
+class AudioUpload:
+    """Write-only file object that streams audio into a resumable GCS upload."""
+
+    def __init__(self, blob, chunk_size: int):
+        self.blob = blob
+        self.bytes_written = 0
+        self.public_url = None
+        self._writer = blob.open(
+            "wb", chunk_size=chunk_size, ignore_flush=True, content_type="audio/mpeg"
+        )
+
+    def write(self, data: bytes) -> int:
+        self._writer.write(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def _finalize(self):
+        self._writer.close()
+        self.blob.make_public()
+        self.public_url = self.blob.public_url
+
+
+@contextlib.contextmanager
+def open_audio_upload(filename: str):
+    """
+    Opens a streaming upload for a new audio object. Data is sent in
+    ``GCS_UPLOAD_CHUNK_SIZE`` pieces while the caller is still writing.
+    The object is only finalized (and made public) if the block succeeds;
+    on error the resumable session is abandoned and nothing is published.
+    """
+    chunk_size = int(
+        current_app.config.get("GCS_UPLOAD_CHUNK_SIZE", DEFAULT_UPLOAD_CHUNK_SIZE)
+    )
+    upload = AudioUpload(_audio_blob(filename), chunk_size)
+    yield upload
+    upload._finalize()
+
+
+def upload_audio_and_get_url(local_path: pathlib.Path, filename: str) -> str:
+    blob = _audio_blob(filename)
     blob.upload_from_filename(str(local_path))
     blob.make_public()
     return blob.public_url
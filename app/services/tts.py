@@ -1,8 +1,14 @@
 import io
+import os
 import pathlib
 import re
+import shutil
 import tempfile
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 from flask import current_app
 from google.api_core import exceptions as google_exceptions
@@ -15,12 +21,133 @@ from tenacity import (
     wait_exponential,
 )
 
-from .store import upload_audio_and_get_url
+from .store import open_audio_upload, upload_audio_and_get_url
+from .tts_cache import chunk_cache_key, get_chunk_cache
 
 # from pydub.playback import play # Added for local testing if needed
 
 
 MAX_CHARS = 4500
+DEFAULT_TTS_MAX_CONCURRENCY = 4
+DEFAULT_TTS_CONCAT_MODE = "frames"  # "frames" or "pydub"
+
+# MPEG audio frame header lookup tables, indexed by the header bit fields.
+# Bitrates are in kbps; index 0 is "free format" and 15 is invalid.
+_MPEG_VERSIONS = {0b00: 2.5, 0b10: 2, 0b11: 1}
+_MPEG_LAYERS = {0b01: 3, 0b10: 2, 0b11: 1}
+_MPEG_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MPEG_SAMPLE_RATES = {
+    1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    2.5: (11025, 12000, 8000),
+}
+
+
+@dataclass(frozen=True)
+class SynthesisResult:
+    """The uploaded audio and the enclosure facts a feed item needs."""
+
+    audio_url: str
+    size_bytes: int = 0
+    duration_seconds: float = 0.0
+
+
+def _parse_mp3_frame_header(data: bytes, pos: int):
+    """
+    Parses the 4-byte MPEG audio frame header at ``pos``.
+    Returns (frame_length, samples_per_frame, sample_rate, side_info_offset),
+    or None if the bytes at ``pos`` are not a valid frame header.
+    """
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+    version = _MPEG_VERSIONS.get((data[pos + 1] >> 3) & 0b11)
+    layer = _MPEG_LAYERS.get((data[pos + 1] >> 1) & 0b11)
+    bitrate_idx = data[pos + 2] >> 4
+    rate_idx = (data[pos + 2] >> 2) & 0b11
+    if version is None or layer is None or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+    padding = (data[pos + 2] >> 1) & 0b1
+    mono = (data[pos + 3] >> 6) == 0b11
+    has_crc = not (data[pos + 1] & 0b1)
+
+    bitrate = _MPEG_BITRATES[(1 if version == 1 else 2, layer)][bitrate_idx] * 1000
+    sample_rate = _MPEG_SAMPLE_RATES[version][rate_idx]
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or version == 1) else 576
+        frame_length = (samples // 8) * bitrate // sample_rate + padding
+
+    if version == 1:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    side_info_offset = 4 + (2 if has_crc else 0) + side_info
+    return frame_length, samples, sample_rate, side_info_offset
+
+
+def _skip_id3v2(data: bytes, pos: int) -> int:
+    """Skips any ID3v2 tags starting at ``pos`` and returns the new position."""
+    while data[pos : pos + 3] == b"ID3" and pos + 10 <= len(data):
+        size = 0
+        for b in data[pos + 6 : pos + 10]:
+            size = (size << 7) | (b & 0x7F)  # syncsafe integer
+        footer = 10 if data[pos + 5] & 0x10 else 0
+        pos += 10 + size + footer
+    return pos
+
+
+def _iter_mp3_frames(data: bytes):
+    """
+    Yields (frame_bytes, samples, sample_rate) for each audio frame in an MP3
+    byte string. ID3v2/ID3v1 tags and Xing/Info/VBRI header frames are skipped,
+    since they describe a single file and would be wrong after concatenation.
+    """
+    end = len(data)
+    if end >= 128 and data[end - 128 : end - 125] == b"TAG":
+        end -= 128  # ID3v1 trailer
+    pos = _skip_id3v2(data, 0)
+    first = True
+    while pos + 4 <= end:
+        header = _parse_mp3_frame_header(data, pos)
+        if header is None:
+            pos += 1  # resync on the next frame boundary
+            continue
+        frame_length, samples, sample_rate, side_info_offset = header
+        if pos + frame_length > end:
+            break  # truncated trailing frame
+        frame = data[pos : pos + frame_length]
+        pos += frame_length
+        if first:
+            first = False
+            tag = frame[side_info_offset : side_info_offset + 4]
+            if tag in (b"Xing", b"Info") or frame[36:40] == b"VBRI":
+                continue
+        yield frame, samples, sample_rate
+
+
+def concat_mp3_frames(chunks, out) -> float:
+    """
+    Concatenates MP3 byte strings at the frame level, writing audio frames
+    straight to the binary file object ``out`` without decoding.
+
+    Returns:
+        float: The total duration in seconds, computed from frame sample counts.
+    """
+    duration = 0.0
+    for chunk in chunks:
+        for frame, samples, sample_rate in _iter_mp3_frames(chunk):
+            out.write(frame)
+            duration += samples / sample_rate
+    return duration
 
 
 def _normalize_text_for_ssml(text: str) -> str:
@@ -62,29 +189,140 @@ def build_ssml(text: str):
     return "".join(ssml_parts)
 
 
+class _TTSClientHolder:
+    """
+    Holds one TextToSpeechClient per process so credential discovery and gRPC
+    channel setup happen once rather than on every job. The client is rebuilt
+    after a fork, since gRPC channels must not be shared across processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._client = None
+        self._pid = None
+        self._stats = {"created": 0, "reused": 0, "setup_seconds_total": 0.0}
+
+    def get(self):
+        """Returns (client, setup_seconds) where setup_seconds is 0.0 on reuse."""
+        with self._lock:
+            if self._client is not None and self._pid == os.getpid():
+                self._stats["reused"] += 1
+                return self._client, 0.0
+            start = time.monotonic()
+            self._client = texttospeech.TextToSpeechClient()
+            self._pid = os.getpid()
+            setup_seconds = time.monotonic() - start
+            self._stats["created"] += 1
+            self._stats["setup_seconds_total"] += setup_seconds
+            return self._client, setup_seconds
+
+    def reset(self):
+        with self._lock:
+            self._client = None
+            self._pid = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+_client_holder = _TTSClientHolder()
+
+
+def get_tts_client():
+    """Returns the process-wide TextToSpeechClient, creating it on first use."""
+    return _client_holder.get()[0]
+
+
+def warm_up_tts_client(logger=None):
+    """
+    Creates the shared client and makes one cheap call so the gRPC channel is
+    connected before the first job arrives. Failures are logged, not raised.
+    """
+    start = time.monotonic()
+    try:
+        get_tts_client().list_voices(language_code="en-US")
+    except Exception as e:
+        if logger:
+            logger.warning(f"TTS client warm-up failed: {e}")
+        return
+    if logger:
+        logger.info(
+            {
+                "event": "tts_client_warmup",
+                "duration": time.monotonic() - start,
+            }
+        )
+
+
+def tts_client_stats() -> dict:
+    """Returns how often the shared client was created vs. reused, and setup cost."""
+    return _client_holder.stats()
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
     retry=retry_if_exception_type(google_exceptions.GoogleAPICallError),
 )
-def synthesize_article_to_mp3(meta: dict, urlhash: str | None = None):
+def _synthesize_chunk(client, chunk: str, voice, audio_config) -> bytes:
+    """Synthesizes a single chunk, retrying only that chunk on transient errors."""
+    synthesis_input = texttospeech.SynthesisInput(text=chunk)
+    response = client.synthesize_speech(
+        input=synthesis_input, voice=voice, audio_config=audio_config
+    )
+    return response.audio_content
+
+
+def _synthesize_chunk_cached(client, chunk: str, voice, audio_config, cache) -> bytes:
+    """Serves a chunk from the cache when possible, synthesizing and storing it otherwise."""
+    if cache is None:
+        return _synthesize_chunk(client, chunk, voice, audio_config)
+    key = chunk_cache_key(chunk, voice, audio_config)
+    audio_content = cache.get(key)
+    if audio_content is None:
+        audio_content = _synthesize_chunk(client, chunk, voice, audio_config)
+        cache.put(key, audio_content)
+    return audio_content
+
+
+def _synthesize_chunks(
+    client, chunks, voice, audio_config, max_concurrency: int, cache=None
+):
+    """
+    Synthesizes chunks concurrently and yields their MP3 bytes in chunk order,
+    each as soon as it and every chunk before it are ready.
+    Worker threads only talk to the TTS client and cache; no Flask context is needed there.
+    """
+    workers = max(1, min(max_concurrency, len(chunks)))
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="storyspool-tts"
+    ) as pool:
+        yield from pool.map(
+            lambda chunk: _synthesize_chunk_cached(
+                client, chunk, voice, audio_config, cache
+            ),
+            chunks,
+        )
+
+
+def synthesize_article_to_mp3(
+    meta: dict, urlhash: str | None = None
+) -> SynthesisResult:
     """
     Synthesizes article text to MP3 audio using Google Cloud Text-to-Speech.
-    Uploads the generated audio to Google Cloud Storage.
+    Uploads the generated audio to Google Cloud Storage and returns its URL
+    with the byte size and duration measured while writing it.
     """
 
-    client = texttospeech.TextToSpeechClient()
+    client, client_setup_seconds = _client_holder.get()
 
     text = meta.get("text", "")
     if not text:
         current_app.logger.warning("No text found in article metadata for TTS.")
         # Return dummy values to allow the rest of the application to function
-        tmpdir = tempfile.mkdtemp()
         fn = f"{urlhash or uuid.uuid4().hex}.mp3"
-        out_path = pathlib.Path(tmpdir) / fn
-        out_path.touch()  # Create a dummy empty file
-        gcs_url = f"https://example.com/dummy_audio/{fn}"
-        return out_path, gcs_url
+        return SynthesisResult(f"https://example.com/dummy_audio/{fn}")
 
     # Set the voice parameters
     voice = texttospeech.VoiceSelectionParams(
@@ -100,36 +338,57 @@ def synthesize_article_to_mp3(meta: dict, urlhash: str | None = None):
     if not chunks:
         current_app.logger.warning("No text chunks generated for TTS.")
         # Return dummy values if no chunks
-        tmpdir = tempfile.mkdtemp()
         fn = f"{urlhash or uuid.uuid4().hex}.mp3"
-        out_path = pathlib.Path(tmpdir) / fn
-        out_path.touch()  # Create a dummy empty file
-        gcs_url = f"https://example.com/dummy_audio/{fn}"
-        return out_path, gcs_url
+        return SynthesisResult(f"https://example.com/dummy_audio/{fn}")
 
-    combined_audio = AudioSegment.empty()  # Initialize empty AudioSegment
-
-    for i, chunk in enumerate(chunks):
-        current_app.logger.debug(
-            f"Synthesizing chunk {i + 1}/{len(chunks)} ({len(chunk)} bytes)."
-        )
-        synthesis_input = texttospeech.SynthesisInput(text=chunk)
-        response = client.synthesize_speech(
-            input=synthesis_input, voice=voice, audio_config=audio_config
-        )
-        # Append audio content to combined_audio
-        combined_audio += AudioSegment.from_mp3(io.BytesIO(response.audio_content))
+    max_concurrency = int(
+        current_app.config.get("TTS_MAX_CONCURRENCY", DEFAULT_TTS_MAX_CONCURRENCY)
+    )
+    current_app.logger.info(
+        "TTS client ready",
+        extra={"client_setup_seconds": client_setup_seconds},
+    )
+    current_app.logger.debug(
+        f"Synthesizing {len(chunks)} chunks "
+        f"({sum(len(c) for c in chunks)} chars, concurrency {max_concurrency})."
+    )
+    audio_chunks = _synthesize_chunks(
+        client,
+        chunks,
+        voice,
+        audio_config,
+        max_concurrency,
+        cache=get_chunk_cache(current_app.config),
+    )
 
-    # Write the combined audio content to a temporary file.
-    tmpdir = tempfile.mkdtemp()
     fn = f"{urlhash or uuid.uuid4().hex}.mp3"
-    out_path = pathlib.Path(tmpdir) / fn
-
-    combined_audio.export(out_path, format="mp3")  # Export combined audio
-    current_app.logger.info(f"Combined audio content written to file: {out_path}")
-
-    # Upload the audio file to GCS
-    gcs_url = upload_audio_and_get_url(out_path, fn)
-    current_app.logger.info(f"Audio uploaded to GCS: {gcs_url}")
+    concat_mode = current_app.config.get("TTS_CONCAT_MODE", DEFAULT_TTS_CONCAT_MODE)
+    if concat_mode == "pydub":
+        # Fallback: decode every chunk and re-encode the whole article via ffmpeg.
+        tmpdir = tempfile.mkdtemp()
+        try:
+            out_path = pathlib.Path(tmpdir) / fn
+            combined_audio = AudioSegment.empty()  # Initialize empty AudioSegment
+            for audio_content in audio_chunks:
+                combined_audio += AudioSegment.from_mp3(io.BytesIO(audio_content))
+            combined_audio.export(out_path, format="mp3")  # Export combined audio
+            current_app.logger.info(
+                f"Combined audio content written to file: {out_path}"
+            )
+            size_bytes = out_path.stat().st_size
+            duration = len(combined_audio) / 1000  # pydub lengths are in ms
+            gcs_url = upload_audio_and_get_url(out_path, fn)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    else:
+        # Frames go straight into a resumable upload as chunks finish, so the
+        # upload overlaps with synthesis and no local copy is ever written.
+        with open_audio_upload(fn) as upload:
+            duration = concat_mp3_frames(audio_chunks, upload)
+        gcs_url = upload.public_url
+        size_bytes = upload.bytes_written
+    current_app.logger.info(
+        f"Audio uploaded to GCS: {gcs_url} ({size_bytes} bytes, {duration:.2f}s)"
+    )
 
-    return out_path, gcs_url
+    return SynthesisResult(gcs_url, size_bytes, duration)
@@ -0,0 +1,220 @@
+import hashlib
+import os
+import pathlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+from google.api_core import exceptions as google_exceptions
+
+from ..extensions import gcs
+
+# Budget per process: every gunicorn worker indexes the directory on its own,
+# and on Cloud Run /tmp is memory, so the real footprint is workers x this.
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "storyspool-tts-cache")
+GCS_CACHE_PREFIX = "tts-cache/"
+
+
+def _message_fingerprint(message) -> str:
+    """Stable text form of a TTS request message (voice or audio config)."""
+    if message is None:
+        return ""
+    to_json = getattr(type(message), "to_json", None)
+    if to_json is None:
+        return repr(message)
+    return to_json(message, sort_keys=True, indent=None)
+
+
+def chunk_cache_key(text: str, voice, audio_config) -> str:
+    """
+    Content address for a synthesized chunk: identical text (modulo whitespace)
+    spoken with the same voice and audio settings always maps to the same key.
+    """
+    h = hashlib.sha256()
+    for part in (
+        " ".join(text.split()),
+        _message_fingerprint(voice),
+        _message_fingerprint(audio_config),
+    ):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class TTSChunkCache:
+    """
+    Two-tier cache of synthesized MP3 chunks.
+
+    The local tier is a directory of ``<key>.mp3`` files evicted in LRU order
+    once their total size exceeds ``max_bytes``. The optional shared tier is a
+    GCS bucket, so instances can reuse each other's audio; shared hits are
+    copied into the local tier.
+    """
+
+    def __init__(
+        self, directory, max_bytes: int = DEFAULT_CACHE_MAX_BYTES, bucket=None
+    ):
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.bucket = bucket
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, int] = OrderedDict()  # key -> size, LRU first
+        self._size = 0
+        self._counters = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "shared_errors": 0,
+            "local_errors": 0,
+        }
+        # Adopt files left by a previous process, oldest access first.
+        existing = sorted(self.directory.glob("*.mp3"), key=lambda p: p.stat().st_mtime)
+        for path in existing:
+            size = path.stat().st_size
+            self._index[path.stem] = size
+            self._size += size
+        self._evict()
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}.mp3"
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, key: str) -> bytes | None:
+        data = self._get_local(key)
+        if data is not None:
+            self._count("local_hits")
+            return data
+        data = self._get_shared(key)
+        if data is not None:
+            self._count("shared_hits")
+            self._put_local(key, data)
+            return data
+        self._count("misses")
+        return None
+
+    def put(self, key: str, data: bytes):
+        self._put_local(key, data)
+        self._count("writes")
+        if self.bucket is not None:
+            try:
+                # Content-addressed objects never change, so skip if present.
+                self.bucket.blob(GCS_CACHE_PREFIX + key).upload_from_string(
+                    data, content_type="audio/mpeg", if_generation_match=0
+                )
+            except google_exceptions.PreconditionFailed:
+                pass
+            except google_exceptions.GoogleAPICallError:
+                self._count("shared_errors")
+
+    def _get_local(self, key: str) -> bytes | None:
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # keep LRU order across restarts
+            return data
+        except FileNotFoundError:
+            with self._lock:
+                self._size -= self._index.pop(key, 0)
+            return None
+        except OSError:
+            # Unreadable entry (EIO, EACCES): forget it and synthesize instead.
+            with self._lock:
+                self._size -= self._index.pop(key, 0)
+                self._counters["local_errors"] += 1
+            return None
+
+    def _get_shared(self, key: str) -> bytes | None:
+        if self.bucket is None:
+            return None
+        try:
+            return self.bucket.blob(GCS_CACHE_PREFIX + key).download_as_bytes()
+        except google_exceptions.NotFound:
+            return None
+        except google_exceptions.GoogleAPICallError:
+            self._count("shared_errors")
+            return None
+
+    def _put_local(self, key: str, data: bytes):
+        path = self._path(key)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            # The cache is best effort: a full or read-only disk (ENOSPC,
+            # EACCES) must not fail the job that produced the audio.
+            tmp.unlink(missing_ok=True)
+            self._count("local_errors")
+            return
+        with self._lock:
+            self._size += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._evict()
+
+    def _evict(self):
+        """Drops least recently used entries until under budget. Caller holds the lock."""
+        while self._size > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._size -= size
+            self._counters["evictions"] += 1
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = (
+                self._counters["local_hits"]
+                + self._counters["shared_hits"]
+                + self._counters["misses"]
+            )
+            hits = lookups - self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._index),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hit_ratio": (hits / lookups) if lookups else 0.0,
+            }
+
+
+_cache: TTSChunkCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_chunk_cache(config) -> TTSChunkCache | None:
+    """Returns the process-wide chunk cache, or None if caching is disabled."""
+    global _cache
+    if not config.get("TTS_CACHE_ENABLED", True):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                bucket_name = config.get("TTS_CACHE_GCS_BUCKET")
+                _cache = TTSChunkCache(
+                    config.get("TTS_CACHE_DIR") or DEFAULT_CACHE_DIR,
+                    max_bytes=int(
+                        config.get("TTS_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES)
+                    ),
+                    bucket=gcs.bucket(bucket_name) if bucket_name else None,
+                )
+    return _cache
+
+
+def chunk_cache_stats() -> dict:
+    """Returns hit/miss counters for the chunk cache."""
+    if _cache is None:
+        return {"active": False}
+    return {"active": True, **_cache.stats()}
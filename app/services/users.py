@@ -1,8 +1,180 @@
 import functools
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
 
 from firebase_admin import auth
 from flask import abort, current_app, g, make_response, redirect, request, url_for
 
+from . import id_tokens
+
+DEFAULT_SESSION_CACHE_MAX_ENTRIES = 10000
+DEFAULT_REVOCATION_CHECK_SECONDS = 300
+
+
+class SessionClaimsCache:
+    """
+    Bounded cache of verified session-cookie claims keyed by a digest of the
+    cookie, so only the first request of a session (and one request per
+    ``recheck_seconds`` after that) pays for Firebase's revocation check.
+
+    An entry expires when its revocation check is ``recheck_seconds`` old or
+    when the session cookie itself expires, whichever is first. Least recently
+    used entries are dropped beyond ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_SESSION_CACHE_MAX_ENTRIES,
+        recheck_seconds: float = DEFAULT_REVOCATION_CHECK_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.recheck_seconds = recheck_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "purges": 0,
+            "verifications": 0,
+        }
+        self._verify_seconds_total = 0.0
+        self._verify_seconds_max = 0.0
+
+    @staticmethod
+    def _key(cookie: str) -> str:
+        return hashlib.sha256(cookie.encode("utf-8")).hexdigest()
+
+    def get(self, cookie: str) -> dict | None:
+        key = self._key(cookie)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, cookie: str, claims: dict):
+        ttl = self.recheck_seconds
+        if claims.get("exp"):
+            ttl = min(ttl, claims["exp"] - time.time())
+        if ttl <= 0:
+            return
+        key = self._key(cookie)
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def purge(self, cookie: str):
+        """Forgets ``cookie``, so its next use is verified with Firebase."""
+        with self._lock:
+            if self._entries.pop(self._key(cookie), None) is not None:
+                self._counters["purges"] += 1
+
+    def record_verification(self, seconds: float):
+        with self._lock:
+            self._counters["verifications"] += 1
+            self._verify_seconds_total += seconds
+            self._verify_seconds_max = max(self._verify_seconds_max, seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            verifications = self._counters["verifications"]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_ratio": (self._counters["hits"] / lookups) if lookups else 0.0,
+                "verify_avg_ms": (
+                    self._verify_seconds_total / verifications * 1000
+                    if verifications
+                    else 0.0
+                ),
+                "verify_max_ms": self._verify_seconds_max * 1000,
+            }
+
+
+_session_cache: SessionClaimsCache | None = None
+_session_cache_lock = threading.Lock()
+
+
+def get_session_cache(config) -> SessionClaimsCache | None:
+    """Returns the process-wide session claims cache, or None if disabled."""
+    global _session_cache
+    if not config.get("SESSION_CACHE_ENABLED", True):
+        return None
+    if _session_cache is None:
+        with _session_cache_lock:
+            if _session_cache is None:
+                _session_cache = SessionClaimsCache(
+                    max_entries=int(
+                        config.get(
+                            "SESSION_CACHE_MAX_ENTRIES",
+                            DEFAULT_SESSION_CACHE_MAX_ENTRIES,
+                        )
+                    ),
+                    recheck_seconds=float(
+                        config.get(
+                            "SESSION_REVOCATION_CHECK_SECONDS",
+                            DEFAULT_REVOCATION_CHECK_SECONDS,
+                        )
+                    ),
+                )
+    return _session_cache
+
+
+def session_cache_stats() -> dict:
+    """Returns hit ratio and verification latency for session cookies."""
+    if _session_cache is None:
+        return {"active": False}
+    return {"active": True, **_session_cache.stats()}
+
+
+def verify_session_cookie(session_cookie: str) -> dict:
+    """
+    Returns the claims of a valid, unrevoked session cookie, from the cache
+    when it was verified recently. Raises like auth.verify_session_cookie.
+    """
+    cache = get_session_cache(current_app.config)
+    if cache is not None:
+        claims = cache.get(session_cookie)
+        if claims is not None:
+            return claims
+    start = time.perf_counter()
+    claims = auth.verify_session_cookie(session_cookie, check_revoked=True)
+    if cache is not None:
+        cache.record_verification(time.perf_counter() - start)
+        cache.put(session_cookie, claims)
+    return claims
+
+
+def purge_session(session_cookie: str | None):
+    """Drops a cookie's cached claims, e.g. on logout."""
+    if session_cookie and _session_cache is not None:
+        _session_cache.purge(session_cookie)
+
+
+def _project_id() -> str | None:
+    firebase = current_app.config.get("FIREBASE") or {}
+    return (
+        firebase.get("projectId")
+        or os.getenv("GOOGLE_CLOUD_PROJECT")
+        or os.getenv("GCP_PROJECT")
+    )
+
 
 def current_user_id():
     """Returns the current user's UID from Firebase Auth, or None."""
@@ -24,9 +196,7 @@ def require_login(f):
         session_cookie = request.cookies.get(current_app.config["COOKIE_NAME"])
         if session_cookie:
             try:
-                decoded_token = auth.verify_session_cookie(
-                    session_cookie, check_revoked=True
-                )
+                decoded_token = verify_session_cookie(session_cookie)
                 g.user = decoded_token
                 current_app.logger.info(
                     f"User {g.user['uid']} authenticated via session cookie."
@@ -55,7 +225,7 @@ def require_login(f):
         if auth_header and auth_header.startswith("Bearer "):
             id_token = auth_header.split("Bearer ")[1]
             try:
-                decoded_token = auth.verify_id_token(id_token)
+                decoded_token = id_tokens.verify_id_token(id_token, _project_id())
                 g.user = decoded_token
                 current_app.logger.info(
                     f"User {g.user['uid']} authenticated via ID token."
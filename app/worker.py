@@ -1,35 +1,72 @@
+import os
+import socket
 import time
+import uuid
 
 from flask import current_app  # New import
 
 from .services.extract import extract_article
-from .services.jobs import JobStatus, get_job, update_job
+from .services.feed_items import save_feed_item
+from .services.feeds import add_feed_item
+from .services.jobs import (
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_STATE_DEBOUNCE_SECONDS,
+    ClaimOutcome,
+    JobStateAccumulator,
+    JobStatus,
+    claim_job,
+    update_job,
+)
+from .services.rss import item_from_article_record
 from .services.store import save_article_record
 from .services.tts import synthesize_article_to_mp3
 
 
 def run_job(job_id: str):
     job_start_time = time.time()
-    j = get_job(job_id)
-    content_id = j.get("urlhash", "unknown")
+    # Unique per run, so a redelivery of this job is never mistaken for us.
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    outcome, j = claim_job(
+        job_id,
+        worker_id,
+        lease_seconds=current_app.config.get(
+            "JOB_LEASE_SECONDS", DEFAULT_LEASE_SECONDS
+        ),
+    )
+    content_id = (j or {}).get("urlhash", "unknown")
 
-    log_extra = {"job_id": job_id, "content_id": content_id}
+    log_extra = {"job_id": job_id, "content_id": content_id, "worker_id": worker_id}
 
     current_app.logger.debug("Worker: Starting job", extra=log_extra)
-    if not j:
+    if outcome == ClaimOutcome.NOT_FOUND:
         current_app.logger.error("Worker: Job not found.", extra=log_extra)
         return False, "job not found"
-    if j["status"] == JobStatus.DONE:
+    if outcome == ClaimOutcome.DONE:
         current_app.logger.debug("Worker: Job already done.", extra=log_extra)
         return True, "already done"
+    if outcome == ClaimOutcome.IN_FLIGHT:
+        current_app.logger.info(
+            "Worker: Job claimed by another worker.", extra=log_extra
+        )
+        return True, "already in progress"
 
+    # Intermediate states are debounced; terminal ones are written at once.
+    state = JobStateAccumulator(
+        current_app._get_current_object(),
+        job_id,
+        status=j["status"],
+        debounce_seconds=current_app.config.get(
+            "JOB_STATE_DEBOUNCE_SECONDS", DEFAULT_STATE_DEBOUNCE_SECONDS
+        ),
+        write=update_job,
+    )
     try:
         # Stage 1: Fetching and Parsing
         stage_start_time = time.time()
-        update_job(job_id, status=JobStatus.FETCHING)
+        state.transition(JobStatus.FETCHING)
         current_app.logger.debug("Worker: Fetching and parsing", extra=log_extra)
         meta = extract_article(j["url"])
-        update_job(job_id, status=JobStatus.PARSING, title=meta.get("title"))
+        state.transition(JobStatus.PARSING, title=meta.get("title"))
         stage_duration = time.time() - stage_start_time
         current_app.logger.info(
             "Worker: Fetching and parsing completed",
@@ -43,9 +80,11 @@ def run_job(job_id: str):
 
         # Stage 2: TTS Generation
         stage_start_time = time.time()
-        update_job(job_id, status=JobStatus.TTS_GENERATING)
+        state.transition(JobStatus.TTS_GENERATING)
         current_app.logger.debug("Worker: Synthesizing audio", extra=log_extra)
-        audio_path, gcs_url = synthesize_article_to_mp3(meta, urlhash=j["urlhash"])
+        audio = synthesize_article_to_mp3(meta, urlhash=j["urlhash"])
+        # Whole seconds, as itunes:duration expects
+        audio_duration_seconds = round(audio.duration_seconds)
         stage_duration = time.time() - stage_start_time
         current_app.logger.info(
             "Worker: TTS generation completed",
@@ -59,11 +98,19 @@ def run_job(job_id: str):
 
         # Stage 3: Uploading Audio
         stage_start_time = time.time()
-        update_job(job_id, status=JobStatus.UPLOADING_AUDIO)
+        state.transition(JobStatus.UPLOADING_AUDIO)
         current_app.logger.debug("Worker: Saving article record", extra=log_extra)
         rec = save_article_record(
-            meta, audio_path, gcs_url, urlhash=j["urlhash"], uid=j["user_id"]
+            meta,
+            None,
+            audio.audio_url,
+            urlhash=j["urlhash"],
+            uid=j["user_id"],
+            audio_size_bytes=audio.size_bytes,
+            audio_duration_seconds=audio_duration_seconds,
         )
+        item = item_from_article_record(rec)
+        save_feed_item(j["user_id"], item)
         stage_duration = time.time() - stage_start_time
         current_app.logger.info(
             "Worker: Saving article record completed",
@@ -77,12 +124,24 @@ def run_job(job_id: str):
 
         # Stage 4: Done
         job_duration = time.time() - job_start_time
-        update_job(
-            job_id,
-            status=JobStatus.DONE,
-            audio_url=gcs_url,
+        try:
+            add_feed_item(j["user_id"], item)
+        except Exception:
+            # The feed is rebuilt from Firestore on the next poll if this fails.
+            current_app.logger.warning(
+                "Worker: Feed update failed", exc_info=True, extra=log_extra
+            )
+        # Marking the job done invalidates cached feed renders, so it comes
+        # after the materialized feed has the new item.
+        state.transition(
+            JobStatus.DONE,
+            user_id=j["user_id"],
+            audio_url=audio.audio_url,
+            audio_size_bytes=audio.size_bytes,
+            audio_duration_seconds=audio_duration_seconds,
             title=rec.get("title"),
             processing_duration_seconds=round(job_duration),
+            lease=None,
         )
         current_app.logger.info(
             "Worker: Job completed successfully",
@@ -91,13 +150,13 @@ def run_job(job_id: str):
                 "stage": "done",
                 "duration": job_duration,
                 "status": JobStatus.DONE,
-                "audio_url": gcs_url,
+                "audio_url": audio.audio_url,
             },
         )
         return True, "ok"
     except Exception as e:
         job_duration = time.time() - job_start_time
-        current_status = get_job(job_id).get("status", JobStatus.QUEUED)
+        current_status = state.status
 
         error_status_map = {
             JobStatus.FETCHING: JobStatus.FAILED_FETCH,
@@ -120,5 +179,5 @@ def run_job(job_id: str):
                 "error_message": str(e),
             },
         )
-        update_job(job_id, status=error_status, last_error=user_friendly_error)
+        state.transition(error_status, last_error=user_friendly_error, lease=None)
         return False, str(e)
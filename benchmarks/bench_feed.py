@@ -0,0 +1,188 @@
+"""
+Feed serving: latency (p50/p95/p99) and throughput of GET /u/<uid>/feed.xml
+through the Flask app, against an in-memory Firestore fake, with no network.
+
+cold:          no materialized feed, no render cache and an empty item
+                fragment cache, so every request queries feed_items, scans the
+                archive, renders and stores the feed.
+materialized:  the stored feeds/{uid} document is served (one read).
+cached:        the render cache holds the feed (no Firestore, no rendering).
+not_modified:  cached, with If-None-Match matching, answered with 304.
+
+Requests rotate over --users users, each with --items feed items. Results
+are printed as JSON for tracking across releases.
+
+    python benchmarks/bench_feed.py --items 50 500 --users 1 100 > feed.json
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from fake_firestore import FakeFirestore
+
+from app import create_app
+from app.services import feed_cache, rss
+from app.services.feed_items import save_feed_item
+
+MODES = ("cold", "materialized", "cached", "not_modified")
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def seed(app, db: FakeFirestore, users: int, items: int) -> list[str]:
+    uids = [f"bench-user-{u}" for u in range(users)]
+    with app.app_context():
+        for uid in uids:
+            for i in range(items):
+                save_feed_item(
+                    uid,
+                    rss.item_from_article_record(
+                        {
+                            "id": f"{uid}-{i:06d}",
+                            "title": f"Article {i}: council approves transit plan",
+                            "summary": "Officials said the plan would expand "
+                            "service across the region. " * 3,
+                            "url": f"https://news.example.com/story/{i}",
+                            "audio_url": "https://storage.googleapis.com/"
+                            f"bucket/audio/{uid}-{i}.mp3",
+                            "audio_size_bytes": 1_000_000 + i,
+                            "audio_duration_seconds": 180 + i % 600,
+                            "created_at": (START + timedelta(minutes=i)).isoformat(),
+                        }
+                    ),
+                )
+    db.reset_counters()
+    return uids
+
+
+def _reset_feeds(db: FakeFirestore):
+    for path in [p for p in db._docs if p[0] == "feeds"]:
+        del db._docs[path]
+
+
+def run_mode(app, client, db, uids, mode: str, requests: int) -> dict:
+    app.config["FEED_CACHE_ENABLED"] = mode in ("cached", "not_modified")
+    feed_cache._cache = None
+    rss._cached_item_fragment.cache_clear()
+    _reset_feeds(db)
+
+    etags = {}
+    for uid in uids:  # warm up: materialize (and cache) every user's feed
+        resp = client.get(
+            f"/u/{uid}/feed.xml", headers={"Authorization": f"Bearer {uid}"}
+        )
+        assert resp.status_code == 200, resp.status_code
+        etags[uid] = resp.headers["ETag"]
+
+    db.reset_counters()
+    samples = []
+    started = time.perf_counter()
+    for n in range(requests):
+        uid = uids[n % len(uids)]
+        headers = {"Authorization": f"Bearer {uid}"}
+        if mode == "cold":
+            _reset_feeds(db)
+            rss._cached_item_fragment.cache_clear()
+        elif mode == "not_modified":
+            headers["If-None-Match"] = etags[uid]
+        t0 = time.perf_counter()
+        resp = client.get(f"/u/{uid}/feed.xml", headers=headers)
+        samples.append((time.perf_counter() - t0) * 1000)
+        assert resp.status_code == (304 if mode == "not_modified" else 200)
+    elapsed = time.perf_counter() - started
+
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "mode": mode,
+        "requests": requests,
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "reads_per_request": round(db.reads / requests, 2),
+        "writes_per_request": round(db.writes / requests, 2),
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 50])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    app = create_app()
+    app.config.update(
+        {
+            "TESTING": True,
+            "SERVER_NAME": "bench.local",
+            "FEED_CACHE_TTL": 3600,
+            "FEED_CACHE_REDIS_URL": feed_cache.MEMORY_URL,  # one process
+        }
+    )
+
+    results = []
+    # ID tokens are the uid itself; verification never leaves the process.
+    with patch(
+        "app.services.users.id_tokens.verify_id_token",
+        side_effect=lambda token, project_id: {"uid": token},
+    ):
+        for items in args.items:
+            for users in args.users:
+                db = FakeFirestore()
+                app.config["FIRESTORE_DB"] = db
+                uids = seed(app, db, users, items)
+                client = app.test_client()
+                for mode in args.modes:
+                    row = run_mode(app, client, db, uids, mode, args.requests)
+                    results.append({"items": items, "users": users, **row})
+                    print(
+                        f"items={items} users={users} {mode}: "
+                        f"p50 {row['p50_ms']} ms, p99 {row['p99_ms']} ms",
+                        file=sys.stderr,
+                    )
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "feed",
+                "revision": _git_revision(),
+                "python": platform.python_version(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "args": vars(args),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
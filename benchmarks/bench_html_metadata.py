@@ -0,0 +1,211 @@
+"""
+Parse cost of article metadata extraction, before and after single-parse.
+
+before: two BeautifulSoup(html.parser) passes (title, canonical) plus
+        trafilatura parsing the raw string itself.
+after:  one lxml parse shared by _html_metadata() and trafilatura.
+
+The corpus is synthetic large news pages (navigation, inline scripts,
+JSON-LD, comments, related-article rails), optionally extended with real
+saved pages via --html-dir.
+
+    python benchmarks/bench_html_metadata.py --pages 20 --repeat 5
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import pathlib
+import random
+import statistics
+import time
+
+import trafilatura
+from bs4 import BeautifulSoup
+from trafilatura.utils import load_html
+
+from app.services.extract import _html_metadata
+
+WORDS = (
+    "city council budget transit report officials said on tuesday the plan "
+    "would expand service across the region while residents raised concerns "
+    "about costs delays and the environmental review process"
+).split()
+
+
+def _sentence(rng: random.Random, n: int = 18) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def make_news_page(seed: int, paragraphs: int = 120, rail_items: int = 200) -> str:
+    """A ~110 KB page shaped like a typical news article."""
+    rng = random.Random(seed)
+    headline = _sentence(rng, 9)
+    nav = "".join(
+        f'<li><a href="/section/{i}">{rng.choice(WORDS).title()}</a></li>'
+        for i in range(80)
+    )
+    scripts = "".join(
+        f"<script>window.__ads_{i} = {json.dumps([_sentence(rng) for _ in range(5)])};</script>"
+        for i in range(20)
+    )
+    ld = json.dumps(
+        {
+            "@context": "https://schema.org",
+            "@type": "NewsArticle",
+            "headline": headline,
+            "author": {"@type": "Person", "name": "Staff Writer"},
+            "datePublished": "2025-08-25T10:00:00Z",
+        }
+    )
+    body = "".join(
+        f"<p>{' '.join(_sentence(rng) for _ in range(4))}</p>"
+        for _ in range(paragraphs)
+    )
+    rail = "".join(
+        f'<div class="card"><a href="/story/{seed}-{i}"><img src="/i/{i}.jpg" '
+        f'alt=""><h3>{_sentence(rng, 8)}</h3></a></div>'
+        for i in range(rail_items)
+    )
+    comments = "".join(
+        f'<div class="comment"><b>user{i}</b><p>{_sentence(rng)}</p></div>'
+        for i in range(60)
+    )
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>{headline} | Example News</title>"
+        f'<meta property="og:title" content="{headline}">'
+        '<meta property="og:description" content="A story about transit.">'
+        '<meta property="og:image" content="https://example.com/lead.jpg">'
+        f'<meta property="og:url" content="https://example.com/story/{seed}">'
+        f'<link rel="canonical" href="https://example.com/story/{seed}">'
+        f'<script type="application/ld+json">{ld}</script>'
+        f"{scripts}</head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<main><article><h1>{headline}</h1>{body}</article>"
+        f'<aside class="related">{rail}</aside>'
+        f'<section class="comments">{comments}</section></main>'
+        "<footer><p>Copyright Example News</p></footer></body></html>"
+    )
+
+
+def _legacy_fallback_title(html):
+    soup = BeautifulSoup(html, "html.parser")
+    if soup.title and soup.title.string:
+        return soup.title.string.strip()
+    og = soup.find("meta", property="og:title")
+    return og["content"].strip() if og and og.get("content") else "Untitled"
+
+
+def _legacy_canonical_url(html, url):
+    soup = BeautifulSoup(html, "html.parser")
+    link = soup.find("link", rel="canonical")
+    og = soup.find("meta", property="og:url")
+    return (link["href"].strip() if link and link.get("href") else None) or (
+        og["content"].strip() if og and og.get("content") else url
+    )
+
+
+def _extract(doc):
+    return trafilatura.extract(
+        doc,
+        include_comments=False,
+        include_tables=False,
+        include_images=False,
+        output_format="json",
+    )
+
+
+def before_parse(html, url):
+    _legacy_fallback_title(html)
+    _legacy_canonical_url(html, url)
+    load_html(html)  # what trafilatura does with a string input
+
+
+def after_parse(html, url):
+    _html_metadata(load_html(html), url)
+
+
+def before_full(html, url):
+    _legacy_fallback_title(html)
+    _legacy_canonical_url(html, url)
+    _extract(html)
+
+
+def after_full(html, url):
+    tree = load_html(html)
+    _html_metadata(tree, url)
+    _extract(tree)
+
+
+def _time(fn, corpus, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        for url, html in corpus:
+            start = time.perf_counter()
+            fn(html, url)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.fmean(ordered), 2),
+        "p50_ms": round(ordered[len(ordered) // 2], 2),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--html-dir", help="Also include saved *.html pages.")
+    parser.add_argument("--json", action="store_true", help="Print JSON only.")
+    args = parser.parse_args()
+
+    corpus = [
+        (f"https://example.com/story/{i}", make_news_page(i)) for i in range(args.pages)
+    ]
+    if args.html_dir:
+        for path in sorted(pathlib.Path(args.html_dir).glob("*.html")):
+            corpus.append((path.as_uri(), path.read_text(errors="replace")))
+
+    results = {
+        "pages": len(corpus),
+        "avg_page_kb": round(sum(len(h) for _, h in corpus) / len(corpus) / 1024, 1),
+    }
+    for name, fn in (
+        ("parse_before", before_parse),
+        ("parse_after", after_parse),
+        ("full_before", before_full),
+        ("full_after", after_full),
+    ):
+        results[name] = _summary(_time(fn, corpus, args.repeat))
+    for stage in ("parse", "full"):
+        results[f"{stage}_speedup"] = round(
+            results[f"{stage}_before"]["mean_ms"]
+            / results[f"{stage}_after"]["mean_ms"],
+            2,
+        )
+
+    if args.json:
+        print(json.dumps(results))
+        return
+    print(f"{results['pages']} pages, avg {results['avg_page_kb']} KB")
+    for stage in ("parse", "full"):
+        before, after = results[f"{stage}_before"], results[f"{stage}_after"]
+        print(
+            f"{stage:>5}: before mean {before['mean_ms']} ms p95 {before['p95_ms']} ms"
+            f" | after mean {after['mean_ms']} ms p95 {after['p95_ms']} ms"
+            f" | {results[f'{stage}_speedup']}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+RSS feed rendering: whole-tree ElementTree build vs the streaming writer.
+
+tree:          builds the full <rss> tree, then ET.tostring() + decode()
+                (the previous rss.build_feed).
+stream-cold:   rss.iter_feed with an empty item-fragment cache, chunks
+                consumed one at a time as a streamed response would be.
+stream-warm:   the same with every item fragment already cached (a feed
+                re-rendered after one new item, or polled again).
+
+Peak memory is measured with tracemalloc in a separate pass.
+
+    python benchmarks/bench_rss.py --sizes 100 1000 10000
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from xml.etree import ElementTree as ET
+
+from app.services import rss
+
+CHANNEL = {
+    "title": "StorySpool Feed for bench-user",
+    "link": "https://storyspool.example/articles",
+    "description": "Your personal feed of narrated articles from StorySpool.",
+    "author": "StorySpool",
+    "owner_name": "StorySpool",
+    "owner_email": "support@storyspool.com",
+    "image_url": "https://storyspool.example/static/brand/storyspool_mark.svg",
+}
+BUILT_AT = datetime(2025, 9, 1, tzinfo=timezone.utc)
+
+
+def make_items(n: int) -> list[dict]:
+    return [
+        {
+            "guid": f"{i:012x}",
+            "title": f"Article {i}: city council approves transit expansion",
+            "summary": "Officials said the plan would expand service across the "
+            "region while residents raised concerns about costs. " * 2,
+            "pub_date": BUILT_AT - timedelta(minutes=i),
+            "source_url": f"https://news.example.com/story/{i}",
+            "enclosure_url": f"https://storage.googleapis.com/bucket/audio/{i}.mp3",
+            "enclosure_length": 1_000_000 + i,
+            "duration": 180 + i % 600,
+            "author": "Staff Writer",
+        }
+        for i in range(n)
+    ]
+
+
+def render_tree(items):
+    root = rss._channel_element(CHANNEL, BUILT_AT)
+    channel = root.find("channel")
+    for meta in items:
+        channel.append(rss.item_from_article(meta))
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True).decode("utf-8")
+
+
+def render_stream(items):
+    size = 0
+    for chunk in rss.iter_feed("bench-user", CHANNEL, items, BUILT_AT):
+        size += len(chunk)  # stand-in for writing to the socket
+    return size
+
+
+def _cold(fn):
+    def run(items):
+        rss._cached_item_fragment.cache_clear()
+        return fn(items)
+
+    return run
+
+
+def _timed(fn, items, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(items)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _peak_kb(fn, items) -> float:
+    tracemalloc.start()
+    try:
+        fn(items)
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print JSON only.")
+    args = parser.parse_args()
+
+    # Fragments are cached per process; make sure 10k items fit.
+    if rss.ITEM_CACHE_SIZE < max(args.sizes):
+        print(
+            f"note: RSS_ITEM_CACHE_SIZE={rss.ITEM_CACHE_SIZE} is below the largest "
+            "feed; stream-warm will miss",
+            file=sys.stderr,
+        )
+
+    assert render_tree(make_items(10)) == rss.build_feed(
+        "bench-user", CHANNEL, make_items(10), BUILT_AT
+    ), "streaming output is not byte-compatible"
+
+    results = []
+    for n in args.sizes:
+        items = make_items(n)
+        row = {"items": n}
+        for name, fn in (
+            ("tree", render_tree),
+            ("stream_cold", _cold(render_stream)),
+            ("stream_warm", render_stream),
+        ):
+            fn(items)  # warm up (and fill the fragment cache for stream_warm)
+            samples = _timed(fn, items, args.repeat)
+            row[name] = {
+                "mean_ms": round(statistics.fmean(samples), 2),
+                "p50_ms": round(statistics.median(samples), 2),
+                "peak_kb": _peak_kb(fn, items),
+            }
+        results.append(row)
+
+    if args.json:
+        print(json.dumps(results))
+        return
+    print(f"{'items':>6} | {'variant':<12} | {'mean ms':>9} | {'p50 ms':>9} | peak KB")
+    for row in results:
+        for name in ("tree", "stream_cold", "stream_warm"):
+            r = row[name]
+            print(
+                f"{row['items']:>6} | {name:<12} | {r['mean_ms']:>9} | "
+                f"{r['p50_ms']:>9} | {r['peak_kb']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
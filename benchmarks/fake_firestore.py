@@ -0,0 +1,177 @@
+"""
+In-memory stand-in for the parts of google.cloud.firestore.Client the app
+uses: documents (get with field_paths, set with merge, update with a
+last_update_time precondition, create, delete), subcollections, and queries
+with where("=="), select, order_by, start_after and limit.
+
+Documents are deep-copied on every read and write, roughly like the
+(de)serialization a real client does. ``reads`` and ``writes`` count
+documents, the unit Firestore bills by.
+"""
+
+import copy
+import itertools
+import threading
+
+from google.api_core import exceptions as google_exceptions
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id: str, data: dict | None, update_time=None):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+        self.update_time = update_time
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+
+class FakeDocumentRef:
+    def __init__(self, db: "FakeFirestore", path: tuple):
+        self._db = db
+        self._path = path
+        self.id = path[-1]
+
+    def collection(self, name: str) -> "FakeQuery":
+        return FakeQuery(self._db, self._path + (name,))
+
+    def get(self, field_paths=None) -> FakeSnapshot:
+        with self._db._lock:
+            self._db.reads += 1
+            entry = self._db._docs.get(self._path)
+        if entry is None:
+            return FakeSnapshot(self.id, None)
+        data, update_time = entry
+        if field_paths is not None:
+            data = {k: v for k, v in data.items() if k in field_paths}
+        return FakeSnapshot(self.id, copy.deepcopy(data), update_time)
+
+    def _put(self, data: dict):
+        self._db.writes += 1
+        self._db._docs[self._path] = (copy.deepcopy(data), next(self._db._clock))
+
+    def set(self, doc: dict, merge: bool = False):
+        with self._db._lock:
+            current = self._db._docs.get(self._path)
+            if merge and current is not None:
+                doc = {**current[0], **doc}
+            self._put(doc)
+
+    def create(self, doc: dict):
+        with self._db._lock:
+            if self._path in self._db._docs:
+                raise google_exceptions.Conflict("Document already exists")
+            self._put(doc)
+
+    def update(self, doc: dict, option=None):
+        with self._db._lock:
+            current = self._db._docs.get(self._path)
+            if current is None:
+                raise google_exceptions.NotFound("No document to update")
+            if option is not None and option["last_update_time"] != current[1]:
+                raise google_exceptions.FailedPrecondition("Document was modified")
+            self._put({**current[0], **doc})
+
+    def delete(self):
+        with self._db._lock:
+            self._db._docs.pop(self._path, None)
+
+
+class FakeQuery:
+    """A collection reference is a query with no filters."""
+
+    def __init__(
+        self,
+        db: "FakeFirestore",
+        path: tuple,
+        filters=(),
+        fields=None,
+        order=None,
+        after=None,
+        count=None,
+    ):
+        self._db = db
+        self._path = path
+        self._filters = filters
+        self._fields = fields
+        self._order = order
+        self._after = after
+        self._count = count
+
+    def _with(self, **changes) -> "FakeQuery":
+        state = {
+            "filters": self._filters,
+            "fields": self._fields,
+            "order": self._order,
+            "after": self._after,
+            "count": self._count,
+        }
+        return FakeQuery(self._db, self._path, **{**state, **changes})
+
+    def document(self, doc_id: str) -> FakeDocumentRef:
+        return FakeDocumentRef(self._db, self._path + (doc_id,))
+
+    def where(self, field: str, op: str, value) -> "FakeQuery":
+        if op != "==":
+            raise NotImplementedError(f"FakeFirestore only supports '==', not {op!r}")
+        return self._with(filters=self._filters + ((field, value),))
+
+    def select(self, fields) -> "FakeQuery":
+        return self._with(fields=list(fields))
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "FakeQuery":
+        return self._with(order=(field, direction == "DESCENDING"))
+
+    def start_after(self, values: dict) -> "FakeQuery":
+        return self._with(after=values)
+
+    def limit(self, count: int) -> "FakeQuery":
+        return self._with(count=count)
+
+    def stream(self):
+        depth = len(self._path) + 1
+        with self._db._lock:
+            rows = [
+                (path[-1], data, update_time)
+                for path, (data, update_time) in self._db._docs.items()
+                if len(path) == depth and path[:-1] == self._path
+            ]
+        rows = [r for r in rows if all(r[1].get(f) == v for f, v in self._filters)]
+        if self._order is not None:
+            field, descending = self._order
+            rows = [r for r in rows if r[1].get(field) is not None]
+            rows.sort(key=lambda r: r[1][field], reverse=descending)
+            if self._after is not None:
+                after = self._after[field]
+                rows = [
+                    r
+                    for r in rows
+                    if (r[1][field] < after if descending else r[1][field] > after)
+                ]
+        if self._count is not None:
+            rows = rows[: self._count]
+        with self._db._lock:
+            self._db.reads += max(len(rows), 1)  # empty results bill one read
+        for doc_id, data, update_time in rows:
+            if self._fields is not None:
+                data = {k: v for k, v in data.items() if k in self._fields}
+            yield FakeSnapshot(doc_id, copy.deepcopy(data), update_time)
+
+
+class FakeFirestore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._docs: dict[tuple, tuple[dict, int]] = {}
+        self._clock = itertools.count(1)
+        self.reads = 0
+        self.writes = 0
+
+    def collection(self, name: str) -> FakeQuery:
+        return FakeQuery(self, (name,))
+
+    def write_option(self, **kwargs) -> dict:
+        return kwargs
+
+    def reset_counters(self):
+        self.reads = self.writes = 0
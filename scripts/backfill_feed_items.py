@@ -0,0 +1,40 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+
+from app import create_app
+from app.services.feed_items import save_feed_item
+from app.services.rss import item_from_article_record
+from app.services.store import _articles_col
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write users/{uid}/feed_items from existing article records."
+    )
+    parser.add_argument("--uid", help="Only backfill this user.")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        query = _articles_col()
+        if args.uid:
+            query = query.where("user_id", "==", args.uid)
+        written = skipped = 0
+        for snap in query.stream():
+            record = snap.to_dict()
+            if not record.get("user_id") or not record.get("audio_url"):
+                skipped += 1
+                continue
+            if not args.dry_run:
+                save_feed_item(record["user_id"], item_from_article_record(record))
+            written += 1
+        print(f"feed_items written: {written}, skipped: {skipped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 import argparse
+import contextlib
 import hashlib
 import json
 import logging
 import os
-import shutil  # For cleaning up temp directories
+import pathlib
+import shutil
 import sys
 from unittest.mock import patch  # Import patch
 
@@ -17,6 +19,50 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class LocalAudioUpload:
+    """Stands in for store.AudioUpload, writing the audio to a local file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.bytes_written = 0
+        self.public_url = None
+        self._file = open(f"{path}.part", "wb")
+
+    def write(self, data: bytes) -> int:
+        self._file.write(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+
+def local_audio_upload(output_filename: str):
+    """
+    Returns replacements for open_audio_upload and upload_audio_and_get_url
+    that write ``output_filename`` instead of uploading to GCS. The file is
+    written under a ``.part`` name and renamed once complete, so a failed run
+    never leaves a file that the existence check below would skip.
+    """
+
+    @contextlib.contextmanager
+    def open_upload(filename):
+        upload = LocalAudioUpload(output_filename)
+        try:
+            yield upload
+        except BaseException:
+            upload._file.close()
+            os.remove(f"{output_filename}.part")
+            raise
+        upload._file.close()
+        os.replace(f"{output_filename}.part", output_filename)
+        upload.public_url = pathlib.Path(output_filename).resolve().as_uri()
+
+    def upload_and_get_url(local_path, filename):
+        shutil.copyfile(local_path, f"{output_filename}.part")
+        os.replace(f"{output_filename}.part", output_filename)
+        return pathlib.Path(output_filename).resolve().as_uri()
+
+    return open_upload, upload_and_get_url
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Synthesize audio from an article JSON file."
@@ -63,37 +109,25 @@ def main():
             )
             sys.exit(0)
 
-        temp_dir = None
-        # Patch upload_audio_and_get_url for local testing
-        # Patch app.services.tts.upload_audio_and_get_url because that's where it's imported and used by synthesize_article_to_mp3
-        with patch(
-            "app.services.tts.upload_audio_and_get_url",
-            return_value="http://mock-gcs.com/mock_audio.mp3",
+        # Write the audio to output_filename instead of GCS. Both upload paths
+        # are patched where synthesize_article_to_mp3 imports them: frames mode
+        # streams into open_audio_upload, pydub mode uses upload_audio_and_get_url.
+        open_upload, upload_and_get_url = local_audio_upload(output_filename)
+        with patch("app.services.tts.open_audio_upload", open_upload), patch(
+            "app.services.tts.upload_audio_and_get_url", upload_and_get_url
         ):
             try:
-                output_path, gcs_url = synthesize_article_to_mp3(
-                    article_data, urlhash=urlhash
+                result = synthesize_article_to_mp3(article_data, urlhash=urlhash)
+                logger.info(f"Audio written to: {result.audio_url}")
+                logger.info(
+                    f"Audio: {result.size_bytes} bytes, "
+                    f"{result.duration_seconds:.2f}s"
                 )
-                logger.info(f"Audio file created at: {output_path}")
-                logger.info(f"GCS URL: {gcs_url}")
-
-                # Move the synthesized file to the current directory for easier access
-                shutil.move(str(output_path), output_filename)
-                logger.info(f"Moved synthesized audio to: {output_filename}")
-
             except Exception as e:
                 logger.error(
                     f"An error occurred during audio synthesis: {e}", exc_info=True
                 )
                 sys.exit(1)
-            finally:
-                # Clean up the temporary directory created by synthesize_article_to_mp3
-                # The output_path from synthesize_article_to_mp3 is a Path object,
-                # its parent is the temporary directory.
-                if "output_path" in locals() and output_path.parent.exists():
-                    temp_dir = output_path.parent
-                    shutil.rmtree(temp_dir)
-                    logger.info(f"Cleaned up temporary directory: {temp_dir}")
 
 
 if __name__ == "__main__":
@@ -34,6 +34,7 @@ def app():
             "SECRET_KEY": "test_secret_key",
             "FIRESTORE_DB": MagicMock(),
             "FIRESTORE_COLLECTION": "test_collection",  # Added FIRESTORE_COLLECTION
+            "FEED_CACHE_ENABLED": False,  # tests opt in; the cache is process-wide
             # You can override other config settings here for tests
             # For example, using a different database or disabling services.
             # e.g., "GCS_BUCKET_NAME": "fake-test-bucket"
@@ -0,0 +1,168 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.extract import browser_pool
+
+
+class FakeRoute:
+    def __init__(self, resource_type):
+        self.request = SimpleNamespace(resource_type=resource_type)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+class FakePage:
+    def __init__(self, hold=None):
+        self.hold = hold
+        self.closed = False
+
+    async def goto(self, url, timeout, wait_until):
+        if self.hold is not None:
+            await self.hold()
+        return SimpleNamespace(status=203, headers={"x-test": "1"})
+
+    async def evaluate(self, script):
+        pass
+
+    async def wait_for_load_state(self, state, timeout):
+        await asyncio.sleep(60)  # network never goes idle
+
+    async def wait_for_selector(self, selector, state, timeout):
+        pass  # main content is already there
+
+    async def content(self):
+        return "<html><main><p>Rendered</p></main></html>"
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, hold):
+        self.hold = hold
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        self.routes.append(handler)
+
+    async def new_page(self):
+        return FakePage(self.hold)
+
+    async def clear_cookies(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self, hold):
+        self.hold = hold
+        self.contexts = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self):
+        self.contexts.append(FakeContext(self.hold))
+        return self.contexts[-1]
+
+    async def close(self):
+        pass
+
+
+class FakePlaywright:
+    def __init__(self, hold=None):
+        self.browsers = []
+        self.chromium = SimpleNamespace(launch=self._launch)
+        self.hold = hold
+
+    async def _launch(self):
+        self.browsers.append(FakeBrowser(self.hold))
+        return self.browsers[-1]
+
+    def __call__(self):
+        return self
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def fake_playwright():
+    fake = FakePlaywright()
+    browser_pool.shutdown_browser_pool()
+    with patch("app.extract.browser_pool.async_playwright", fake):
+        yield fake
+    browser_pool.shutdown_browser_pool()
+
+
+def test_render_reuses_browser_and_context_across_event_loops(fake_playwright):
+    """Separate asyncio.run calls share one browser launch and one context."""
+    for _ in range(2):
+        html, status, headers = asyncio.run(
+            browser_pool.render_page("https://example.com/a", timeout=5)
+        )
+
+    assert "Rendered" in html
+    assert status == 203
+    assert headers == {"x-test": "1"}
+    assert len(fake_playwright.browsers) == 1
+    assert len(fake_playwright.browsers[0].contexts) == 1
+    stats = browser_pool.browser_pool_stats()
+    assert stats["launches"] == 1
+    assert stats["contexts_reused"] == 1
+    assert stats["pages"] == 2
+
+
+def test_blocks_images_fonts_and_media_by_default():
+    pool = browser_pool.BrowserPool()
+
+    async def route(resource_type):
+        r = FakeRoute(resource_type)
+        await pool._route(r)
+        return r.outcome
+
+    assert asyncio.run(route("image")) == "aborted"
+    assert asyncio.run(route("font")) == "aborted"
+    assert asyncio.run(route("media")) == "aborted"
+    assert asyncio.run(route("document")) == "continued"
+    assert asyncio.run(route("script")) == "continued"
+    assert pool.stats()["blocked_requests"] == 3
+
+
+def test_concurrent_pages_are_capped():
+    in_flight = 0
+    peak = 0
+
+    async def hold():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    async def run():
+        pool = browser_pool.BrowserPool(max_pages=2)
+        await asyncio.gather(
+            *(pool.render(f"https://example.com/{i}", timeout=5) for i in range(6))
+        )
+        return pool
+
+    with patch("app.extract.browser_pool.async_playwright", FakePlaywright(hold)):
+        pool = asyncio.run(run())
+
+    assert peak == 2
+    assert pool.stats()["contexts_created"] == 2
+    assert pool.stats()["pages"] == 6
@@ -2,11 +2,12 @@ import json
 from unittest.mock import patch
 
 from flask import Flask
+from trafilatura.utils import load_html
 
-from app.services.extract import extract_article
+from app.services.extract import _html_metadata, extract_article
 
 
-@patch("app.services.extract.trafilatura.fetch_url")
+@patch("app.services.extract.fetch_html")
 @patch("app.services.extract.trafilatura.extract")
 def test_extract_article_success(mock_extract, mock_fetch_url):
     """Test the successful extraction of an article using trafilatura."""
@@ -40,10 +41,9 @@ def test_extract_article_success(mock_extract, mock_fetch_url):
         mock_extract.assert_called_once()
 
 
-@patch("app.services.extract.requests.get")
-@patch("app.services.extract.trafilatura.fetch_url")
+@patch("app.services.extract.fetch_html")
 @patch("app.services.extract.trafilatura.extract")
-def test_extract_article_fallback(mock_extract, mock_fetch_url, mock_requests_get):
+def test_extract_article_fallback(mock_extract, mock_fetch_url):
     """Test the fallback extraction logic when trafilatura fails."""
     # Arrange
     url = "http://example.com/fallback"
@@ -53,19 +53,13 @@ def test_extract_article_fallback(mock_extract, mock_fetch_url, mock_requests_ge
         <body><p>Fallback text.</p></body>
     </html>
     """
-    mock_fetch_url.return_value = (
-        "<html>...</html>"  # This is for the first extract call
-    )
+    mock_fetch_url.return_value = sample_html
     # Simulate trafilatura returning no data on the first call, then fallback text on the second
     mock_extract.side_effect = [
         "{}",  # First call returns empty JSON
         "Fallback text.",  # Second call inside the fallback logic returns the text
     ]
 
-    mock_response = mock_requests_get.return_value
-    mock_response.text = sample_html
-    mock_response.raise_for_status.return_value = None
-
     app = Flask(__name__)
     with app.app_context():
         # Act
@@ -74,4 +68,35 @@ def test_extract_article_fallback(mock_extract, mock_fetch_url, mock_requests_ge
         # Assert
         assert result["title"] == "Fallback Title"
         assert "Fallback text." in result["text"]
-        mock_requests_get.assert_called_once()
+        # The fallback reuses the downloaded HTML instead of fetching again
+        mock_fetch_url.assert_called_once_with(url)
+        assert mock_extract.call_args_list[1].args[0] == sample_html
+
+
+def test_html_metadata_single_pass():
+    """Title, canonical, og:* and JSON-LD all come from one parsed tree."""
+    html = """
+    <html><head>
+        <title> Page Title </title>
+        <meta property="og:title" content="OG Title">
+        <meta property="og:image" content="http://example.com/lead.jpg">
+        <link rel="canonical" href="http://example.com/canonical">
+        <script type="application/ld+json">{"@type": "NewsArticle"}</script>
+        <script type="application/ld+json">not json</script>
+    </head><body><p>Body</p></body></html>
+    """
+    meta = _html_metadata(load_html(html), "http://example.com/a")
+
+    assert meta["title"] == "Page Title"
+    assert meta["canonical_url"] == "http://example.com/canonical"
+    assert meta["og"] == {"title": "OG Title", "image": "http://example.com/lead.jpg"}
+    assert meta["json_ld"] == [{"@type": "NewsArticle"}]
+
+
+def test_html_metadata_falls_back_to_og_and_url():
+    html = '<html><head><meta property="og:title" content="OG Title"></head></html>'
+    meta = _html_metadata(load_html(html), "http://example.com/a")
+
+    assert meta["title"] == "OG Title"
+    assert meta["canonical_url"] == "http://example.com/a"
+    assert _html_metadata(None, "http://example.com/a")["title"] == "Untitled"
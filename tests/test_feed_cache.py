@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from app.services import feed_cache
+from app.services.feed_cache import FeedRenderCache, InMemorySharedStore
+from app.services.jobs import JobStatus, delete_job, update_job
+
+FEED = {
+    "xml": "<rss/>",
+    "etag": "4-1-100",
+    "last_modified": datetime(2025, 9, 1, tzinfo=timezone.utc),
+}
+
+
+def test_store_then_lookup_hits_locally():
+    cache = FeedRenderCache()
+    feed, version = cache.lookup("u1")
+    assert feed is None
+
+    cache.store("u1", version, FEED)
+
+    assert cache.lookup("u1") == (FEED, version)
+    assert cache.stats()["local_hits"] == 1
+
+
+def test_invalidate_retires_renders_including_racing_ones():
+    cache = FeedRenderCache()
+    _, version = cache.lookup("u1")  # a request starts rendering...
+    cache.invalidate("u1")  # ...a job completes meanwhile...
+    cache.store("u1", version, FEED)  # ...and the stale render lands
+
+    feed, new_version = cache.lookup("u1")
+
+    assert feed is None
+    assert new_version == version + 1
+
+
+def test_instances_share_renders_and_invalidations():
+    shared = InMemorySharedStore()
+    a, b = FeedRenderCache(shared), FeedRenderCache(shared)
+    a.store("u1", a.lookup("u1")[1], FEED)
+
+    assert b.lookup("u1")[0] == FEED  # last_modified survives the round trip
+    assert b.stats()["shared_hits"] == 1
+
+    a.invalidate("u1")
+    assert b.lookup("u1")[0] is None  # b's local copy is stale now
+
+
+def test_local_tier_is_bounded():
+    cache = FeedRenderCache(max_entries=2)
+    for uid in ("u1", "u2", "u3"):
+        cache.store(uid, 0, FEED)
+
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_shared_entries_expire():
+    shared = InMemorySharedStore()
+    shared.set("k", "v", ex=60)
+    with patch("app.services.feed_cache.time.time", return_value=10**12):
+        assert shared.get("k") is None
+
+
+@pytest.fixture
+def job_app():
+    app = Flask(__name__)
+    app.config["FIRESTORE_DB"] = MagicMock()
+    with app.app_context(), patch("app.services.jobs.invalidate_feed") as invalidate:
+        yield app, invalidate
+
+
+def test_update_job_invalidates_only_on_done(job_app):
+    app, invalidate = job_app
+
+    update_job("j1", status=JobStatus.UPLOADING_AUDIO)
+    invalidate.assert_not_called()
+
+    update_job("j1", status=JobStatus.DONE, user_id="u1")
+    invalidate.assert_called_once_with(app.config, "u1")
+
+
+@patch("app.services.jobs.delete_feed")
+@patch("app.services.jobs.delete_feed_item")
+def test_delete_job_drops_feed_item_and_invalidates(
+    mock_delete_item, mock_delete_feed, job_app
+):
+    app, invalidate = job_app
+    job_ref = app.config["FIRESTORE_DB"].collection.return_value.document.return_value
+    job_ref.get.return_value.exists = True
+    job_ref.get.return_value.to_dict.return_value = {"id": "j1", "user_id": "u1"}
+
+    delete_job("j1")
+
+    job_ref.delete.assert_called_once()
+    mock_delete_item.assert_called_once_with("u1", "j1")
+    mock_delete_feed.assert_called_once_with("u1")
+    invalidate.assert_called_once_with(app.config, "u1")
+
+
+@patch("app.routes.feeds.get_feed_validators")
+@patch("app.routes.feeds.get_feed")
+def test_feed_route_serves_cache_hits_without_firestore(
+    mock_get_feed, mock_validators, client, monkeypatch
+):
+    monkeypatch.setitem(client.application.config, "FEED_CACHE_ENABLED", True)
+    monkeypatch.setitem(
+        client.application.config, "FEED_CACHE_REDIS_URL", feed_cache.MEMORY_URL
+    )
+    monkeypatch.setattr(feed_cache, "_cache", None)
+    mock_get_feed.return_value = FEED
+
+    first = client.get("/u/test_user_id/feed.xml")
+    second = client.get(
+        "/u/test_user_id/feed.xml", headers={"If-None-Match": '"4-1-100"'}
+    )
+
+    assert first.data == b"<rss/>"
+    assert second.status_code == 304
+    mock_get_feed.assert_called_once()
+    mock_validators.assert_not_called()
+
+
+def test_cache_is_off_without_a_shared_store(monkeypatch):
+    app = Flask(__name__)
+    monkeypatch.setattr(feed_cache, "_cache", None)
+    monkeypatch.setattr(feed_cache, "_unavailable_logged", False)
+    monkeypatch.setattr(feed_cache, "redis", None)
+
+    with app.app_context():
+        assert feed_cache.get_feed_cache({"FEED_CACHE_REDIS_URL": ""}) is None
+        with patch.object(app.logger, "error") as log_error:
+            config = {"FEED_CACHE_REDIS_URL": "redis://cache:6379/0"}
+            assert feed_cache.get_feed_cache(config) is None
+            assert feed_cache.get_feed_cache(config) is None
+        log_error.assert_called_once()
@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask
+
+from app.services.feed_items import list_feed_items, save_feed_item
+
+
+@pytest.fixture
+def app_db():
+    app = Flask(__name__)
+    app.config["FIRESTORE_DB"] = MagicMock()
+    with app.app_context():
+        yield app.config["FIRESTORE_DB"]
+
+
+def _items_col(db):
+    return db.collection.return_value.document.return_value.collection.return_value
+
+
+def test_save_feed_item_writes_user_subcollection(app_db):
+    pub_date = datetime(2025, 9, 1, 12, tzinfo=timezone.utc)
+    item = {"guid": "abc", "pub_date": pub_date, "enclosure_url": "http://a/b.mp3"}
+
+    doc = save_feed_item("u1", item)
+
+    app_db.collection.assert_called_once_with("users")
+    app_db.collection.return_value.document.assert_called_once_with("u1")
+    _items_col(app_db).document.assert_called_once_with("abc")
+    _items_col(app_db).document.return_value.set.assert_called_once_with(doc)
+    assert doc["created_at"] == pub_date.isoformat()
+
+
+def test_list_feed_items_is_one_ordered_limited_query(app_db):
+    stored = MagicMock()
+    stored.to_dict.return_value = {"guid": "abc", "pub_date": "2025-09-01T12:00:00"}
+    ordered = _items_col(app_db).order_by.return_value
+    ordered.limit.return_value.stream.return_value = [stored]
+
+    items = list_feed_items("u1", limit=5)
+
+    _items_col(app_db).order_by.assert_called_once_with(
+        "created_at", direction="DESCENDING"
+    )
+    ordered.limit.assert_called_once_with(5)
+    assert items[0]["pub_date"] == datetime(2025, 9, 1, 12)
+    assert list_feed_items("") == []
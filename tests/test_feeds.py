@@ -0,0 +1,485 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from app.services import feed_tokens, feeds, rss
+
+CHANNEL = {
+    "title": "Feed",
+    "link": "http://example.com/articles",
+    "description": "",
+    "archive_url": "http://example.com/u/u1/feed/archive/__cursor__.xml",
+}
+
+
+class FakeDocRef:
+    """Single Firestore document honouring last_update_time preconditions."""
+
+    def __init__(self):
+        self.data = None
+        self.update_time = 0
+        self.fail_next_updates = 0
+
+    def get(self, field_paths=None):
+        self.last_field_paths = field_paths
+        data = self.data
+        if data is not None and field_paths is not None:
+            data = {k: v for k, v in data.items() if k in field_paths}
+        return SimpleNamespace(
+            exists=data is not None,
+            to_dict=lambda: dict(data),
+            update_time=self.update_time,
+        )
+
+    def create(self, doc):
+        if self.data is not None:
+            raise google_exceptions.Conflict("exists")
+        self.data, self.update_time = dict(doc), self.update_time + 1
+
+    def update(self, doc, option=None):
+        if self.fail_next_updates:
+            self.fail_next_updates -= 1
+            self.update_time += 1  # someone else wrote in between
+            raise google_exceptions.FailedPrecondition("stale")
+        if option is not None and option["last_update_time"] != self.update_time:
+            raise google_exceptions.FailedPrecondition("stale")
+        self.data, self.update_time = {**self.data, **doc}, self.update_time + 1
+
+    def delete(self):
+        self.data = None
+
+
+@pytest.fixture
+def feed_ref():
+    ref = FakeDocRef()
+    db = MagicMock()
+    db.collection.return_value.document.return_value = ref
+    db.write_option.side_effect = lambda **kw: kw
+    app = SimpleNamespace(config={"FIRESTORE_DB": db}, logger=MagicMock())
+    ref.history = []  # feed_items backing the archive pages
+    with (
+        patch("app.services.feeds.current_app", app),
+        patch(
+            "app.services.feeds.list_feed_items",
+            side_effect=lambda *a, **kw: _list_items(ref.history, *a, **kw),
+        ),
+    ):
+        yield ref
+
+
+def _list_items(
+    history, uid, limit=50, start_after=None, direction="DESCENDING", fields=None
+):
+    """Mimics the created_at-ordered, cursor-driven feed_items query."""
+    records = sorted(
+        history, key=lambda r: r["created_at"], reverse=direction == "DESCENDING"
+    )
+    if start_after:
+        after = start_after["created_at"]
+        records = [
+            r
+            for r in records
+            if (
+                r["created_at"] < after
+                if direction == "DESCENDING"
+                else r["created_at"] > after
+            )
+        ]
+    if fields:
+        records = [{f: r[f] for f in fields} for r in records]
+    return records[:limit]
+
+
+def _record(i):
+    item = rss.item_from_article_record(
+        {
+            "id": f"r{i}",
+            "title": f"Record {i}",
+            "audio_url": f"http://example.com/r{i}.mp3",
+            "created_at": (
+                datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i)
+            ).isoformat(),
+        }
+    )
+    return {**item, "created_at": item["pub_date"].isoformat()}
+
+
+def _item(guid, days_ago, title=None):
+    return rss.item_from_article_record(
+        {
+            "id": guid,
+            "title": title or f"Article {guid}",
+            "url": f"http://example.com/{guid}",
+            "audio_url": f"http://example.com/{guid}.mp3",
+            "created_at": (
+                datetime(2025, 9, 1, tzinfo=timezone.utc) - timedelta(days=days_ago)
+            ).isoformat(),
+        }
+    )
+
+
+def test_add_item_without_feed_defers_to_next_poll(feed_ref):
+    assert feeds.add_feed_item("u1", _item("a", 0)) is False
+    assert feeds.get_feed("u1") is None
+
+
+def test_feed_is_built_once_then_updated_incrementally(feed_ref):
+    built = feeds.build_feed("u1", CHANNEL, [_item("a", 2)])
+    assert built["version"] == 1
+    assert feeds.get_feed("u1")["xml"] == built["xml"]
+
+    assert feeds.add_feed_item("u1", _item("b", 1)) is True
+    assert feeds.add_feed_item("u1", _item("a", 2, title="Retitled")) is True
+
+    feed = feeds.get_feed("u1")
+    assert feed["version"] == 3
+    assert [i["guid"] for i in feed["items"]] == ["b", "a"]
+    assert "Retitled" in feed["xml"]
+    assert feed["xml"].index("Article b") < feed["xml"].index("Retitled")
+
+
+def test_item_saved_during_first_build_is_not_lost(feed_ref):
+    # The poll listed feed items before the worker saved "a"; the worker's
+    # add_feed_item then found no feed and deferred to the build.
+    record = _record(0)
+    feed_ref.history.append(record)
+    assert feeds.add_feed_item("u1", record) is False
+
+    built = feeds.build_feed("u1", CHANNEL, [])
+
+    assert [i["guid"] for i in built["items"]] == ["r0"]
+    assert [i["guid"] for i in feeds.get_feed("u1")["items"]] == ["r0"]
+
+
+def test_add_item_retries_on_concurrent_write(feed_ref):
+    feeds.build_feed("u1", CHANNEL, [])
+    feed_ref.fail_next_updates = 1
+
+    assert feeds.add_feed_item("u1", _item("a", 0)) is True
+    assert [i["guid"] for i in feeds.get_feed("u1")["items"]] == ["a"]
+
+
+def test_renders_from_older_format_are_not_served(feed_ref):
+    feeds.build_feed("u1", CHANNEL, [_item("a", 0)])
+    feed_ref.data["format"] = feeds.FEED_FORMAT_VERSION - 1
+
+    assert feeds.get_feed("u1") is None
+    assert feeds.add_feed_item("u1", _item("b", 0)) is False
+
+
+def test_validators_are_stable_across_renders(feed_ref):
+    items = [_item("a", 2), _item("b", 1)]
+    first = feeds.build_feed("u1", CHANNEL, items)
+    second = feeds.build_feed("u1", CHANNEL, items)
+
+    assert first["xml"] == second["xml"]  # lastBuildDate no longer uses now()
+    assert first["etag"] == second["etag"]
+    assert first["last_modified"] == items[1]["pub_date"]
+
+    feeds.add_feed_item("u1", _item("c", 0))
+    assert feeds.get_feed("u1")["etag"] != first["etag"]
+
+
+def test_get_feed_validators_reads_a_projection(feed_ref):
+    assert feeds.get_feed_validators("u1") is None
+    built = feeds.build_feed("u1", CHANNEL, [_item("a", 0)])
+
+    validators = feeds.get_feed_validators("u1")
+
+    assert feed_ref.last_field_paths == feeds.VALIDATOR_FIELDS
+    assert validators["etag"] == built["etag"]
+    assert "xml" not in validators and "items" not in validators
+
+
+@patch("app.routes.feeds.get_feed")
+@patch("app.routes.feeds.get_feed_validators")
+def test_feed_conditional_get_returns_304_without_full_read(
+    mock_validators, mock_get_feed, client
+):
+    modified = datetime(2025, 9, 1, tzinfo=timezone.utc)
+    mock_validators.return_value = {"etag": "2-1-100", "last_modified": modified}
+
+    response = client.get(
+        "/u/test_user_id/feed.xml", headers={"If-None-Match": '"2-1-100"'}
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"2-1-100"'
+    assert response.data == b""
+    mock_get_feed.assert_not_called()
+
+
+@patch("app.routes.feeds.get_feed")
+@patch("app.routes.feeds.get_feed_validators")
+def test_feed_changed_etag_serves_full_body(mock_validators, mock_get_feed, client):
+    mock_validators.return_value = {"etag": "2-2-200", "last_modified": None}
+    mock_get_feed.return_value = {
+        "etag": "2-2-200",
+        "last_modified": None,
+        "xml": "<rss/>",
+    }
+
+    response = client.get(
+        "/u/test_user_id/feed.xml", headers={"If-None-Match": '"2-1-100"'}
+    )
+
+    assert response.status_code == 200
+    assert response.data == b"<rss/>"
+    assert response.headers["ETag"] == '"2-2-200"'
+
+
+def test_etag_changes_with_the_channel(feed_ref):
+    items = [_item("a", 1)]
+    first = feeds.build_feed("u1", CHANNEL, items)
+    rotated = {**CHANNEL, "archive_url": "http://example.com/f/u1/t2/__cursor__.xml"}
+
+    second = feeds.build_feed("u1", rotated, items)
+
+    assert second["etag"] != first["etag"]
+    assert second["last_modified"] == first["last_modified"]
+
+
+@patch("app.routes.rss.get_latest_items_for_user", return_value=[])
+@patch("app.routes.feeds.build_feed")
+@patch("app.routes.feeds.get_feed")
+@patch("app.routes.feeds.get_feed_validators")
+def test_stale_channel_is_rebuilt_instead_of_304(
+    mock_validators, mock_get_feed, mock_build, mock_items, client
+):
+    """A feed rendered with old archive links is never confirmed with a 304."""
+    stale = {
+        "etag": "6-1-100-old",
+        "last_modified": None,
+        "channel": {**CHANNEL, "archive_url": "http://old/__cursor__.xml"},
+        "xml": "<old/>",
+    }
+    mock_validators.return_value = stale
+    mock_get_feed.return_value = stale
+    mock_build.return_value = {"etag": "6-1-100-new", "xml": "<new/>"}
+
+    response = client.get(
+        "/u/test_user_id/feed.xml", headers={"If-None-Match": '"6-1-100-old"'}
+    )
+
+    assert response.status_code == 200
+    assert response.data == b"<new/>"
+    assert response.headers["ETag"] == '"6-1-100-new"'
+    mock_build.assert_called_once()
+
+
+@pytest.fixture
+def small_pages(monkeypatch):
+    monkeypatch.setattr(feeds, "ARCHIVE_PAGE_SIZE", 3)
+    monkeypatch.setattr(feeds, "FEED_ITEM_LIMIT", 2)
+
+
+def _token(record):
+    return feeds.pagination.cursor_for(record, feeds.ARCHIVE_FIELDS)
+
+
+def test_latest_feed_links_to_newest_full_archive_page(feed_ref, small_pages):
+    feed_ref.history = [_record(i) for i in range(8)]  # pages r0-2, r3-5, r6-7
+
+    feed = feeds.build_feed("u1", CHANNEL, [])
+
+    assert feed["archive"] == {
+        "head": _token(feed_ref.history[2]),
+        "next": _token(feed_ref.history[5]),
+        "tail": 2,
+    }
+    href = feeds.archive_url(CHANNEL, feed["archive"]["head"])
+    assert f'<atom:link href="{href}" rel="prev-archive"' in feed["xml"]
+
+
+def test_archive_pages_chain_back_to_the_first(feed_ref, small_pages):
+    feed_ref.history = [_record(i) for i in range(8)]
+
+    newest_full = feeds.get_archive_page("u1", _token(feed_ref.history[2]))
+    first = feeds.get_archive_page("u1", feeds.FIRST_ARCHIVE)
+
+    assert [i["guid"] for i in newest_full["items"]] == ["r5", "r4", "r3"]
+    assert newest_full["prev"] == feeds.FIRST_ARCHIVE
+    assert [i["guid"] for i in first["items"]] == ["r2", "r1", "r0"]
+    assert first["prev"] is None
+    # The page still being filled is not an archive yet
+    assert feeds.get_archive_page("u1", _token(feed_ref.history[5])) is None
+    with pytest.raises(feeds.pagination.InvalidCursor):
+        feeds.get_archive_page("u1", "not-a-cursor")
+
+
+def test_new_items_close_archive_pages_incrementally(feed_ref, small_pages):
+    feed_ref.history = [_record(i) for i in range(5)]
+    feeds.build_feed("u1", CHANNEL, [])  # r0-2 full, r3-4 filling
+
+    record = _record(5)
+    feed_ref.history.append(record)
+    feeds.add_feed_item("u1", record)
+
+    archive = feeds.get_feed("u1")["archive"]
+    assert archive == {
+        "head": _token(feed_ref.history[2]),
+        "next": _token(record),
+        "tail": 0,
+    }
+    assert archive == feeds._scan_archive("u1")
+
+
+def _reachable_guids(feed):
+    """Every guid a reader finds from the latest feed and its archive chain."""
+    guids = [i["guid"] for i in feed["items"]]
+    token = feed["archive"]["head"]
+    while token:
+        page = feeds.get_archive_page("u1", token)
+        guids += [i["guid"] for i in page["items"]]
+        token = page["prev"]
+    return set(guids)
+
+
+@pytest.mark.parametrize("count", [80, 180])
+def test_every_item_is_reachable_from_the_latest_feed(feed_ref, count):
+    """Items past FEED_ITEM_LIMIT in the page being filled stay in the feed."""
+    feed_ref.history = [_record(i) for i in range(count)]
+    newest = sorted(feed_ref.history, key=lambda r: r["pub_date"], reverse=True)
+
+    feed = feeds.build_feed("u1", CHANNEL, newest[: feeds.FEED_ITEM_LIMIT])
+
+    assert _reachable_guids(feed) == {r["guid"] for r in feed_ref.history}
+    assert len(feed["items"]) == max(feeds.FEED_ITEM_LIMIT, count % 100)
+
+
+def test_every_item_stays_reachable_as_items_arrive(feed_ref):
+    feed_ref.history = [_record(i) for i in range(40)]
+    feeds.build_feed("u1", CHANNEL, [])
+
+    for i in range(40, 180):
+        record = _record(i)
+        feed_ref.history.append(record)
+        feeds.add_feed_item("u1", record)
+
+    feed = feeds.get_feed("u1")
+    assert _reachable_guids(feed) == {r["guid"] for r in feed_ref.history}
+    assert feed["archive"] == feeds._scan_archive("u1")
+
+
+@patch("app.routes.feeds.get_archive_page")
+def test_archive_route_is_immutable_and_marked(mock_page, client):
+    mock_page.return_value = {"items": [_item("a", 1)], "prev": feeds.FIRST_ARCHIVE}
+
+    response = client.get("/u/test_user_id/feed/archive/abc.xml")
+
+    assert response.status_code == 200
+    assert "immutable" in response.headers["Cache-Control"]
+    body = response.data.decode()
+    assert "<fh:archive />" in body
+    assert 'rel="current"' in body and 'rel="prev-archive"' in body
+
+    mock_page.return_value = None
+    assert client.get("/u/test_user_id/feed/archive/abc.xml").status_code == 404
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def generations(monkeypatch):
+    """users/{uid} token generations, as stored in Firestore."""
+    stored = {}
+
+    def bump(uid):
+        return SimpleNamespace(
+            set=lambda doc, merge: stored.update({uid: stored.get(uid, 0) + 1})
+        )
+
+    clock = FakeClock()
+    monkeypatch.setattr(feed_tokens, "_user_ref", bump)
+    monkeypatch.setattr(feed_tokens, "_load_generation", lambda uid: stored.get(uid, 0))
+    monkeypatch.setattr(
+        feed_tokens, "_generations", feed_tokens.GenerationCache(clock=clock)
+    )
+    return SimpleNamespace(stored=stored, clock=clock)
+
+
+@pytest.fixture
+def feed_secrets(app, monkeypatch, generations):
+    monkeypatch.setitem(app.config, "FEED_TOKEN_SECRETS", ["new-secret", "old-secret"])
+    return app.config
+
+
+def test_feed_tokens_verify_with_any_configured_secret(feed_secrets):
+    token = feed_tokens.feed_token(feed_secrets, "u1")
+
+    assert feed_tokens.verify_feed_token(feed_secrets, "u1", token)
+    assert not feed_tokens.verify_feed_token(feed_secrets, "u2", token)
+    old = feed_tokens.feed_token({"FEED_TOKEN_SECRETS": ["old-secret"]}, "u1")
+    assert feed_tokens.verify_feed_token(feed_secrets, "u1", old)
+    assert feed_tokens.feed_token({"FEED_TOKEN_SECRETS": []}, "u1") is None
+
+
+@patch("app.routes.feeds.get_feed")
+def test_signed_feed_is_public_and_needs_no_login(mock_get_feed, app, feed_secrets):
+    mock_get_feed.return_value = {
+        "etag": "4-0-0",
+        "last_modified": None,
+        "xml": "<rss/>",
+    }
+    token = feed_tokens.feed_token(feed_secrets, "someone")
+    client = app.test_client()
+
+    response = client.get(f"/f/someone/{token}/feed.xml")
+
+    assert response.status_code == 200
+    assert response.data == b"<rss/>"
+    assert response.headers["Cache-Control"] == "public, max-age=300"
+    mock_get_feed.assert_called_once_with("someone")
+    assert client.get(f"/f/someone/{token[:-1]}x/feed.xml").status_code == 404
+    assert client.get(f"/f/other/{token}/feed.xml").status_code == 404
+
+
+@patch("app.routes.feeds.get_archive_page")
+def test_signed_archive_links_stay_signed(mock_page, app, feed_secrets):
+    mock_page.return_value = {"items": [_item("a", 1)], "prev": feeds.FIRST_ARCHIVE}
+    token = feed_tokens.feed_token(feed_secrets, "someone")
+
+    response = app.test_client().get(f"/f/someone/{token}/archive/abc.xml")
+
+    assert response.status_code == 200
+    body = response.data.decode()
+    assert f"/f/someone/{token}/feed.xml" in body
+    assert f"/f/someone/{token}/archive/first.xml" in body
+
+
+def test_rotating_revokes_only_that_users_feed_urls(app, feed_secrets):
+    old = feed_tokens.user_feed_token(feed_secrets, "test_user_id")
+    other = feed_tokens.user_feed_token(feed_secrets, "someone")
+
+    response = app.test_client().post("/feed/rotate")
+
+    assert response.status_code == 200
+    new = feed_tokens.user_feed_token(feed_secrets, "test_user_id")
+    assert new != old
+    assert f"/f/test_user_id/{new}/feed.xml" in response.json["feed_url"]
+    assert feed_tokens.verify_user_feed_token(feed_secrets, "test_user_id", new)
+    assert not feed_tokens.verify_user_feed_token(feed_secrets, "test_user_id", old)
+    assert feed_tokens.verify_user_feed_token(feed_secrets, "someone", other)
+
+
+def test_rotation_by_another_process_is_picked_up(feed_secrets, generations):
+    old = feed_tokens.user_feed_token(feed_secrets, "u1")
+    generations.stored["u1"] = 1  # rotated elsewhere
+    new = feed_tokens.feed_token(feed_secrets, "u1", 1)
+
+    # The cached generation still serves the old URL; the new one waits for
+    # the recheck interval.
+    assert feed_tokens.verify_user_feed_token(feed_secrets, "u1", old)
+    assert not feed_tokens.verify_user_feed_token(feed_secrets, "u1", new)
+    generations.clock.now += feed_tokens.GENERATION_RECHECK_SECONDS
+    assert feed_tokens.verify_user_feed_token(feed_secrets, "u1", new)
+    assert not feed_tokens.verify_user_feed_token(feed_secrets, "u1", old)
@@ -0,0 +1,122 @@
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpcore
+import pytest
+
+from app.extract import http_client
+
+
+def _addrinfo(*ips):
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (ip, 443)) for ip in ips]
+
+
+def test_shared_client_is_reused():
+    """Every caller gets the same pooled client."""
+    assert http_client.get_http_client() is http_client.get_http_client()
+
+
+def test_dns_cache_expires_entries():
+    cache = http_client._DNSCache(ttl=60)
+    cache.put("example.com", 443, _addrinfo("93.184.216.34", "93.184.216.34"))
+    assert cache.get("example.com", 443) == ["93.184.216.34"]
+
+    with patch("app.extract.http_client.time.monotonic", return_value=1e12):
+        assert cache.get("example.com", 443) is None
+
+
+@patch("app.extract.http_client.socket.getaddrinfo")
+@patch("httpcore.SyncBackend.connect_tcp")
+def test_sync_backend_resolves_once_and_fails_over(mock_connect, mock_getaddrinfo):
+    """Lookups are cached, and a dead address falls through to the next one."""
+    mock_getaddrinfo.return_value = _addrinfo("192.0.2.1", "192.0.2.2")
+
+    def connect(host, *args):
+        if host == "192.0.2.1":
+            raise httpcore.ConnectError("down")
+        return host
+
+    mock_connect.side_effect = connect
+    http_client._dns_cache.forget("cached.example", 443)
+    backend = http_client._CachingSyncBackend()
+
+    assert backend.connect_tcp("cached.example", 443) == "192.0.2.2"
+    assert backend.connect_tcp("cached.example", 443) == "192.0.2.2"
+    mock_getaddrinfo.assert_called_once()
+
+
+@patch("app.extract.http_client.socket.getaddrinfo")
+def test_sync_backend_maps_resolution_failure(mock_getaddrinfo):
+    mock_getaddrinfo.side_effect = socket.gaierror("no such host")
+    http_client._dns_cache.forget("missing.example", 443)
+
+    with pytest.raises(httpcore.ConnectError):
+        http_client._CachingSyncBackend().connect_tcp("missing.example", 443)
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_go_through_the_caching_backend(local_server):
+    """Guards the backend swap against httpx/httpcore internals moving."""
+    resolve = socket.getaddrinfo
+    lookups = []
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        lookups.append(host)
+        return resolve("127.0.0.1" if host == "backend.test" else host, port)
+
+    http_client._dns_cache.forget("backend.test", local_server)
+    client = http_client._build_client()
+
+    with patch("app.extract.http_client.socket.getaddrinfo", getaddrinfo):
+        response = client.get(f"http://backend.test:{local_server}/")
+
+    assert response.text == "ok"
+    assert http_client._dns_cache.get("backend.test", local_server) == ["127.0.0.1"]
+    assert lookups.count("backend.test") == 1
+    client.close()
+
+
+def test_async_client_is_closed_with_its_loop(local_server):
+    async def main():
+        response = await http_client.afetch(f"http://127.0.0.1:{local_server}/")
+        return response.text, http_client.get_async_http_client()
+
+    text, client = asyncio.run(main())
+
+    assert text == "ok"
+    assert client.is_closed
+    assert not http_client._async_states
+
+
+def test_host_slots_forget_idle_hosts_only():
+    slots = http_client._HostSlots(threading.BoundedSemaphore, max_hosts=2)
+    busy = slots.checkout("busy.example")
+    for host in ("a.example", "b.example", "c.example"):
+        slots.checkout(host)
+        slots.checkin(host)
+
+    assert len(slots) == 2
+    assert slots.checkout("busy.example") is busy  # in flight, never evicted
@@ -0,0 +1,147 @@
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+
+from app.services import id_tokens
+from app.services.id_tokens import CertStore
+
+PROJECT = "storyspool-test"
+
+
+def _signing_key(kid: str):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "test")])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    pem_key = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    signer = crypt.RSASigner.from_string(pem_key, key_id=kid)
+    return signer, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+def _token(signer, **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": id_tokens.ID_TOKEN_ISSUER_PREFIX + PROJECT,
+        "aud": PROJECT,
+        "sub": "user-1",
+        "iat": now,
+        "exp": now + 3600,
+        **overrides,
+    }
+    return jwt.encode(signer, claims).decode()
+
+
+class FakeCertEndpoint:
+    def __init__(self, certs):
+        self.certs = certs
+        self.calls = 0
+        self.down = False
+
+    def __call__(self, url):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("cert endpoint unavailable")
+        return dict(self.certs), 3600
+
+
+@pytest.fixture
+def signer_and_endpoint(monkeypatch):
+    monkeypatch.delenv("FIREBASE_AUTH_EMULATOR_HOST", raising=False)
+    signer, cert = _signing_key("key-1")
+    endpoint = FakeCertEndpoint({"key-1": cert})
+    store = CertStore(fetch=endpoint)
+    with patch.object(id_tokens._holder, "get", return_value=store):
+        yield signer, endpoint, store
+
+
+def test_verifies_locally_after_first_fetch(signer_and_endpoint):
+    signer, endpoint, store = signer_and_endpoint
+
+    for _ in range(3):
+        claims = id_tokens.verify_id_token(_token(signer), PROJECT)
+        assert claims["uid"] == "user-1"
+    assert endpoint.calls == 1
+    assert store.stats()["keys"] == 1
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"aud": "other-project"},
+        {"iss": "https://securetoken.google.com/other-project"},
+        {"sub": ""},
+        {"exp": int(time.time()) - 600},
+    ],
+)
+def test_rejects_invalid_claims(signer_and_endpoint, overrides):
+    signer, _, _ = signer_and_endpoint
+
+    with pytest.raises(ValueError):
+        id_tokens.verify_id_token(_token(signer, **overrides), PROJECT)
+
+
+def test_keeps_serving_certs_through_endpoint_outage(signer_and_endpoint):
+    signer, endpoint, store = signer_and_endpoint
+    id_tokens.verify_id_token(_token(signer), PROJECT)
+
+    endpoint.down = True
+    assert store.refresh() is False
+    claims = id_tokens.verify_id_token(_token(signer), PROJECT)
+
+    assert claims["uid"] == "user-1"
+    stats = store.stats()
+    assert stats["refresh_errors"] == 1
+    assert "cert endpoint unavailable" in stats["last_error"]
+
+
+def test_unknown_kid_triggers_refresh(signer_and_endpoint):
+    signer, endpoint, store = signer_and_endpoint
+    id_tokens.verify_id_token(_token(signer), PROJECT)
+
+    rotated, cert = _signing_key("key-2")
+    endpoint.certs["key-2"] = cert
+    claims = id_tokens.verify_id_token(_token(rotated), PROJECT)
+
+    assert claims["uid"] == "user-1"
+    assert endpoint.calls == 2
+    assert store.stats()["unknown_kid"] == 1
+
+
+@patch("app.services.id_tokens.auth.verify_id_token")
+def test_emulator_falls_back_to_firebase_admin(mock_verify, monkeypatch):
+    monkeypatch.setenv("FIREBASE_AUTH_EMULATOR_HOST", "localhost:9099")
+    mock_verify.return_value = {"uid": "emulated"}
+
+    assert id_tokens.verify_id_token("unsigned", PROJECT)["uid"] == "emulated"
+
+
+def test_unknown_kid_refresh_is_rate_limited(signer_and_endpoint):
+    signer, endpoint, _ = signer_and_endpoint
+    id_tokens.verify_id_token(_token(signer), PROJECT)
+    forged, _ = _signing_key("forged")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            id_tokens.verify_id_token(_token(forged), PROJECT)
+
+    assert endpoint.calls == 2
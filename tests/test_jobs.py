@@ -1,9 +1,17 @@
+import threading
 from unittest.mock import MagicMock
 
 import pytest
 from flask import Flask
+from google.api_core import exceptions as google_exceptions
 
-from app.services.jobs import create_job
+from app.services.jobs import (
+    ClaimOutcome,
+    JobStateAccumulator,
+    JobStatus,
+    claim_job,
+    create_job,
+)
 
 
 @pytest.fixture
@@ -30,7 +38,7 @@ def test_create_job_new(mock_db):
         assert job["status"] == "queued"
         assert job["url"] == url
         assert job["user_id"] == uid
-        mock_db.collection.return_value.document.return_value.set.assert_called_once()
+        mock_db.collection.return_value.document.return_value.create.assert_called_once()
 
 
 def test_create_job_existing(mock_db):
@@ -41,6 +49,8 @@ def test_create_job_existing(mock_db):
     url = "http://example.com/existing-job"
     uid = "user456"
     existing_doc = {"id": "some_hash", "status": "done"}
+    ref = mock_db.collection.return_value.document.return_value
+    ref.create.side_effect = google_exceptions.Conflict("exists")
     mock_db.collection.return_value.document.return_value.get.return_value.exists = True
     mock_db.collection.return_value.document.return_value.get.return_value.to_dict.return_value = (
         existing_doc
@@ -53,3 +63,118 @@ def test_create_job_existing(mock_db):
         # Assert
         assert job == existing_doc
         mock_db.collection.return_value.document.return_value.set.assert_not_called()
+
+
+def test_state_accumulator_writes_terminal_state_with_pending_fields():
+    write = MagicMock()
+    state = JobStateAccumulator(Flask(__name__), "j1", debounce_seconds=60, write=write)
+
+    state.transition(JobStatus.FETCHING)
+    state.transition(JobStatus.PARSING, title="T")
+    state.transition(JobStatus.TTS_GENERATING)
+    write.assert_not_called()
+    assert state.status == JobStatus.TTS_GENERATING
+
+    state.transition(JobStatus.DONE, audio_url="a.mp3")
+
+    write.assert_called_once_with(
+        "j1", status=JobStatus.DONE, title="T", audio_url="a.mp3"
+    )
+    assert state.writes == 1
+
+
+def test_state_accumulator_writes_lasting_intermediate_state():
+    written = threading.Event()
+    write = MagicMock(side_effect=lambda *a, **kw: written.set())
+    state = JobStateAccumulator(
+        Flask(__name__), "j1", debounce_seconds=0.01, write=write
+    )
+
+    state.transition(JobStatus.TTS_GENERATING)
+
+    assert written.wait(2)
+    write.assert_called_once_with("j1", status=JobStatus.TTS_GENERATING)
+    state.flush()  # nothing left pending
+    assert write.call_count == 1
+
+
+def test_state_accumulator_keeps_stage_when_terminal_write_fails():
+    write = MagicMock(side_effect=RuntimeError("unavailable"))
+    state = JobStateAccumulator(Flask(__name__), "j1", debounce_seconds=60, write=write)
+    state.transition(JobStatus.UPLOADING_AUDIO)
+
+    with pytest.raises(RuntimeError):
+        state.transition(JobStatus.DONE)
+
+    assert state.status == JobStatus.UPLOADING_AUDIO
+
+
+def _job_snapshot(mock_db, job):
+    snap = mock_db.collection.return_value.document.return_value.get.return_value
+    snap.exists = True
+    snap.to_dict.return_value = job
+    snap.update_time = "t1"
+    return mock_db.collection.return_value.document.return_value
+
+
+def test_claim_job_takes_a_lease_under_a_precondition(mock_db):
+    app = Flask(__name__)
+    app.config["FIRESTORE_DB"] = mock_db
+    ref = _job_snapshot(mock_db, {"id": "j1", "status": JobStatus.QUEUED})
+
+    with app.app_context():
+        outcome, job = claim_job("j1", "w1", lease_seconds=60)
+
+    assert outcome == ClaimOutcome.CLAIMED
+    assert job["lease"]["owner"] == "w1"
+    written = ref.update.call_args
+    assert written.args[0]["lease"] == job["lease"]
+    mock_db.write_option.assert_called_once_with(last_update_time="t1")
+
+
+def test_claim_job_respects_another_workers_live_lease(mock_db):
+    app = Flask(__name__)
+    app.config["FIRESTORE_DB"] = mock_db
+    lease = {"owner": "w1", "expires_at": "9999-01-01T00:00:00+00:00"}
+    ref = _job_snapshot(
+        mock_db, {"id": "j1", "status": JobStatus.TTS_GENERATING, "lease": lease}
+    )
+
+    with app.app_context():
+        assert claim_job("j1", "w2")[0] == ClaimOutcome.IN_FLIGHT
+        ref.update.assert_not_called()
+
+        # An expired lease is taken over
+        lease["expires_at"] = "2000-01-01T00:00:00+00:00"
+        assert claim_job("j1", "w2")[0] == ClaimOutcome.CLAIMED
+
+
+def test_claim_job_loser_of_a_race_sees_job_in_flight(mock_db):
+    app = Flask(__name__)
+    app.config["FIRESTORE_DB"] = mock_db
+    snap = mock_db.collection.return_value.document.return_value.get.return_value
+    ref = _job_snapshot(mock_db, {"id": "j1", "status": JobStatus.QUEUED})
+    winner = {
+        "id": "j1",
+        "status": JobStatus.QUEUED,
+        "lease": {"owner": "w1", "expires_at": "9999-01-01T00:00:00+00:00"},
+    }
+    snap.to_dict.side_effect = [{"id": "j1", "status": JobStatus.QUEUED}, winner]
+    ref.update.side_effect = google_exceptions.FailedPrecondition("stale")
+
+    with app.app_context():
+        outcome, job = claim_job("j1", "w2")
+
+    assert outcome == ClaimOutcome.IN_FLIGHT
+    assert job == winner
+    assert ref.update.call_count == 1
+
+
+def test_claim_job_reports_done_and_missing_jobs(mock_db):
+    app = Flask(__name__)
+    app.config["FIRESTORE_DB"] = mock_db
+
+    with app.app_context():
+        assert claim_job("j1", "w1") == (ClaimOutcome.NOT_FOUND, None)
+        _job_snapshot(mock_db, {"id": "j1", "status": JobStatus.DONE})
+        assert claim_job("j1", "w1")[0] == ClaimOutcome.DONE
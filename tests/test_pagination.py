@@ -0,0 +1,45 @@
+import pytest
+
+from app.services.pagination import (
+    InvalidCursor,
+    cursor_for,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+
+
+def test_cursor_round_trip_is_url_safe():
+    values = {"created_at": "2025-09-01T10:00:00.123456+00:00"}
+    token = encode_cursor(values)
+
+    assert "=" not in token and "/" not in token and "+" not in token
+    assert decode_cursor(token) == values
+    assert cursor_for({**values, "title": "x"}, ["created_at"]) == token
+
+
+@pytest.mark.parametrize("token", ["%%%", "bm90IGpzb24", encode_cursor([1])])
+def test_malformed_cursors_are_rejected(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token)
+
+
+def test_paginate_fetches_one_extra_to_find_next_page():
+    docs = [{"created_at": i} for i in range(3)]
+    calls = []
+
+    def fetch(limit, start_after):
+        calls.append((limit, start_after))
+        return docs[:limit]
+
+    page = paginate(fetch, 2, None, ["created_at"])
+    assert page == {
+        "items": docs[:2],
+        "next_cursor": cursor_for(docs[1], ["created_at"]),
+    }
+    assert calls == [(3, None)]
+
+    assert (
+        paginate(fetch, 3, page["next_cursor"], ["created_at"])["next_cursor"] is None
+    )
+    assert calls[-1] == (4, {"created_at": 1})
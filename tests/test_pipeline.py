@@ -0,0 +1,87 @@
+import asyncio
+import hashlib
+from unittest.mock import patch
+
+from app.extract import extract_many, extract_pipeline
+from app.extract.errors import NetworkError
+
+ARTICLE_HTML = (
+    "<html><head><title>Pipeline Title</title></head><body><article>"
+    + "".join(
+        f"<p>Paragraph {i} of the article explains the transit plan in detail "
+        "so that there is enough readable text for extraction.</p>"
+        for i in range(10)
+    )
+    + "</article></body></html>"
+).encode("utf-8")
+
+HTML_META = {"status_code": 200, "headers": {}, "content_type": "text/html"}
+
+
+def _fake_fetch(content=ARTICLE_HTML, metadata=HTML_META):
+    async def fetch(url, timeout=15):
+        return content, metadata
+
+    return fetch
+
+
+@patch("app.extract.pipeline.fetch_content", new=_fake_fetch())
+def test_extract_pipeline_html():
+    doc = asyncio.run(extract_pipeline("https://example.com/story/?utm_source=x"))
+
+    assert doc.status == "success"
+    assert doc.url_canonical == "https://example.com/story"
+    assert doc.id == hashlib.sha256(b"https://example.com/story").hexdigest()
+    assert doc.parser_name == "trafilatura"
+    assert doc.title == "Pipeline Title"
+    assert "transit plan" in doc.text
+    assert doc.text_excerpt.startswith("Paragraph 0")
+
+
+@patch("app.extract.pipeline.extract_text_from_pdf", return_value="PDF body text")
+@patch(
+    "app.extract.pipeline.fetch_content",
+    new=_fake_fetch(b"%PDF-1.4", {"content_type": "application/pdf"}),
+)
+def test_extract_pipeline_dispatches_pdf(mock_pdf):
+    doc = asyncio.run(extract_pipeline("https://example.com/paper.pdf"))
+
+    assert doc.status == "success"
+    assert doc.parser_name == "pypdf2"
+    assert doc.text == "PDF body text"
+    mock_pdf.assert_called_once_with(b"%PDF-1.4")
+
+
+def test_extract_pipeline_reports_fetch_errors():
+    async def failing_fetch(url, timeout=15):
+        raise NetworkError("boom", error_code="NETWORK_TIMEOUT")
+
+    with patch("app.extract.pipeline.fetch_content", new=failing_fetch):
+        doc = asyncio.run(extract_pipeline("https://example.com/a"))
+
+    assert doc.status == "fetch_error"
+    assert doc.error_code == "NETWORK_TIMEOUT"
+
+
+def test_extract_many_bounds_in_flight_and_keeps_order():
+    in_flight = 0
+    peak = 0
+
+    async def slow_fetch(url, timeout=15):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if url.endswith("/3"):
+            raise NetworkError("down", error_code="CONNECTION_ERROR")
+        return ARTICLE_HTML, HTML_META
+
+    urls = [f"https://example.com/{i}" for i in range(8)]
+    with patch("app.extract.pipeline.fetch_content", new=slow_fetch):
+        docs = asyncio.run(extract_many(urls, max_in_flight=3))
+
+    assert peak == 3
+    assert [d.url_canonical for d in docs] == urls
+    assert [d.status for d in docs].count("success") == 7
+    assert docs[3].error_code == "CONNECTION_ERROR"
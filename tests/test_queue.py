@@ -0,0 +1,90 @@
+import threading
+from unittest.mock import patch
+
+from app.services.queue import BoundedJobExecutor, QueueFullError
+
+
+def test_bounded_executor_rejects_when_backlog_full():
+    """Jobs beyond max_workers + max_pending are rejected, not queued."""
+    executor = BoundedJobExecutor(max_workers=1, max_pending=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_job():
+        started.set()
+        release.wait(timeout=5)
+
+    try:
+        assert executor.try_submit(blocking_job) is True
+        started.wait(timeout=5)
+        assert executor.try_submit(blocking_job) is True  # waits in the backlog
+        assert executor.try_submit(blocking_job) is False
+
+        stats = executor.stats()
+        assert stats["active"] == 1
+        assert stats["pending"] == 1
+        assert stats["rejected"] == 1
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+
+    stats = executor.stats()
+    assert stats["completed"] == 2
+    assert stats["active"] == 0
+    assert stats["pending"] == 0
+
+
+def test_bounded_executor_frees_slot_after_failure():
+    """A job that raises still returns its slot to the pool."""
+    executor = BoundedJobExecutor(max_workers=1, max_pending=0)
+
+    def failing_job():
+        raise ValueError("boom")
+
+    try:
+        assert executor.try_submit(failing_job) is True
+    finally:
+        executor.shutdown(wait=True)
+    assert executor._slots.acquire(blocking=False)
+
+
+@patch("app.routes.validate_external_url", return_value=(True, None))
+@patch("app.routes.update_job")
+@patch("app.routes.create_job")
+@patch("app.routes.enqueue_worker")
+def test_create_job_returns_429_when_queue_full(
+    mock_enqueue, mock_create_job, mock_update_job, mock_validate, client
+):
+    """POST /jobs sheds load with 429 and Retry-After when the pool is full."""
+    mock_create_job.return_value = {"id": "abc123", "status": "queued"}
+    mock_enqueue.side_effect = QueueFullError(retry_after=17)
+
+    response = client.post("/jobs", json={"url": "https://example.com/a"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "17"
+    assert "error" in response.get_json()
+    # The job is not left queued with nothing to run it
+    assert mock_update_job.call_args.args == ("abc123",)
+    assert mock_update_job.call_args.kwargs["status"] == "failed_queue"
+
+
+@patch("app.routes.validate_external_url", return_value=(True, None))
+@patch("app.routes.create_job")
+@patch("app.routes.enqueue_worker")
+def test_create_job_does_not_enqueue_done_or_leased_jobs(
+    mock_enqueue, mock_create_job, mock_validate, client
+):
+    """A resubmitted URL takes no worker slot if nothing needs to run."""
+    lease = {"owner": "w1", "expires_at": "9999-01-01T00:00:00+00:00"}
+    for existing in (
+        {"id": "abc123", "status": "done"},
+        {"id": "abc123", "status": "tts_generating", "lease": lease},
+    ):
+        mock_create_job.return_value = existing
+
+        response = client.post("/jobs", json={"url": "https://example.com/a"})
+
+        assert response.status_code == 200
+        assert response.get_json()["status"] == existing["status"]
+    mock_enqueue.assert_not_called()
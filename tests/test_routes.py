@@ -3,6 +3,8 @@ from unittest.mock import MagicMock, patch
 import pytest
 from flask import url_for
 
+from app.services.jobs import JOB_LIST_FIELDS
+
 
 @pytest.fixture
 def client(app):
@@ -62,3 +64,77 @@ def test_article_list_anonymous(mock_current_user_id, client):
     response = client.get("/articles")
     # The require_login decorator should redirect to the home page
     assert response.status_code == 401
+
+
+def _fake_jobs(n):
+    jobs = [
+        {
+            "id": f"j{i}",
+            "status": "done",
+            "url": f"http://example.com/{i}",
+            "created_at": f"2025-09-01T10:{i:02d}:00",
+        }
+        for i in range(n)
+    ]
+    jobs.reverse()  # newest first
+
+    def list_jobs(uid, limit=50, start_after=None, fields=None):
+        rows = jobs
+        if start_after:
+            rows = [j for j in rows if j["created_at"] < start_after["created_at"]]
+        return rows[:limit]
+
+    return list_jobs
+
+
+@patch("app.routes.list_user_jobs")
+def test_api_jobs_pages_with_cursor(mock_list_user_jobs, client):
+    mock_list_user_jobs.side_effect = _fake_jobs(5)
+
+    first = client.get("/api/jobs?limit=2").get_json()
+    assert [j["id"] for j in first["items"]] == ["j4", "j3"]
+    assert mock_list_user_jobs.call_args.kwargs["limit"] == 3  # one extra
+
+    seen = [j["id"] for j in first["items"]]
+    cursor = first["next_cursor"]
+    while cursor:
+        page = client.get(f"/api/jobs?limit=2&cursor={cursor}").get_json()
+        seen += [j["id"] for j in page["items"]]
+        cursor = page["next_cursor"]
+    assert seen == ["j4", "j3", "j2", "j1", "j0"]
+
+
+@patch("app.routes.list_user_articles")
+def test_api_articles_projects_requested_fields(mock_list_user_articles, client):
+    mock_list_user_articles.return_value = []
+
+    response = client.get("/api/articles?fields=title,audio_url&limit=500")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"items": [], "next_cursor": None}
+    kwargs = mock_list_user_articles.call_args.kwargs
+    assert kwargs["fields"] == ["id", "title", "created_at", "audio_url"]
+    assert kwargs["limit"] == client.application.config["API_MAX_PAGE_SIZE"] + 1
+
+
+@patch("app.routes.list_user_jobs")
+def test_api_jobs_rejects_bad_cursor_and_fields(mock_list_user_jobs, client):
+    assert client.get("/api/jobs?cursor=%25%25").status_code == 400
+    assert client.get("/api/jobs?fields=title,secret").status_code == 400
+    mock_list_user_jobs.assert_not_called()
+
+
+@patch("app.routes.list_user_jobs")
+def test_article_list_embeds_first_page(mock_list_user_jobs, client):
+    mock_list_user_jobs.side_effect = _fake_jobs(25)
+
+    response = client.get("/articles")
+
+    assert response.status_code == 200
+    kwargs = mock_list_user_jobs.call_args.kwargs
+    assert kwargs["fields"] == JOB_LIST_FIELDS
+    assert kwargs["limit"] == client.application.config["API_PAGE_SIZE"] + 1
+    body = response.data.decode()
+    assert body.count('<tr id="job-j') == client.application.config["API_PAGE_SIZE"]
+    assert "const initialJobs = [" in body
+    assert 'let nextCursor = "' in body
@@ -77,3 +77,30 @@ def test_item_from_article(sample_items):
     assert enclosure.get("type") == "audio/mpeg"
     assert enclosure.get("length") == str(item_meta["enclosure_length"])
     assert item_el.findtext("{" + ITUNES_NS + "}duration") == str(item_meta["duration"])
+
+
+def test_iter_feed_matches_whole_tree_serialization(sample_channel, sample_items):
+    """Streamed chunks join to exactly what ElementTree writes for the full tree."""
+    items = sample_items + [
+        {**sample_items[0], "guid": "g2", "title": "Ünïcode & <tags>", "summary": ""}
+    ]
+    built = datetime(2025, 8, 29, tzinfo=timezone.utc)
+    root = rss._channel_element(sample_channel, built)
+    for meta in items:
+        root.find("channel").append(rss.item_from_article(meta))
+    expected = ET.tostring(root, encoding="utf-8", xml_declaration=True).decode()
+
+    chunks = list(rss.iter_feed("test-user", sample_channel, items, built))
+
+    assert len(chunks) == len(items) + 2  # header, one per item, closing tags
+    assert "".join(chunks) == expected
+
+
+def test_item_fragments_are_cached(sample_items):
+    rss._cached_item_fragment.cache_clear()
+    first = rss.item_fragment(sample_items[0])
+    second = rss.item_fragment(dict(sample_items[0]))
+
+    assert first == second
+    assert first.startswith("<item><title>")
+    assert rss._cached_item_fragment.cache_info().hits == 1
@@ -7,6 +7,7 @@ from flask import Flask
 from app.services.store import (
     _articles_col,
     list_user_articles,
+    open_audio_upload,
     save_article_record,
     upload_audio_and_get_url,
 )
@@ -142,3 +143,44 @@ def test_upload_audio_and_get_url(mock_gcs):
         mock_bucket.blob.assert_called_once()
         mock_blob.upload_from_filename.assert_called_once_with(str(local_path))
         mock_blob.make_public.assert_called_once()
+
+
+@patch("app.services.store.gcs")
+def test_open_audio_upload_streams_and_publishes(mock_gcs):
+    """Writes go to a resumable blob writer; success finalizes and publishes."""
+    app = Flask(__name__)
+    app.config["GCS_BUCKET"] = "test-bucket"
+    mock_blob = mock_gcs.bucket.return_value.blob.return_value
+    mock_blob.public_url = "http://gcs.com/public/audio.mp3"
+    writer = mock_blob.open.return_value
+
+    with app.app_context():
+        with open_audio_upload("test.mp3") as upload:
+            upload.write(b"abc")
+            upload.write(b"de")
+
+    mock_blob.open.assert_called_once_with(
+        "wb", chunk_size=1024 * 1024, ignore_flush=True, content_type="audio/mpeg"
+    )
+    assert writer.write.call_count == 2
+    writer.close.assert_called_once()
+    mock_blob.make_public.assert_called_once()
+    assert upload.bytes_written == 5
+    assert upload.public_url == "http://gcs.com/public/audio.mp3"
+
+
+@patch("app.services.store.gcs")
+def test_open_audio_upload_abandons_on_error(mock_gcs):
+    """A failure mid-stream never finalizes or publishes the object."""
+    app = Flask(__name__)
+    app.config["GCS_BUCKET"] = "test-bucket"
+    mock_blob = mock_gcs.bucket.return_value.blob.return_value
+
+    with app.app_context():
+        with pytest.raises(RuntimeError):
+            with open_audio_upload("test.mp3") as upload:
+                upload.write(b"abc")
+                raise RuntimeError("synthesis failed")
+
+    mock_blob.open.return_value.close.assert_not_called()
+    mock_blob.make_public.assert_not_called()
@@ -1,8 +1,11 @@
+import io
 import pathlib  # Import pathlib # noqa: F401
 from unittest.mock import MagicMock, patch
 
 import pytest
+from google.api_core import exceptions as google_exceptions
 
+from app.services import tts
 from app.services.tts import synthesize_article_to_mp3
 
 
@@ -11,8 +14,11 @@ def mock_app_context():
     """Fixture to provide a mock Flask app context for logging."""
     app = MagicMock()
     app.logger = MagicMock()
+    app.config = {"TTS_CACHE_ENABLED": False}
+    tts._client_holder.reset()
     with patch("app.services.tts.current_app", app):
         yield app
+    tts._client_holder.reset()
 
 
 @patch("app.services.tts.texttospeech.TextToSpeechClient")
@@ -20,7 +26,9 @@ def mock_app_context():
 @patch("app.services.tts.upload_audio_and_get_url")
 @patch("app.services.tts.tempfile.mkdtemp")
 @patch("app.services.tts.pathlib.Path")
+@patch("app.services.tts.shutil.rmtree")
 def test_synthesize_article_to_mp3_success(
+    mock_rmtree,
     mock_path,
     mock_mkdtemp,
     mock_upload,
@@ -28,8 +36,9 @@ def test_synthesize_article_to_mp3_success(
     mock_tts_client,
     mock_app_context,
 ):
-    """Test the successful synthesis of an article to MP3."""
+    """Test the successful synthesis of an article to MP3 via the pydub fallback."""
     # Arrange
+    mock_app_context.config["TTS_CONCAT_MODE"] = "pydub"
     meta = {"text": "This is a short text."}
     urlhash = "test_hash"
 
@@ -57,15 +66,135 @@ def test_synthesize_article_to_mp3_success(
     mock_upload.return_value = "http://gcs.com/audio.mp3"
 
     # Act
-    local_path, gcs_url = synthesize_article_to_mp3(meta, urlhash)
+    result = synthesize_article_to_mp3(meta, urlhash)
 
     # Assert
-    assert gcs_url == "http://gcs.com/audio.mp3"
+    assert result.audio_url == "http://gcs.com/audio.mp3"
     mock_tts_client.assert_called_once()
     mock_tts_instance.synthesize_speech.assert_called_once()
     mock_audio_segment.empty.assert_called_once()
     mock_audio_segment.from_mp3.assert_called_once()
     mock_upload.assert_called_once()
     mock_segment_instance.export.assert_called_once()
-    # Optional: sanity-check that a local path string was produced
-    assert str(local_path) == f"/tmp/tts123/{urlhash}.mp3"
+    # Size and duration come from the exported file and the decoded audio
+    assert result.size_bytes == path_file.stat.return_value.st_size
+    assert result.duration_seconds == len(mock_segment_instance) / 1000
+    mock_rmtree.assert_called_once_with("/tmp/tts123", ignore_errors=True)
+
+
+def test_synthesize_chunks_preserves_order_and_retries_per_chunk():
+    """Chunks come back in order, and only the failing chunk is re-synthesized."""
+    calls = []
+    failed_once = set()
+
+    def fake_synthesize(input, voice, audio_config):
+        calls.append(input.text)
+        if input.text == "two" and "two" not in failed_once:
+            failed_once.add("two")
+            raise google_exceptions.ServiceUnavailable("try again")
+        return MagicMock(audio_content=input.text.encode())
+
+    client = MagicMock()
+    client.synthesize_speech.side_effect = fake_synthesize
+
+    with patch.object(tts._synthesize_chunk.retry, "sleep", lambda _: None):
+        result = list(
+            tts._synthesize_chunks(
+                client,
+                ["one", "two", "three"],
+                voice=None,
+                audio_config=None,
+                max_concurrency=3,
+            )
+        )
+
+    assert result == [b"one", b"two", b"three"]
+    assert sorted(calls) == ["one", "three", "two", "two"]
+
+
+# MPEG-2 Layer III, 32 kbps, 24 kHz, mono: the format Cloud TTS returns for MP3.
+MP3_FRAME_HEADER = bytes([0xFF, 0xF3, 0x44, 0xC4])
+MP3_FRAME_LENGTH = 96  # 72 * 32000 / 24000
+MP3_FRAME_SAMPLES = 576
+
+
+def _mp3_frame(fill: int) -> bytes:
+    return MP3_FRAME_HEADER + bytes([fill]) * (MP3_FRAME_LENGTH - 4)
+
+
+def _mp3_chunk(*fills: int) -> bytes:
+    """Builds an MP3 file the way an encoder would: ID3v2, Xing frame, audio, ID3v1."""
+    id3v2 = b"ID3\x04\x00\x00" + bytes([0, 0, 0, 5]) + b"\x00" * 5
+    xing = MP3_FRAME_HEADER + b"\x00" * 9 + b"Xing"
+    xing += b"\x00" * (MP3_FRAME_LENGTH - len(xing))
+    id3v1 = b"TAG" + b"\x00" * 125
+    return id3v2 + xing + b"".join(_mp3_frame(f) for f in fills) + id3v1
+
+
+def test_concat_mp3_frames_strips_headers_and_counts_duration():
+    """Only audio frames are written, and duration comes from frame sample counts."""
+    out = io.BytesIO()
+
+    duration = tts.concat_mp3_frames([_mp3_chunk(1, 2, 3), _mp3_chunk(4, 5)], out)
+
+    assert out.getvalue() == b"".join(_mp3_frame(f) for f in (1, 2, 3, 4, 5))
+    assert duration == pytest.approx(5 * MP3_FRAME_SAMPLES / 24000)
+
+
+class FakeAudioUpload(io.BytesIO):
+    public_url = "http://gcs.com/audio.mp3"
+    bytes_written = 0
+
+    def write(self, data):
+        self.bytes_written += len(data)
+        return super().write(data)
+
+
+@patch("app.services.tts.texttospeech.TextToSpeechClient")
+@patch("app.services.tts.AudioSegment")
+@patch("app.services.tts.upload_audio_and_get_url")
+@patch("app.services.tts.tempfile.mkdtemp")
+@patch("app.services.tts.open_audio_upload")
+def test_synthesize_article_to_mp3_frames_mode(
+    mock_open_upload,
+    mock_mkdtemp,
+    mock_upload,
+    mock_audio_segment,
+    mock_tts_client,
+    mock_app_context,
+):
+    """The default frame mode streams frames into the upload with no temp file."""
+    mock_tts_client.return_value.synthesize_speech.return_value.audio_content = (
+        _mp3_chunk(7, 8)
+    )
+    upload = FakeAudioUpload()
+    mock_open_upload.return_value.__enter__.return_value = upload
+
+    result = synthesize_article_to_mp3({"text": "Hello."}, "hash")
+
+    assert result.audio_url == "http://gcs.com/audio.mp3"
+    assert result.size_bytes == 2 * MP3_FRAME_LENGTH
+    assert result.duration_seconds == pytest.approx(2 * MP3_FRAME_SAMPLES / 24000)
+    assert upload.getvalue() == _mp3_frame(7) + _mp3_frame(8)
+    mock_open_upload.assert_called_once_with("hash.mp3")
+    mock_mkdtemp.assert_not_called()
+    mock_upload.assert_not_called()
+    mock_audio_segment.from_mp3.assert_not_called()
+
+
+@patch("app.services.tts.texttospeech.TextToSpeechClient")
+def test_tts_client_is_shared_and_rebuilt_after_fork(mock_tts_client):
+    """One client per process: reused across calls, recreated in a forked child."""
+    holder = tts._TTSClientHolder()
+
+    client, setup_seconds = holder.get()
+    assert holder.get() == (client, 0.0)
+    mock_tts_client.assert_called_once()
+
+    with patch("app.services.tts.os.getpid", return_value=-1):
+        holder.get()
+    assert mock_tts_client.call_count == 2
+
+    stats = holder.stats()
+    assert stats["created"] == 2
+    assert stats["reused"] == 1
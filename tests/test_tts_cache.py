@@ -0,0 +1,113 @@
+import errno
+import pathlib
+from unittest.mock import MagicMock
+
+from google.api_core import exceptions as google_exceptions
+
+from app.services.tts import _synthesize_chunks
+from app.services.tts_cache import TTSChunkCache, chunk_cache_key
+
+
+def test_chunk_cache_key_normalizes_whitespace_and_includes_config():
+    """Whitespace differences share a key; different voices do not."""
+    key = chunk_cache_key("Hello   world.\n", "voice-a", "mp3")
+    assert key == chunk_cache_key(" Hello world.", "voice-a", "mp3")
+    assert key != chunk_cache_key("Hello world.", "voice-b", "mp3")
+    assert key != chunk_cache_key("Hello world.", "voice-a", "ogg")
+
+
+def test_local_tier_evicts_least_recently_used(tmp_path):
+    """Entries beyond max_bytes are evicted oldest-access first."""
+    cache = TTSChunkCache(tmp_path, max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"  # "b" is now least recently used
+    cache.put("c", b"cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+    assert not (tmp_path / "b.mp3").exists()
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["local_hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["bytes"] == 8
+
+
+def test_local_tier_survives_restart(tmp_path):
+    """A new cache instance adopts files written by a previous one."""
+    TTSChunkCache(tmp_path).put("k", b"audio")
+    assert TTSChunkCache(tmp_path).get("k") == b"audio"
+
+
+def test_local_tier_disk_errors_are_misses(tmp_path, monkeypatch):
+    """A full or unreadable disk skips the local tier instead of raising."""
+    cache = TTSChunkCache(tmp_path)
+    cache.put("k", b"audio")
+
+    def fail(*args, **kwargs):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(pathlib.Path, "write_bytes", fail)
+    monkeypatch.setattr(pathlib.Path, "read_bytes", fail)
+    cache.put("new", b"audio")
+    assert cache.get("k") is None
+    assert cache.get("new") is None
+    assert list(tmp_path.glob("*.tmp")) == []
+
+    stats = cache.stats()
+    assert stats["local_errors"] == 2
+    assert stats["misses"] == 2
+    assert stats["entries"] == 0
+    assert stats["bytes"] == 0
+
+
+def test_shared_tier_hit_is_copied_locally(tmp_path):
+    """A GCS hit is served and then kept in the local tier."""
+    bucket = MagicMock()
+    bucket.blob.return_value.download_as_bytes.return_value = b"shared"
+    cache = TTSChunkCache(tmp_path, bucket=bucket)
+
+    assert cache.get("k") == b"shared"
+    bucket.blob.assert_called_once_with("tts-cache/k")
+    assert cache.get("k") == b"shared"
+    assert bucket.blob.call_count == 1
+
+    stats = cache.stats()
+    assert stats["shared_hits"] == 1
+    assert stats["local_hits"] == 1
+
+
+def test_shared_tier_miss_and_existing_object(tmp_path):
+    """GCS misses fall through, and re-uploading an existing key is not an error."""
+    bucket = MagicMock()
+    blob = bucket.blob.return_value
+    blob.download_as_bytes.side_effect = google_exceptions.NotFound("nope")
+    blob.upload_from_string.side_effect = google_exceptions.PreconditionFailed("dup")
+    cache = TTSChunkCache(tmp_path, bucket=bucket)
+
+    assert cache.get("k") is None
+    cache.put("k", b"audio")
+
+    blob.upload_from_string.assert_called_once_with(
+        b"audio", content_type="audio/mpeg", if_generation_match=0
+    )
+    assert cache.stats()["shared_errors"] == 0
+
+
+def test_synthesize_chunks_skips_cached_chunks(tmp_path):
+    """Cached chunks are never sent to the TTS API."""
+    cache = TTSChunkCache(tmp_path)
+    client = MagicMock()
+    client.synthesize_speech.side_effect = lambda input, voice, audio_config: (
+        MagicMock(audio_content=input.text.encode())
+    )
+
+    first = list(_synthesize_chunks(client, ["one", "two"], None, None, 2, cache))
+    second = list(_synthesize_chunks(client, ["two", "one"], None, None, 2, cache))
+
+    assert first == [b"one", b"two"]
+    assert second == [b"two", b"one"]
+    assert client.synthesize_speech.call_count == 2
@@ -1,9 +1,12 @@
+import time
 from unittest.mock import patch
 
 import pytest
 from flask import Flask
 
+from app.services import users
 from app.services.users import (  # Removed current_user import
+    SessionClaimsCache,
     current_user_id,
     require_login,
 )
@@ -118,3 +121,62 @@ def test_require_login_unauthenticated(
     with app_with_config.test_client() as client:
         response = client.get("/protected")
         assert response.status_code == 401
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_session_cache_expires_at_revocation_recheck():
+    clock = FakeClock()
+    cache = SessionClaimsCache(recheck_seconds=60, clock=clock)
+    cache.put("cookie", {"uid": "u1"})
+
+    clock.now = 59
+    assert cache.get("cookie") == {"uid": "u1"}
+    clock.now = 61
+    assert cache.get("cookie") is None
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+def test_session_cache_is_bounded_and_purgeable():
+    cache = SessionClaimsCache(max_entries=2)
+    for cookie in ("a", "b", "c"):
+        cache.put(cookie, {"uid": cookie})
+    cache.purge("c")
+
+    assert cache.get("a") is None  # least recently used
+    assert cache.get("c") is None  # purged
+    assert cache.get("b") == {"uid": "b"}
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["purges"] == 1
+
+
+@patch("app.services.users.auth.verify_session_cookie")
+def test_require_login_reuses_verified_session(
+    mock_verify, app_with_config, monkeypatch
+):
+    monkeypatch.setattr(users, "_session_cache", None)
+    app_with_config.config["COOKIE_NAME"] = "session"
+    mock_verify.return_value = {"uid": "u1", "exp": time.time() + 3600}
+
+    @app_with_config.route("/me")
+    @require_login
+    def me():
+        return current_user_id()
+
+    with app_with_config.test_client() as client:
+        client.set_cookie("session", "signed-cookie")
+        assert client.get("/me").data == b"u1"
+        assert client.get("/me").data == b"u1"
+
+    mock_verify.assert_called_once_with("signed-cookie", check_revoked=True)
+    stats = users.session_cache_stats()
+    assert stats["hits"] == 1 and stats["verifications"] == 1
+
+    users.purge_session("signed-cookie")
+    assert users._session_cache.get("signed-cookie") is None
@@ -2,6 +2,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from app.services.tts import SynthesisResult
 from app.worker import run_job
 
 
@@ -16,36 +17,46 @@ def mock_app_context():
         yield app
 
 
-@patch("app.worker.get_job")
+@patch("app.worker.claim_job")
 @patch("app.worker.update_job")
 @patch("app.worker.extract_article")
 @patch("app.worker.synthesize_article_to_mp3")
 @patch("app.worker.save_article_record")
+@patch("app.worker.add_feed_item")
+@patch("app.worker.save_feed_item")
 def test_run_job_success(
+    mock_save_feed_item,
+    mock_add_feed_item,
     mock_save_article,
     mock_synthesize,
     mock_extract,
     mock_update_job,
-    mock_get_job,
+    mock_claim_job,
     mock_app_context,
 ):
     """Test the successful execution path of run_job."""
     # Arrange: Set up the mock return values
     job_id = "test_job_123"
-    mock_get_job.return_value = {
-        "id": job_id,
-        "url": "http://example.com/article",
-        "urlhash": "somehash",
-        "user_id": "user123",
-        "status": "queued",
-    }
+    mock_claim_job.return_value = (
+        "claimed",
+        {
+            "id": job_id,
+            "url": "http://example.com/article",
+            "urlhash": "somehash",
+            "user_id": "user123",
+            "status": "queued",
+        },
+    )
     mock_extract.return_value = {"title": "Test Title", "text": "Some text."}
-    mock_synthesize.return_value = (
-        "local/path/to/audio.mp3",
-        "http://gcs.com/audio.mp3",
+    mock_synthesize.return_value = SynthesisResult(
+        "http://gcs.com/audio.mp3", size_bytes=48000, duration_seconds=12.4
     )
     mock_save_article.return_value = {
-        "title": "Test Title"
+        "id": "somehash",
+        "title": "Test Title",
+        "audio_url": "http://gcs.com/audio.mp3",
+        "audio_size_bytes": 48000,
+        "audio_duration_seconds": 12,
     }  # Match what update_job needs
 
     # Act: Run the job
@@ -55,42 +66,55 @@ def test_run_job_success(
     assert success is True
     assert message == "ok"
 
-    # Check that the job status was updated correctly
-    assert mock_update_job.call_count == 5
-    mock_update_job.assert_any_call(job_id, status="fetching")
-    mock_update_job.assert_any_call(job_id, status="parsing", title="Test Title")
-    mock_update_job.assert_any_call(job_id, status="tts_generating")
-    mock_update_job.assert_any_call(job_id, status="uploading_audio")
-    mock_update_job.assert_any_call(
+    # Intermediate states are debounced away; the job is written once, done
+    mock_update_job.assert_called_once_with(
         job_id,
         status="done",
+        user_id="user123",
         audio_url="http://gcs.com/audio.mp3",
+        audio_size_bytes=48000,
+        audio_duration_seconds=12,
         title="Test Title",
         processing_duration_seconds=0,  # processing_duration_seconds is added by run_job
+        lease=None,
     )
 
     # Verify that all the services were called
     mock_extract.assert_called_once_with("http://example.com/article")
     mock_synthesize.assert_called_once()
     mock_save_article.assert_called_once()
+    assert mock_save_article.call_args.kwargs["audio_size_bytes"] == 48000
+    assert mock_save_article.call_args.kwargs["audio_duration_seconds"] == 12
+
+    # The finished article is projected into feed_items and appended to the
+    # user's materialized feed
+    mock_save_feed_item.assert_called_once()
+    uid, item = mock_save_feed_item.call_args.args
+    assert uid == "user123"
+    assert item["guid"] == "somehash"
+    assert item["enclosure_url"] == "http://gcs.com/audio.mp3"
+    assert item["enclosure_length"] == 48000
+    assert item["duration"] == 12
+    mock_add_feed_item.assert_called_once_with("user123", item)
 
 
-@patch("app.worker.get_job")
+@patch("app.worker.claim_job")
 @patch("app.worker.update_job")
 @patch("app.worker.extract_article")
-def test_run_job_failure(mock_extract, mock_update_job, mock_get_job, mock_app_context):
+def test_run_job_failure(
+    mock_extract, mock_update_job, mock_claim_job, mock_app_context
+):
     """Test the failure path of run_job."""
     # Arrange: Set up mocks for a failure scenario
     job_id = "test_job_fail"
-    # Simulate the job status being 'fetching' when the error occurs
-    mock_get_job.side_effect = [
+    mock_claim_job.return_value = (
+        "claimed",
         {
             "id": job_id,
             "url": "http://example.com/broken-article",
             "status": "queued",
         },
-        {"status": "fetching"},  # Mock the status check inside the except block
-    ]
+    )
     # Simulate the extraction failing
     exception_message = "Extraction failed miserably"
     mock_extract.side_effect = Exception(exception_message)
@@ -102,11 +126,25 @@ def test_run_job_failure(mock_extract, mock_update_job, mock_get_job, mock_app_c
     assert success is False
     assert message == exception_message
 
-    # Check that the job status was updated to fetching, then to the correct failed status
-    assert mock_update_job.call_count == 2
-    mock_update_job.assert_any_call(job_id, status="fetching")
-    mock_update_job.assert_any_call(
+    # The failed stage is known locally: no re-read, one write
+    mock_claim_job.assert_called_once()
+    mock_update_job.assert_called_once_with(
         job_id,
         status="failed_fetch",
         last_error="We couldn't process this URL. It might be a paywalled article, a video, or a page without a clear body of text. Please try a different URL.",
+        lease=None,
     )
+
+
+@patch("app.worker.claim_job")
+@patch("app.worker.update_job")
+@patch("app.worker.extract_article")
+def test_run_job_skips_job_claimed_elsewhere(
+    mock_extract, mock_update_job, mock_claim_job, mock_app_context
+):
+    mock_claim_job.return_value = ("in_flight", {"id": "j1", "status": "fetching"})
+
+    assert run_job("j1") == (True, "already in progress")
+
+    mock_extract.assert_not_called()
+    mock_update_job.assert_not_called()